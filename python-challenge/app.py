@@ -1,31 +1,104 @@
 # app.py
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional, Dict, Any
-import statistics
-from math import sqrt
+import asyncio
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from importlib.metadata import PackageNotFoundError, version
+import anyio.to_thread
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from typing import List, Optional, Dict, Any, AsyncIterator, Callable, Sequence, Tuple
+from enum import Enum
+from collections import Counter
+
+from cache import cache_key, create_cache
+from datasets import DatasetNotFound, create_store
+from engines import (
+    STATS_FIELDS, RunningStats, as_python_floats, get_engine, named_stats, np, parse_fields,
+    stats_from_accumulators
+)
+from executor import (
+    MAX_PENDING, PoolBusy, offload, parallel_map, pending_tasks, shutdown_process_pool
+)
+from fastjson import FastJSONResponse, dumps, loads, use_orjson_decoder
+from metrics import InFlightMiddleware, observe_stages, render_prometheus, requests, stage_timer
+from histograms import MAX_BINS, histogram
+from live import LIVE_THREAD_MIN_BYTES, LiveStats, UpdateThrottle, live_message_size
+from rolling import ROLLING_COLUMNS, iter_rolling, rolling_float64, rolling_row
+from singleflight import create_singleflight
+from sketches import KLL_RANK_ERROR, MG_DEFAULT_CAPACITY, KLLSketch, MisraGries
+from ingest import (
+    BINARY_CONTENT_TYPES, OCTET_STREAM, NDJSON, NPY, PayloadTooLarge, UnsupportedEncoding, create_decoder,
+    iter_decoded, iter_ndjson_numbers, parse_binary, parse_matrix
+)
+from matrix import matrix_stats
+from groupby import GroupKey, groupby_stats
+from outofcore import CSV_CONTENT_TYPES, SPOOL_DIR, Spool, file_stats
+from warmup import WARMUP_ENABLED, Readiness, warm_up
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # El warm-up corre en segundo plano: /health responde mientras tanto
+    task = asyncio.create_task(warm_up(app, readiness)) if WARMUP_ENABLED else None
+    if task is None:
+        readiness.mark_ready()
+    yield
+    if task is not None:
+        task.cancel()
+    shutdown_process_pool()
 
 app = FastAPI(
     title="Statistics API",
     description="API para calcular estadísticas de listas de números",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
+app.add_middleware(InFlightMiddleware)
+
+dataset_store = create_store()
+result_cache = create_cache()
+single_flight = create_singleflight()
+readiness = Readiness()
 
 class DataIn(BaseModel):
+    # pydantic-core valida cada elemento (tipo y finitud) sin bucles en Python
+    model_config = ConfigDict(allow_inf_nan=False)
+    
     numbers: List[float] = Field(..., description="Lista de números para calcular estadísticas")
+
+class DataInStrict(DataIn):
+    """Validación estricta: rechaza strings y booleanos en lugar de convertirlos"""
+    model_config = ConfigDict(strict=True, allow_inf_nan=False)
+
+class BatchIn(BaseModel):
+    model_config = ConfigDict(allow_inf_nan=False)
     
-    @field_validator('numbers')
-    @classmethod
-    def validate_numbers(cls, v):
-        if not isinstance(v, list):
-            raise ValueError("numbers debe ser una lista")
-        
-        # Permitir lista vacía pero validar tipos
-        for num in v:
-            if not isinstance(num, (int, float)):
-                raise ValueError("Todos los elementos deben ser números")
-        
-        return v
+    series: Dict[str, List[float]] = Field(..., description="Series de números por nombre")
+
+class BatchInStrict(BatchIn):
+    model_config = ConfigDict(strict=True, allow_inf_nan=False)
+
+class MatrixIn(BaseModel):
+    model_config = ConfigDict(allow_inf_nan=False)
+    
+    columns: List[List[float]] = Field(..., min_length=1, description="Columnas de la matriz, todas del mismo largo")
+    names: Optional[List[str]] = Field(None, description="Nombre de cada columna")
+
+class MatrixInStrict(MatrixIn):
+    model_config = ConfigDict(strict=True, allow_inf_nan=False)
+
+class GroupByIn(BaseModel):
+    model_config = ConfigDict(allow_inf_nan=False)
+    
+    keys: Optional[List[GroupKey]] = Field(None, description="Clave de cada valor")
+    values: Optional[List[float]] = Field(None, description="Valores, en paralelo con keys")
+    rows: Optional[List[Tuple[GroupKey, float]]] = Field(None, description="Filas [clave, valor], en lugar de keys y values")
+
+class GroupByInStrict(GroupByIn):
+    model_config = ConfigDict(strict=True, allow_inf_nan=False)
 
 class StatsOut(BaseModel):
     count: int = Field(..., description="Cantidad de números")
@@ -39,36 +112,458 @@ class StatsOut(BaseModel):
     range: Optional[float] = Field(..., description="Rango (max - min)")
     sum: Optional[float] = Field(..., description="Suma total")
 
+class BatchOut(BaseModel):
+    series: Dict[str, StatsOut] = Field(..., description="Estadísticas de cada serie")
+
+class MatrixOut(BaseModel):
+    rows: int = Field(..., description="Cantidad de filas")
+    names: List[str] = Field(..., description="Nombre de cada columna")
+    columns: List[StatsOut] = Field(..., description="Estadísticas de cada columna")
+    covariance: List[List[Optional[float]]] = Field(..., description="Matriz de covarianza muestral")
+    correlation: List[List[Optional[float]]] = Field(
+        ..., description="Matriz de correlación de Pearson (null si una columna es constante)"
+    )
+
+class GroupByOut(BaseModel):
+    count: int = Field(..., description="Cantidad total de valores")
+    groups: Dict[str, StatsOut] = Field(..., description="Estadísticas de cada clave, en orden de aparición")
+
+class DatasetOut(BaseModel):
+    id: str = Field(..., description="Identificador del dataset")
+    count: int = Field(..., description="Cantidad de números acumulados")
+
+class QuantileOut(BaseModel):
+    quantile: float = Field(..., description="Cuantil pedido, entre 0 y 1")
+    value: Optional[float] = Field(..., description="Valor del cuantil")
+
+class PercentilesOut(BaseModel):
+    count: int = Field(..., description="Cantidad de números")
+    method: str = Field(..., description="exact o approx")
+    rank_error: Optional[float] = Field(..., description="Error de rango normalizado máximo (solo approx)")
+    quantiles: List[QuantileOut] = Field(..., description="Valor de cada cuantil pedido")
+
+class FrequencyOut(BaseModel):
+    value: float = Field(..., description="Valor")
+    count: int = Field(..., description="Frecuencia (en approx, cota inferior)")
+
+class TopKOut(BaseModel):
+    count: int = Field(..., description="Cantidad de números")
+    method: str = Field(..., description="exact o approx")
+    error: int = Field(..., description="Subestimación máxima de cada frecuencia (0 en exact)")
+    items: List[FrequencyOut] = Field(..., description="Valores más frecuentes, de mayor a menor")
+
+class RollingOut(BaseModel):
+    window: int = Field(..., description="Tamaño de la ventana")
+    step: int = Field(..., description="Distancia entre el inicio de dos ventanas")
+    count: int = Field(..., description="Cantidad de ventanas")
+    mean: List[float] = Field(..., description="Media de cada ventana")
+    variance: List[float] = Field(..., description="Varianza de cada ventana")
+    std_dev: List[float] = Field(..., description="Desviación estándar de cada ventana")
+    min: List[float] = Field(..., description="Mínimo de cada ventana")
+    max: List[float] = Field(..., description="Máximo de cada ventana")
+
+class HistogramOut(BaseModel):
+    count: int = Field(..., description="Cantidad de números")
+    min: Optional[float] = Field(..., description="Valor mínimo")
+    max: Optional[float] = Field(..., description="Valor máximo")
+    method: str = Field(..., description="count, width o quantile")
+    edges: List[float] = Field(..., description="Bordes de los intervalos (uno más que counts)")
+    counts: List[int] = Field(..., description="Cantidad de números en cada intervalo")
+
+class HistogramMethod(str, Enum):
+    count = "count"
+    width = "width"
+    quantile = "quantile"
+
+class QuantileMethod(str, Enum):
+    exact = "exact"
+    approx = "approx"
+
+class FrequencyMethod(str, Enum):
+    exact = "exact"
+    approx = "approx"
+
+class RollingFormat(str, Enum):
+    json = "json"
+    ndjson = "ndjson"
+    float64 = "float64"
+
+class EngineName(str, Enum):
+    auto = "auto"
+    python = "python"
+    numpy = "numpy"
+
+ENGINE_QUERY = Query(
+    EngineName.auto,
+    description="Motor de cálculo; 'auto' usa NumPy en listas grandes si está instalado"
+)
+
+def pool_busy() -> HTTPException:
+    """Respuesta de backpressure cuando el pool de procesos está lleno"""
+    return HTTPException(
+        status_code=503,
+        detail="Servidor ocupado, reintentar más tarde",
+        headers={"Retry-After": "1"}
+    )
+
+def request_key(endpoint: str, engine_name: str, nums: Sequence[float]) -> Optional[str]:
+    """Clave de caché y de singleflight; None si ambos están desactivados"""
+    if result_cache is None and single_flight is None:
+        return None
+    return cache_key(endpoint, engine_name, nums)
+
+def cached_response(key: Optional[str]) -> Optional[Response]:
+    """Respuesta ya serializada desde la caché, sin recalcular ni validar"""
+    if key is None or result_cache is None:
+        return None
+    body = result_cache.get(key)
+    if body is None:
+        return None
+    return Response(content=body, media_type=FastJSONResponse.media_type)
+
+def compute_once(key: Optional[str], compute: Callable[[], Response]) -> Response:
+    """
+    Calcula una respuesta una sola vez entre requests idénticos en curso.
+    
+    Quien llega primero calcula y guarda el body en la caché; los que llegan
+    mientras tanto esperan y reciben el mismo body (o la misma excepción)
+    """
+    if key is None:
+        return compute()
+    
+    def render() -> bytes:
+        body = bytes(compute().body)
+        if result_cache is not None:
+            result_cache.set(key, body)
+        return body
+    
+    body = single_flight.do(key, render) if single_flight is not None else render()
+    return Response(content=body, media_type=FastJSONResponse.media_type)
+
+def resolve_engine(engine: EngineName, size: int):
+    """Obtiene el motor pedido o responde 422 si no está disponible"""
+    try:
+        return get_engine(engine.value, size)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+NUMBERS_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": DataIn.model_json_schema()},
+            OCTET_STREAM: {
+                "schema": {"type": "string", "format": "binary"},
+                "description": "float64 little-endian crudos, 8 bytes por número"
+            },
+            NPY: {
+                "schema": {"type": "string", "format": "binary"},
+                "description": "Archivo .npy con un arreglo numérico 1-D (requiere NumPy)"
+            }
+        }
+    }
+}
+
+# Como NUMBERS_BODY, más NDJSON leído por bloques
+NUMBERS_OR_NDJSON_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            **NUMBERS_BODY["requestBody"]["content"],
+            NDJSON: {
+                "schema": {"type": "string"},
+                "description": "Un número o un arreglo por línea; se lee por bloques"
+            }
+        }
+    }
+}
+
+def body_error(error: Dict[str, Any]) -> Dict[str, Any]:
+    """Adapta un error de pydantic al formato de FastAPI (loc bajo 'body')"""
+    error = {**error, "loc": ("body", *error["loc"])}
+    if error["type"] == "finite_number":
+        # NaN/inf no se pueden serializar en la respuesta JSON
+        error["input"] = str(error["input"])
+    return error
+
+STRICT_QUERY = Query(False, description="Rechaza strings y booleanos en lugar de convertirlos")
+
+def validate_json(model, body: bytes, timings: Optional[Dict[str, float]] = None):
+    """
+    Valida el body JSON; los errores se responden con 422.
+    
+    Los bodies chicos se validan con pydantic-core directamente desde los
+    bytes; los grandes se decodifican antes con orjson, que es más rápido.
+    """
+    try:
+        if use_orjson_decoder(body):
+            try:
+                with stage_timer(timings, "json_decode"):
+                    payload = loads(body)
+            except ValueError as e:
+                raise RequestValidationError([{
+                    "type": "json_invalid",
+                    "loc": ("body",),
+                    "msg": "JSON decode error",
+                    "input": {},
+                    "ctx": {"error": str(e)}
+                }])
+            with stage_timer(timings, "validation"):
+                return model.model_validate(payload)
+        with stage_timer(timings, "json_decode_validation"):
+            return model.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError([body_error(error) for error in e.errors(include_url=False)])
+
+def route_path(request: Request) -> str:
+    """Plantilla de la ruta (por ejemplo /datasets/{dataset_id}/append) para las métricas"""
+    route = request.scope.get("route")
+    return route.path if route is not None else request.url.path
+
+def content_encoding(request: Request) -> Optional[str]:
+    encoding = request.headers.get("content-encoding", "").strip().lower()
+    return None if encoding in ("", "identity") else encoding
+
+def body_chunks(request: Request, limit: Optional[float] = None) -> AsyncIterator[bytes]:
+    """Bloques del body, descomprimidos a medida que llegan si hay Content-Encoding"""
+    encoding = content_encoding(request)
+    if encoding is None:
+        return request.stream()
+    try:
+        decoder = create_decoder(encoding)
+    except UnsupportedEncoding as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    return iter_decoded(request.stream(), decoder, limit)
+
+async def read_body(request: Request) -> bytes:
+    """
+    Body completo, descomprimido si hay Content-Encoding.
+    
+    - gzip, deflate y zstd (si está instalado zstandard); otro responde 415
+    - Pasar STATS_MAX_DECOMPRESSED_BYTES responde 413; un body corrupto, 422
+    """
+    if content_encoding(request) is None:
+        return await request.body()
+    body = bytearray()
+    try:
+        async for chunk in body_chunks(request):
+            body += chunk
+    except PayloadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return body
+
+async def read_numbers(request: Request, strict: bool = STRICT_QUERY) -> Sequence[float]:
+    """
+    Lee los números del body según el Content-Type.
+    
+    - JSON: se valida con DataIn (o DataInStrict) directamente desde los bytes
+    - application/octet-stream: float64 little-endian, sin copiar el buffer
+    - application/x-npy: archivo .npy de una dimensión
+    - NaN e infinitos se rechazan con 422 en todos los casos
+    - Con Content-Encoding el body se descomprime antes (ver read_body)
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    timings: Dict[str, float] = {}
+    with stage_timer(timings, "body_read"):
+        body = await read_body(request)
+    
+    if content_type in BINARY_CONTENT_TYPES:
+        try:
+            with stage_timer(timings, "binary_parse"):
+                nums = parse_binary(body, content_type)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    else:
+        nums = validate_json(DataInStrict if strict else DataIn, body, timings).numbers
+    
+    observe_stages(timings, route_path(request), len(nums))
+    return nums
+
+async def read_batch(request: Request, strict: bool = STRICT_QUERY) -> Dict[str, List[float]]:
+    """Lee y valida el body JSON de /stats/batch"""
+    timings: Dict[str, float] = {}
+    with stage_timer(timings, "body_read"):
+        body = await read_body(request)
+    series = validate_json(BatchInStrict if strict else BatchIn, body, timings).series
+    observe_stages(timings, route_path(request), sum(map(len, series.values())))
+    return series
+
+async def read_matrix(request: Request, strict: bool = STRICT_QUERY):
+    """
+    Lee una matriz por columnas y sus nombres.
+    
+    - JSON: MatrixIn ({"columns": [[...], ...], "names": [...]})
+    - application/octet-stream: float64 por columnas con X-Matrix-Shape
+    - application/x-npy: arreglo 2-D (filas, columnas)
+    - En los binarios los nombres van en X-Matrix-Names, separados por coma
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    body = await read_body(request)
+    
+    if content_type in BINARY_CONTENT_TYPES:
+        try:
+            columns = parse_matrix(body, content_type, request.headers.get("x-matrix-shape"))
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        header = request.headers.get("x-matrix-names")
+        names = [name.strip() for name in header.split(",")] if header else None
+    else:
+        matrix = validate_json(MatrixInStrict if strict else MatrixIn, body)
+        columns, names = matrix.columns, matrix.names
+    
+    if names is None:
+        names = [str(index) for index in range(len(columns))]
+    elif len(names) != len(columns):
+        raise HTTPException(status_code=422, detail="Debe haber un nombre por columna")
+    return columns, names
+
+async def read_groupby(request: Request, strict: bool = STRICT_QUERY) -> Tuple[List[GroupKey], List[float]]:
+    """Lee keys y values (o rows) del body JSON de /stats/groupby"""
+    timings: Dict[str, float] = {}
+    with stage_timer(timings, "body_read"):
+        body = await read_body(request)
+    data = validate_json(GroupByInStrict if strict else GroupByIn, body, timings)
+    if data.rows is not None and data.keys is None and data.values is None:
+        keys = [row[0] for row in data.rows]
+        values = [row[1] for row in data.rows]
+    elif data.rows is None and data.keys is not None and data.values is not None:
+        keys, values = data.keys, data.values
+    else:
+        raise HTTPException(status_code=422, detail="Se espera rows, o keys y values")
+    if len(keys) != len(values):
+        raise HTTPException(status_code=422, detail="keys y values deben tener el mismo largo")
+    observe_stages(timings, route_path(request), len(values))
+    return keys, values
+
+def package_version(name: str) -> Optional[str]:
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+# Versiones instaladas; numpy y orjson son opcionales (None si no están)
+DEPENDENCIES = {name: package_version(name) for name in ("fastapi", "pydantic", "numpy", "orjson", "zstandard")}
+
+def threadpool_usage() -> Dict[str, Any]:
+    """Hilos ocupados del threadpool donde corren los endpoints síncronos"""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    busy = limiter.borrowed_tokens
+    size = limiter.total_tokens
+    return {"busy": busy, "size": size, "saturation": round(busy / size, 3)}
+
+def compute_and_render(endpoint: str, count: int, engine_name: str, method: str, *args) -> Response:
+    """Calcula con offload y serializa, registrando cada etapa en las métricas"""
+    timings: Dict[str, float] = {}
+    # Solo stats y select se desglosan por paso; basic son tres reducciones
+    steps = {} if method in ("stats", "select") else None
+    with stage_timer(timings, "compute"):
+        result = offload(engine_name, method, *args, timings=steps)
+    with stage_timer(timings, "serialization"):
+        response = FastJSONResponse(result)
+    observe_stages(timings, endpoint, count)
+    if steps:
+        observe_stages(steps, endpoint, count, prefix="stat.")
+    return response
+
 @app.get("/")
 def read_root():
     """Endpoint de health check"""
     return {"message": "Statistics API is running", "status": "healthy"}
 
 @app.get("/health")
-def health_check():
-    """Endpoint de health check detallado"""
+async def health_check():
+    """
+    Endpoint de health check detallado.
+    
+    - Corre en el event loop, así responde aunque el threadpool esté lleno
+    - Requests en curso, ocupación del threadpool y del pool de procesos
+    - Cálculos en curso y requests agrupados por singleflight (None si está desactivado)
+    - ready: false hasta que termina el warm-up del arranque
+    - Versiones de las dependencias (None si una opcional no está)
+    """
     return {
         "status": "healthy",
         "service": "Statistics API",
         "version": "1.0.0",
-        "dependencies": {
-            "fastapi": "✅",
-            "pydantic": "✅",
-            "statistics": "✅"
-        }
+        "ready": readiness.ready,
+        "warmup": readiness.info(),
+        "in_flight": requests.in_flight,
+        "threadpool": threadpool_usage(),
+        "process_pool": {"pending": pending_tasks(), "max_pending": MAX_PENDING},
+        "singleflight": single_flight.info() if single_flight is not None else None,
+        "dependencies": DEPENDENCIES
     }
 
-@app.post("/stats", response_model=StatsOut)
-def calculate_stats(data: DataIn) -> StatsOut:
+@app.get("/health/ready")
+async def readiness_check():
+    """
+    Readiness del worker para el balanceador.
+    
+    - 200 cuando terminó el warm-up, 503 mientras tanto
+    """
+    if not readiness.ready:
+        raise HTTPException(status_code=503, detail="Warm-up en curso", headers={"Retry-After": "1"})
+    return {"status": "ready"}
+
+@app.get("/metrics", response_class=Response)
+async def prometheus_metrics() -> Response:
+    """
+    Métricas en formato de texto de Prometheus.
+    
+    - stats_stage_seconds: histograma por etapa, endpoint y tamaño del payload
+    - Gauges de requests en curso, threadpool y pool de procesos
+    - Contadores de singleflight: cálculos hechos y requests que esperaron uno en curso
+    """
+    threadpool = threadpool_usage()
+    flights = single_flight.info() if single_flight is not None else {"in_flight": 0, "leaders": 0, "coalesced": 0}
+    content = render_prometheus({
+        "stats_requests_in_flight": ("Requests HTTP en curso", requests.in_flight),
+        "stats_threadpool_busy": ("Hilos ocupados del threadpool", threadpool["busy"]),
+        "stats_threadpool_size": ("Tamaño del threadpool", threadpool["size"]),
+        "stats_process_pool_pending": ("Cálculos en curso en el pool de procesos", pending_tasks()),
+        "stats_process_pool_max_pending": ("Máximo de cálculos simultáneos en el pool", MAX_PENDING),
+        "stats_singleflight_in_flight": ("Cálculos distintos en curso en singleflight", flights["in_flight"]),
+    }, {
+        "stats_singleflight_leaders_total": ("Cálculos hechos a través de singleflight", flights["leaders"]),
+        "stats_singleflight_coalesced_total": (
+            "Requests que esperaron un cálculo idéntico en curso", flights["coalesced"]
+        ),
+    })
+    return Response(content=content, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.post("/stats", response_model=StatsOut, openapi_extra=NUMBERS_BODY)
+def calculate_stats(
+    nums: Sequence[float] = Depends(read_numbers),
+    engine: EngineName = ENGINE_QUERY,
+    fields: Optional[str] = Query(
+        None,
+        description="Campos a calcular separados por coma, por ejemplo mean,max,std_dev"
+    )
+) -> StatsOut:
     """
     Calcula estadísticas completas para una lista de números.
     
-    - **numbers**: Lista de números (int o float)
+    - **numbers**: Lista de números (int o float), o un body binario float64
+    - **engine**: Motor de cálculo (auto, python, numpy)
+    - **fields**: Solo calcula y retorna estos campos (y lo que necesiten)
     - Retorna estadísticas descriptivas completas
     """
-    nums = data.numbers
+    stats_engine = resolve_engine(engine, len(nums))
+    selected = None
+    if fields is not None:
+        try:
+            selected = parse_fields(fields)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if set(selected) == set(STATS_FIELDS):
+            selected = None
     
-    if not nums:
+    if selected is not None:
+        return calculate_selected_stats(stats_engine, nums, selected)
+    
+    if not len(nums):
         # Lista vacía - retornar valores None apropiados
         return StatsOut(
             count=0,
@@ -83,71 +578,612 @@ def calculate_stats(data: DataIn) -> StatsOut:
             sum=None
         )
     
+    key = request_key("stats", stats_engine.name, nums)
+    cached = cached_response(key)
+    if cached is not None:
+        return cached
+    
     try:
-        # Cálculos básicos
-        count = len(nums)
-        mean_val = statistics.mean(nums)
-        median_val = statistics.median(nums)
-        min_val = min(nums)
-        max_val = max(nums)
-        sum_val = sum(nums)
-        range_val = max_val - min_val
-        
-        # Moda (puede tener múltiples valores)
-        try:
-            mode_val = [statistics.mode(nums)]
-        except statistics.StatisticsError:
-            # No hay moda única, calcular todas las modas
-            from collections import Counter
-            counter = Counter(nums)
-            max_count = max(counter.values())
-            if max_count == 1:
-                mode_val = None  # No hay moda si todos aparecen una vez
-            else:
-                mode_val = [k for k, v in counter.items() if v == max_count]
-        
-        # Desviación estándar y varianza
-        if count > 1:
-            variance_val = statistics.variance(nums)
-            std_dev_val = statistics.stdev(nums)
-        else:
-            variance_val = 0.0
-            std_dev_val = 0.0
-        
-        return StatsOut(
-            count=count,
-            mean=round(mean_val, 6),
-            median=median_val,
-            mode=mode_val,
-            std_dev=round(std_dev_val, 6),
-            variance=round(variance_val, 6),
-            min=min_val,
-            max=max_val,
-            range=range_val,
-            sum=sum_val
-        )
+        # Las listas grandes se calculan en el pool de procesos; el motor ya
+        # entrega los tipos de StatsOut, así que se serializa sin revalidar
+        response = compute_once(key, lambda: compute_and_render("/stats", len(nums), stats_engine.name, "stats", nums))
         
+    except PoolBusy:
+        raise pool_busy()
     except Exception as e:
         raise HTTPException(
             status_code=422, 
             detail=f"Error calculando estadísticas: {str(e)}"
         )
+    return response
 
-@app.post("/stats/basic")
-def calculate_basic_stats(data: DataIn) -> Dict[str, Any]:
+def calculate_selected_stats(stats_engine, nums: Sequence[float], selected: Sequence[str]) -> Response:
+    """Calcula solo los campos pedidos; la respuesta omite el resto"""
+    endpoint = "stats:" + ",".join(selected)
+    key = request_key(endpoint, stats_engine.name, nums)
+    cached = cached_response(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        response = compute_once(
+            key, lambda: compute_and_render("/stats", len(nums), stats_engine.name, "select", nums, selected)
+        )
+    except PoolBusy:
+        raise pool_busy()
+    except Exception as e:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Error calculando estadísticas: {str(e)}"
+        )
+    return response
+
+@app.post(
+    "/stats/batch",
+    response_model=BatchOut,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": BatchIn.model_json_schema()}}
+        }
+    }
+)
+def calculate_batch_stats(
+    series: Dict[str, List[float]] = Depends(read_batch),
+    engine: EngineName = ENGINE_QUERY
+) -> BatchOut:
+    """
+    Calcula estadísticas completas para varias series en un solo request.
+    
+    - **series**: Objeto {nombre: [números]}
+    - **engine**: Motor de cálculo para cada serie (auto elige por tamaño)
+    - Los lotes grandes se reparten entre procesos
+    """
+    total_size = sum(map(len, series.values()))
+    resolve_engine(engine, total_size)
+    items = [(name, nums, engine.value) for name, nums in series.items()]
+    
+    timings: Dict[str, float] = {}
+    try:
+        with stage_timer(timings, "compute"):
+            results = dict(parallel_map(named_stats, items, total_size))
+        with stage_timer(timings, "serialization"):
+            response = FastJSONResponse({"series": results})
+    except PoolBusy:
+        raise pool_busy()
+    except Exception as e:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Error calculando estadísticas: {str(e)}"
+        )
+    observe_stages(timings, "/stats/batch", total_size)
+    return response
+
+@app.post("/stats/basic", openapi_extra=NUMBERS_BODY)
+def calculate_basic_stats(
+    nums: Sequence[float] = Depends(read_numbers),
+    engine: EngineName = ENGINE_QUERY
+) -> Dict[str, Any]:
     """
     Calcula estadísticas básicas.
     
-    - **numbers**: Lista de números
+    - **numbers**: Lista de números, o un body binario float64
+    - **engine**: Motor de cálculo (auto, python, numpy)
     - Retorna: mean, max, min
     """
-    nums = data.numbers
+    stats_engine = resolve_engine(engine, len(nums))
     
-    if not nums:
+    if not len(nums):
         return {"mean": None, "max": None, "min": None}
     
+    key = request_key("basic", stats_engine.name, nums)
+    cached = cached_response(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        response = compute_once(key, lambda: compute_and_render("/stats/basic", len(nums), stats_engine.name, "basic", nums))
+    except PoolBusy:
+        raise pool_busy()
+    return response
+
+
+# Líneas NDJSON por bloque enviado en /stats/rolling?format=ndjson
+ROLLING_NDJSON_CHUNK = 1000
+
+def rounded_row(values) -> Dict[str, float]:
+    """Fila de una ventana con el mismo redondeo que /stats"""
+    mean, variance, std_dev, min_val, max_val = rolling_row(values)
     return {
-        "mean": sum(nums) / len(nums),
-        "max": max(nums),
-        "min": min(nums)
+        "mean": round(mean, 6),
+        "variance": round(variance, 6),
+        "std_dev": round(std_dev, 6),
+        "min": min_val,
+        "max": max_val
+    }
+
+def rolling_ndjson(nums: Sequence[float], window: int, step: int):
+    """Una línea JSON por ventana, enviadas por bloques"""
+    lines = []
+    for index, values in enumerate(iter_rolling(nums, window, step)):
+        lines.append(dumps({"start": index * step, **rounded_row(values)}))
+        if len(lines) == ROLLING_NDJSON_CHUNK:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+@app.post("/stats/rolling", response_model=RollingOut, openapi_extra=NUMBERS_BODY)
+def calculate_rolling_stats(
+    nums: Sequence[float] = Depends(read_numbers),
+    window: int = Query(..., ge=1, description="Tamaño de la ventana"),
+    step: int = Query(1, ge=1, description="Distancia entre el inicio de dos ventanas"),
+    output: RollingFormat = Query(
+        RollingFormat.json,
+        alias="format",
+        description="json, ndjson (una línea por ventana, en streaming) o float64 (binario)"
+    )
+) -> RollingOut:
+    """
+    Calcula media, varianza, desviación estándar, mínimo y máximo por ventana.
+    
+    - **numbers**: Lista de números, o un body binario float64
+    - **window**: Cantidad de números de cada ventana
+    - **step**: Las ventanas empiezan en 0, step, 2·step, ...
+    - **format**: float64 retorna una fila de mean, variance, std_dev, min y
+      max por ventana (sin redondear, columnas en X-Rolling-Columns)
+    - El costo es O(n) sin importar el tamaño de la ventana
+    - Si window es mayor que la cantidad de números no hay ventanas
+    """
+    if output == RollingFormat.float64:
+        return Response(
+            content=rolling_float64(nums, window, step),
+            media_type=OCTET_STREAM,
+            headers={"X-Rolling-Columns": ",".join(ROLLING_COLUMNS)}
+        )
+    if output == RollingFormat.ndjson:
+        return StreamingResponse(
+            rolling_ndjson(nums, window, step), media_type="application/x-ndjson"
+        )
+    
+    columns: Dict[str, List[float]] = {name: [] for name in ROLLING_COLUMNS}
+    appends = [columns[name].append for name in ROLLING_COLUMNS]
+    for values in iter_rolling(nums, window, step):
+        for append, value in zip(appends, rounded_row(values).values()):
+            append(value)
+    return FastJSONResponse({
+        "window": window,
+        "step": step,
+        "count": len(columns["mean"]),
+        **columns
+    })
+
+
+@app.post(
+    "/stats/stream",
+    response_model=StatsOut,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {
+                    "schema": {"type": "string"},
+                    "example": "1\n2.5\n[3, 4, 5]\n"
+                }
+            }
+        }
     }
+)
+async def calculate_stream_stats(
+    request: Request,
+    exact: bool = Query(
+        False,
+        description="Calcula mediana y moda exactas (usa memoria proporcional a los valores distintos)"
+    ),
+    approx_mode: bool = Query(
+        False,
+        description="Con exact=false, moda aproximada con memoria acotada (Misra-Gries)"
+    )
+) -> StatsOut:
+    """
+    Calcula estadísticas leyendo el body por bloques.
+    
+    - **body**: NDJSON, un número o un arreglo de números por línea
+    - **exact**: Incluye mediana y moda; si es false quedan en null
+    - **approx_mode**: Sin exact, la moda sale de un sketch de MG_DEFAULT_CAPACITY contadores
+    - La lista completa nunca se arma en memoria, tampoco con Content-Encoding
+    """
+    moments = RunningStats()
+    counter = Counter() if exact else None
+    sketch = MisraGries() if approx_mode and not exact else None
+    
+    try:
+        async for values in iter_ndjson_numbers(body_chunks(request)):
+            moments.update(values)
+            if counter is not None:
+                counter.update(values)
+            if sketch is not None:
+                sketch.update(values)
+    except PayloadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    stats = stats_from_accumulators(moments, counter)
+    if sketch is not None and sketch.count:
+        stats["mode"] = [sketch.top(1)[0][0]]
+    return StatsOut(**stats)
+
+
+@app.post(
+    "/stats/file",
+    response_model=StatsOut,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                OCTET_STREAM: {
+                    "schema": {"type": "string", "format": "binary"},
+                    "description": "float64 little-endian crudos, de cualquier tamaño"
+                },
+                "text/csv": {
+                    "schema": {"type": "string"},
+                    "example": "1,2.5\n3\n"
+                }
+            }
+        }
+    }
+)
+async def calculate_file_stats(request: Request) -> StatsOut:
+    """
+    Calcula todas las estadísticas de un upload más grande que la RAM.
+    
+    - **body**: float64 little-endian o CSV de números (comas, espacios o saltos de línea)
+    - El body se vuelca a un archivo temporal en STATS_SPOOL_DIR y se recorre
+      con mmap por bloques; la mediana y la moda son exactas
+    - STATS_SPOOL_MAX_BYTES (16 GiB por defecto) acota los bytes recibidos,
+      descomprimidos si hay Content-Encoding (413); requiere NumPy
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type != OCTET_STREAM and content_type not in CSV_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Se esperaba {OCTET_STREAM} o {', '.join(CSV_CONTENT_TYPES)}"
+        )
+    if np is None:
+        raise HTTPException(status_code=422, detail="Las estadísticas fuera de memoria requieren NumPy")
+    
+    with tempfile.TemporaryDirectory(prefix="stats-", dir=SPOOL_DIR) as workdir:
+        try:
+            with Spool(os.path.join(workdir, "upload.f64"), csv=content_type != OCTET_STREAM) as spool:
+                # Con Content-Encoding el descompresor corta al pasar el tope del
+                # spool; sin compresión lo controla Spool.write
+                async for chunk in body_chunks(request, limit=spool.limit()):
+                    spool.write(chunk)
+                spool.close()
+        except PayloadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        stats = await anyio.to_thread.run_sync(file_stats, spool.path, workdir)
+    return StatsOut(**stats)
+
+
+@app.websocket("/stats/live")
+async def live_stats(
+    websocket: WebSocket,
+    interval: float = Query(1.0, ge=0, le=60, description="Segundos mínimos entre actualizaciones"),
+    median: bool = Query(False, description="Incluye la mediana aproximada (sketch KLL)")
+):
+    """
+    Estadísticas en vivo sobre los números que envía el cliente.
+    
+    - **mensajes**: un número, un arreglo o {"numbers": [...]} en texto, o float64 en binario
+    - **interval**: como máximo una actualización por intervalo; 0 responde cada mensaje
+    - **median**: agrega la mediana aproximada del sketch KLL, como /stats/percentiles?method=approx
+    - Un mensaje inválido responde {"error": ...} y la conexión sigue abierta
+    - Los mensajes grandes se procesan en un hilo, en orden, sin frenar el event loop
+    """
+    await websocket.accept()
+    live = LiveStats(median)
+    throttle = UpdateThrottle(interval, lambda: websocket.send_text(dumps(live.snapshot()).decode()))
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            rescheduled = False
+            try:
+                if live_message_size(message) < LIVE_THREAD_MIN_BYTES:
+                    count = live.ingest(message)
+                else:
+                    # Mientras el hilo actualiza los acumuladores ningún envío
+                    # agendado puede leerlos; se vuelve a agendar al terminar
+                    rescheduled = throttle.cancel()
+                    count = await anyio.to_thread.run_sync(live.ingest, message)
+            except ValueError as e:
+                await websocket.send_text(dumps({"error": str(e)}).decode())
+                count = 0
+            if count or rescheduled:
+                await throttle.notify()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        throttle.cancel()
+
+
+@app.post("/datasets", response_model=DatasetOut, status_code=201)
+def create_dataset() -> DatasetOut:
+    """
+    Crea un dataset vacío.
+    
+    - Retorna el id para agregar lotes y consultar estadísticas
+    """
+    return DatasetOut(id=dataset_store.create(), count=0)
+
+@app.post("/datasets/{dataset_id}/append", response_model=DatasetOut, openapi_extra=NUMBERS_BODY)
+def append_to_dataset(
+    dataset_id: str,
+    nums: Sequence[float] = Depends(read_numbers)
+) -> DatasetOut:
+    """
+    Agrega un lote de números a un dataset.
+    
+    - **numbers**: Lote de números (JSON o body binario float64)
+    - El costo es proporcional al lote, no al total acumulado
+    """
+    try:
+        count = dataset_store.append(dataset_id, nums)
+    except DatasetNotFound:
+        raise HTTPException(status_code=404, detail="Dataset no encontrado")
+    return DatasetOut(id=dataset_id, count=count)
+
+@app.get("/datasets/{dataset_id}/stats", response_model=StatsOut)
+def get_dataset_stats(dataset_id: str) -> StatsOut:
+    """
+    Estadísticas del dataset completo.
+    
+    - Mismos campos que /stats sobre todos los lotes concatenados
+    """
+    try:
+        return StatsOut(**dataset_store.stats(dataset_id))
+    except DatasetNotFound:
+        raise HTTPException(status_code=404, detail="Dataset no encontrado")
+
+
+@app.post("/stats/percentiles", response_model=PercentilesOut, openapi_extra=NUMBERS_OR_NDJSON_BODY)
+async def calculate_percentiles(
+    request: Request,
+    q: List[float] = Query([0.5, 0.9, 0.95, 0.99], description="Cuantiles a calcular, entre 0 y 1"),
+    method: QuantileMethod = Query(QuantileMethod.exact, description="exact (selección) o approx (sketch KLL)"),
+    engine: EngineName = ENGINE_QUERY,
+    strict: bool = STRICT_QUERY
+) -> PercentilesOut:
+    """
+    Calcula percentiles de una lista de números.
+    
+    - **q**: Cuantiles pedidos, por ejemplo ?q=0.5&q=0.99
+    - **method**: exact usa selección; approx usa un sketch KLL con memoria
+      acotada y error de rango menor a rank_error
+    - **body**: Como /stats, o NDJSON (solo approx) leído por bloques
+    - Con q=0.5 y method=exact el valor coincide con la mediana de /stats
+    """
+    if any(not 0 <= quantile <= 1 for quantile in q):
+        raise HTTPException(status_code=422, detail="Los cuantiles deben estar entre 0 y 1")
+    
+    approx = method == QuantileMethod.approx
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == NDJSON:
+        if not approx:
+            raise HTTPException(status_code=422, detail="NDJSON solo se acepta con method=approx")
+        sketch = KLLSketch()
+        try:
+            async for values in iter_ndjson_numbers(body_chunks(request)):
+                sketch.update(values)
+        except PayloadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        count = sketch.count
+        values = sketch.quantiles(q)
+    else:
+        nums = await read_numbers(request, strict)
+        count = len(nums)
+        if approx:
+            # El sketch recorre la entrada por tramos, sin copiarla completa
+            sketch = await anyio.to_thread.run_sync(KLLSketch().update, nums)
+            values = sketch.quantiles(q)
+        else:
+            stats_engine = resolve_engine(engine, count)
+            values = await anyio.to_thread.run_sync(stats_engine.quantiles, nums, q)
+    
+    return PercentilesOut(
+        count=count,
+        method=method.value,
+        rank_error=KLL_RANK_ERROR if approx else None,
+        quantiles=[QuantileOut(quantile=quantile, value=value) for quantile, value in zip(q, values)]
+    )
+
+
+# Valores más frecuentes que se pueden pedir en /stats/topk
+MAX_TOP_K = 1000
+MAX_SKETCH_CAPACITY = 100_000
+
+@app.post("/stats/topk", response_model=TopKOut, openapi_extra=NUMBERS_OR_NDJSON_BODY)
+async def calculate_top_k(
+    request: Request,
+    k: int = Query(10, ge=1, le=MAX_TOP_K, description="Cantidad de valores a devolver"),
+    method: FrequencyMethod = Query(
+        FrequencyMethod.exact, description="exact (tabla de frecuencias) o approx (Misra-Gries)"
+    ),
+    capacity: int = Query(
+        MG_DEFAULT_CAPACITY, ge=1, le=MAX_SKETCH_CAPACITY, description="Contadores del sketch (solo approx)"
+    ),
+    engine: EngineName = ENGINE_QUERY,
+    strict: bool = STRICT_QUERY
+) -> TopKOut:
+    """
+    Calcula los valores más frecuentes.
+    
+    - **k**: Cantidad de valores; los empates se ordenan por primera aparición
+    - **method**: exact cuenta todo en una pasada (memoria proporcional a los
+      valores distintos); approx usa capacity contadores y cada frecuencia
+      subestima a lo sumo error
+    - **body**: Como /stats, o NDJSON (como /stats/stream) leído por bloques
+    - Con k=1 el valor coincide con la moda de /stats
+    """
+    approx = method == FrequencyMethod.approx
+    if approx and capacity < k:
+        raise HTTPException(status_code=422, detail="capacity debe ser al menos k")
+    
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == NDJSON:
+        frequencies = MisraGries(capacity) if approx else Counter()
+        count = 0
+        try:
+            async for values in iter_ndjson_numbers(body_chunks(request)):
+                frequencies.update(values)
+                count += len(values)
+        except PayloadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if approx:
+            items, error = frequencies.top(k), frequencies.error()
+        else:
+            items, error = frequencies.most_common(k), 0
+    else:
+        nums = await read_numbers(request, strict)
+        count = len(nums)
+        if approx:
+            sketch = await anyio.to_thread.run_sync(MisraGries(capacity).update, as_python_floats(nums))
+            items, error = sketch.top(k), sketch.error()
+        else:
+            stats_engine = resolve_engine(engine, count)
+            items, error = await anyio.to_thread.run_sync(stats_engine.top_k, nums, k), 0
+    
+    return FastJSONResponse({
+        "count": count,
+        "method": method.value,
+        "error": error,
+        "items": [{"value": value, "count": c} for value, c in items]
+    })
+
+
+@app.post("/stats/histogram", response_model=HistogramOut, openapi_extra=NUMBERS_BODY)
+def calculate_histogram(
+    nums: Sequence[float] = Depends(read_numbers),
+    method: HistogramMethod = Query(
+        HistogramMethod.count,
+        description="count (bins de igual ancho), width (ancho fijo) o quantile (igual cantidad)"
+    ),
+    bins: int = Query(10, ge=1, le=MAX_BINS, description="Cantidad de intervalos (count y quantile)"),
+    width: Optional[float] = Query(None, gt=0, description="Ancho de cada intervalo (width)"),
+    engine: EngineName = ENGINE_QUERY
+) -> HistogramOut:
+    """
+    Calcula un histograma de una lista de números.
+    
+    - **numbers**: Lista de números, o un body binario float64
+    - **method**: count reparte [min, max] en bins intervalos; width usa
+      intervalos de ancho fijo alineados a sus múltiplos; quantile usa los
+      cuantiles como bordes
+    - Los intervalos son [a, b) salvo el último, que incluye el máximo
+    - Retorna también count, min y max, calculados una sola vez con los
+      mismos kernels que /stats
+    """
+    stats_engine = resolve_engine(engine, len(nums))
+    try:
+        result = histogram(stats_engine.name, nums, method.value, bins, width)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return FastJSONResponse(result)
+
+
+MATRIX_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": MatrixIn.model_json_schema()},
+            OCTET_STREAM: {
+                "schema": {"type": "string", "format": "binary"},
+                "description": "float64 little-endian por columnas; forma en X-Matrix-Shape: filas,columnas"
+            },
+            NPY: {
+                "schema": {"type": "string", "format": "binary"},
+                "description": "Archivo .npy con un arreglo 2-D (filas, columnas) (requiere NumPy)"
+            }
+        }
+    }
+}
+
+@app.post("/stats/matrix", response_model=MatrixOut, openapi_extra=MATRIX_BODY)
+def calculate_matrix_stats(
+    matrix=Depends(read_matrix),
+    engine: EngineName = ENGINE_QUERY
+) -> MatrixOut:
+    """
+    Calcula estadísticas por columna y las matrices de covarianza y correlación.
+    
+    - **columns**: Columnas de la matriz (JSON), o un body binario con su forma
+    - **names**: Nombre de cada columna (por defecto su índice)
+    - **engine**: Motor de cálculo; NumPy procesa todas las columnas juntas
+    - Cada columna tiene los mismos campos que /stats
+    """
+    columns, names = matrix
+    rows = len(columns[0])
+    stats_engine = resolve_engine(engine, rows * len(columns))
+    try:
+        result = matrix_stats(stats_engine.name, columns)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return FastJSONResponse({"rows": rows, "names": names, **result})
+
+
+@app.post(
+    "/stats/groupby",
+    response_model=GroupByOut,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": GroupByIn.model_json_schema()}}
+        }
+    }
+)
+def calculate_groupby_stats(
+    data=Depends(read_groupby),
+    engine: EngineName = ENGINE_QUERY
+) -> GroupByOut:
+    """
+    Calcula estadísticas completas por clave en un solo request.
+    
+    - **keys** y **values**: Arreglos paralelos, o **rows**: filas [clave, valor]
+    - **engine**: NumPy calcula todos los grupos juntos con reducciones por segmento
+    - Las claves se devuelven como texto (1 y "1" son el mismo grupo)
+    - Los cálculos grandes se reparten entre procesos
+    """
+    keys, values = data
+    stats_engine = resolve_engine(engine, len(values))
+    
+    timings: Dict[str, float] = {}
+    try:
+        with stage_timer(timings, "compute"):
+            groups = groupby_stats(stats_engine.name, keys, values)
+    except PoolBusy:
+        raise pool_busy()
+    with stage_timer(timings, "serialization"):
+        response = FastJSONResponse({"count": len(values), "groups": groups})
+    observe_stages(timings, "/stats/groupby", len(values))
+    return response
+
+
+@app.get("/cache")
+def cache_info() -> Dict[str, Any]:
+    """
+    Estado de la caché de resultados.
+    
+    - Aciertos, fallos, desalojos, expiraciones, entradas y bytes
+    """
+    if result_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **result_cache.info()}
@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# Benchmarks de la Statistics API: ejecutar con python -m benchmarks.<modulo>
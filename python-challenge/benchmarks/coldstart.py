@@ -0,0 +1,113 @@
+"""
+Arranque en frío: tiempo de import de la app y latencia del primer request.
+
+Cada medición corre en un intérprete nuevo, porque un import solo es frío una
+vez, y se repite --runs veces por modo (se reporta la mediana):
+
+    python -m benchmarks.coldstart
+    python -m benchmarks.coldstart --runs 10 --json coldstart.json
+
+Modos:
+- cold: sin warm-up, el primer request paga las primeras llamadas
+- warmup: warm-up antes del primer request
+
+La caché de resultados se desactiva para que el segundo request también
+calcule.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from statistics import median
+from typing import Dict, List, Optional
+
+MODES = ("cold", "warmup")
+# Distintos de los números del warm-up, para no medir un camino ya recorrido
+PROBE_BODY = json.dumps({"numbers": [3, 1, 4, 1, 5, 9, 2, 6]}).encode()
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def probe(warm: bool) -> Dict[str, Optional[float]]:
+    """Se ejecuta en el proceso nuevo: importa la app y mide los primeros requests"""
+    start = time.perf_counter()
+    import app as app_module
+    imported = time.perf_counter() - start
+
+    from executor import shutdown_process_pool
+    from warmup import Readiness, call, warm_up
+
+    warmup = None
+    if warm:
+        start = time.perf_counter()
+        await warm_up(app_module.app, Readiness())
+        warmup = time.perf_counter() - start
+
+    timings = []
+    for _ in range(2):
+        start = time.perf_counter()
+        status = await call(app_module.app, "POST", "/stats", PROBE_BODY)
+        timings.append(time.perf_counter() - start)
+        assert status == 200, status
+    shutdown_process_pool()
+    return {"import": imported, "warmup": warmup, "first": timings[0], "second": timings[1]}
+
+
+def run_probe(mode: str) -> Dict[str, Optional[float]]:
+    """Una medición de mode en un intérprete nuevo"""
+    env = dict(os.environ, STATS_CACHE_ENTRIES="0", STATS_WARMUP="0")
+    args = [sys.executable, "-m", "benchmarks.coldstart", "--probe"] + (["--warm"] if mode == "warmup" else [])
+    output = subprocess.run(args, cwd=PROJECT_DIR, env=env, capture_output=True, check=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(modes: List[str], runs: int) -> Dict[str, Dict[str, Optional[float]]]:
+    """Mediana de cada tiempo por modo, en segundos"""
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        raise ValueError(f"Modos desconocidos: {', '.join(sorted(unknown))}")
+    report = {}
+    for mode in modes:
+        samples = [run_probe(mode) for _ in range(runs)]
+        report[mode] = {
+            name: median(sample[name] for sample in samples) if samples[0][name] is not None else None
+            for name in samples[0]
+        }
+    return report
+
+
+def print_report(report: Dict[str, Dict[str, Optional[float]]]):
+    print(f"{'modo':<10}{'import':>10}{'warm-up':>10}{'1er req':>10}{'2do req':>10}")
+    for mode, row in report.items():
+        cells = "".join(
+            f"{row[name] * 1000:>8.1f}ms" if row[name] is not None else f"{'-':>10}"
+            for name in ("import", "warmup", "first", "second")
+        )
+        print(f"{mode:<10}{cells}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Procesos por modo")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--json", metavar="PATH", help="Guarda el reporte en JSON")
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--warm", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.probe:
+        print(json.dumps(asyncio.run(probe(args.warm))))
+        return 0
+
+    report = run([mode for mode in args.modes.split(",") if mode], args.runs)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Latencia p50/p99 de payloads chicos a través de la app ASGI.
+
+Llama a la app directamente (sin red ni cliente HTTP) para medir solo el
+costo del framework, la validación y la serialización:
+
+    python -m benchmarks.latency
+"""
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+import app as app_module
+from warmup import call
+
+REQUESTS = 5000
+WARMUP = 500
+SMALL_PAYLOAD = {"numbers": [1, 2, 3, 4, 5, 6.5, 7, 8]}
+ENDPOINTS = ("/stats", "/stats/basic", "/stats?fields=mean,max")
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+async def measure(path: str, body: bytes, requests: int = REQUESTS) -> Dict[str, float]:
+    """Latencias en microsegundos de un endpoint"""
+    app = app_module.app
+    for _ in range(WARMUP):
+        await call(app, "POST", path, body)
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        status = await call(app, "POST", path, body)
+        timings.append(time.perf_counter() - start)
+        assert status == 200, status
+    timings.sort()
+    return {"p50": percentile(timings, 0.5) * 1e6, "p99": percentile(timings, 0.99) * 1e6}
+
+
+async def run():
+    # Sin caché: se mide el camino completo de cada request
+    app_module.result_cache = None
+    body = json.dumps(SMALL_PAYLOAD).encode()
+    for path in ENDPOINTS:
+        result = await measure(path, body)
+        print(f"{path:<28} p50={result['p50']:>7.0f}us  p99={result['p99']:>7.0f}us")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
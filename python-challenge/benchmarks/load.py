@@ -0,0 +1,282 @@
+"""
+Prueba de carga local con uvicorn y un cliente HTTP asíncrono.
+
+Levanta la app con uvicorn (N workers), envía requests a /stats, /stats/basic
+y /health con una mezcla de tamaños de payload y reporta requests/s,
+latencias p50/p95/p99/max y tasa de errores por endpoint:
+
+    python -m benchmarks.load --workers 4 --concurrency 64 --duration 20
+    python -m benchmarks.load --rate 500 --profile large
+    python -m benchmarks.load --url http://localhost:8000   # servidor ya levantado
+
+Con --concurrency solo, cada conexión envía un request tras otro (carga
+cerrada). Con --rate los requests salen a ritmo fijo, y la latencia se mide
+desde el momento en que debían salir: si el servidor se atrasa, la espera
+cuenta en la latencia.
+
+La caché de resultados se desactiva en el servidor levantado (salvo con
+--with-cache) para medir el cálculo y no la caché.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import httpx
+
+from benchmarks.latency import percentile
+
+# Variantes distintas por tamaño, para que los payloads no sean idénticos
+# (menos variantes en los grandes para no ocupar cientos de MB)
+PAYLOAD_VARIANTS = 8
+LARGE_PAYLOAD_VARIANTS = 2
+LARGE_PAYLOAD_SIZE = 1_000_000
+
+# Perfil: (peso, método, ruta, cantidad de números)
+PROFILES: Dict[str, List[Tuple[int, str, str, int]]] = {
+    "small": [
+        (45, "POST", "/stats", 10),
+        (45, "POST", "/stats/basic", 10),
+        (10, "GET", "/health", 0),
+    ],
+    "mixed": [
+        (35, "POST", "/stats", 10),
+        (20, "POST", "/stats", 1_000),
+        (5, "POST", "/stats", 100_000),
+        (20, "POST", "/stats/basic", 100),
+        (10, "POST", "/stats/basic", 10_000),
+        (10, "GET", "/health", 0),
+    ],
+    "large": [
+        (40, "POST", "/stats", 100_000),
+        (10, "POST", "/stats", 1_000_000),
+        (40, "POST", "/stats/basic", 100_000),
+        (10, "GET", "/health", 0),
+    ],
+}
+
+
+class RequestSpec(NamedTuple):
+    method: str
+    path: str
+    bodies: List[bytes]
+
+
+class LoadResults:
+    """Latencias y resultados por endpoint"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.elapsed = 0.0
+
+    def record(self, endpoint: str, latency: float, status: str):
+        self.latencies[endpoint].append(latency)
+        self.statuses[endpoint][status] += 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Métricas por endpoint y en total (latencias en ms)"""
+        groups = dict(self.latencies)
+        groups["total"] = [value for values in self.latencies.values() for value in values]
+        statuses = dict(self.statuses)
+        statuses["total"] = sum(self.statuses.values(), Counter())
+        report = {}
+        for endpoint, latencies in groups.items():
+            if not latencies:
+                continue
+            ordered = sorted(latencies)
+            count = len(ordered)
+            errors = sum(n for status, n in statuses[endpoint].items() if not status.startswith("2"))
+            report[endpoint] = {
+                "requests": count,
+                "rps": count / self.elapsed if self.elapsed else 0.0,
+                "p50": percentile(ordered, 0.50) * 1000,
+                "p95": percentile(ordered, 0.95) * 1000,
+                "p99": percentile(ordered, 0.99) * 1000,
+                "max": ordered[-1] * 1000,
+                "error_rate": errors / count,
+                "statuses": dict(statuses[endpoint]),
+            }
+        return report
+
+
+def build_profile(name: str, seed: int = 0) -> Tuple[List[RequestSpec], List[int]]:
+    """Requests del perfil con sus payloads ya serializados, y sus pesos"""
+    rng = random.Random(seed)
+    specs, weights = [], []
+    for weight, method, path, size in PROFILES[name]:
+        bodies = [b""]
+        if method == "POST":
+            variants = LARGE_PAYLOAD_VARIANTS if size >= LARGE_PAYLOAD_SIZE else PAYLOAD_VARIANTS
+            bodies = [
+                json.dumps({"numbers": [rng.uniform(-1000, 1000) for _ in range(size)]}).encode()
+                for _ in range(variants)
+            ]
+        specs.append(RequestSpec(method, path, bodies))
+        weights.append(weight)
+    return specs, weights
+
+
+async def send(client: httpx.AsyncClient, spec: RequestSpec, rng: random.Random,
+               results: LoadResults, scheduled: Optional[float] = None,
+               clock: Callable[[], float] = time.perf_counter):
+    """Envía un request y registra su latencia (desde scheduled si se indica)"""
+    start = scheduled if scheduled is not None else clock()
+    label = f"{spec.method} {spec.path}"
+    try:
+        response = await client.request(
+            spec.method, spec.path,
+            content=rng.choice(spec.bodies) if spec.method == "POST" else None,
+            headers={"Content-Type": "application/json"} if spec.method == "POST" else None,
+        )
+        status = str(response.status_code)
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    results.record(label, clock() - start, status)
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    profile: str = "mixed",
+    concurrency: int = 32,
+    duration: float = 10.0,
+    rate: Optional[float] = None,
+    seed: int = 0,
+    clock: Callable[[], float] = time.perf_counter
+) -> LoadResults:
+    """
+    Genera carga durante duration segundos y retorna los resultados.
+
+    Con rate se programan exactamente ceil(duration * rate) requests; clock
+    permite medir con otro reloj (en las pruebas, uno que no depende de la
+    carga de la máquina).
+    """
+    specs, weights = build_profile(profile, seed)
+    results = LoadResults()
+    start = clock()
+    deadline = start + duration
+
+    if rate is None:
+        async def connection(worker: int):
+            rng = random.Random(seed + worker)
+            while clock() < deadline:
+                spec = rng.choices(specs, weights)[0]
+                await send(client, spec, rng, results, clock=clock)
+
+        await asyncio.gather(*(connection(worker) for worker in range(concurrency)))
+    else:
+        # Carga abierta: concurrency limita los requests pendientes
+        rng = random.Random(seed)
+        slots = asyncio.Semaphore(concurrency)
+        tasks = set()
+
+        async def scheduled_send(spec: RequestSpec, scheduled: float):
+            async with slots:
+                await send(client, spec, rng, results, scheduled, clock)
+
+        sent = 0
+        while True:
+            # Se compara el desfase y no start + desfase, que redondea distinto según start
+            offset = sent / rate
+            if offset >= duration:
+                break
+            scheduled = start + offset
+            delay = scheduled - clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.ensure_future(scheduled_send(rng.choices(specs, weights)[0], scheduled))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            sent += 1
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    results.elapsed = clock() - start
+    return results
+
+
+def start_server(workers: int, port: int, with_cache: bool) -> subprocess.Popen:
+    """Levanta uvicorn con la app desde el directorio del proyecto"""
+    env = dict(os.environ)
+    if not with_cache:
+        env["STATS_CACHE_ENTRIES"] = "0"
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+    )
+
+
+async def wait_ready(url: str, server: Optional[subprocess.Popen] = None, timeout: float = 30.0):
+    """Espera a que /health/ready responda 200 (el worker terminó el warm-up)"""
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=url) as client:
+        while True:
+            if server is not None and server.poll() is not None:
+                raise RuntimeError(f"uvicorn terminó con código {server.returncode}")
+            try:
+                if (await client.get("/health/ready")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            if time.perf_counter() > deadline:
+                raise RuntimeError(f"El servidor no respondió en {timeout:.0f}s")
+            await asyncio.sleep(0.2)
+
+
+def print_report(report: Dict[str, Dict[str, float]]):
+    print(f"{'endpoint':<20}{'requests':>10}{'req/s':>10}{'p50':>10}{'p95':>10}"
+          f"{'p99':>10}{'max':>10}{'errores':>10}")
+    for endpoint, row in report.items():
+        print(f"{endpoint:<20}{row['requests']:>10}{row['rps']:>10.1f}"
+              f"{row['p50']:>8.1f}ms{row['p95']:>8.1f}ms{row['p99']:>8.1f}ms"
+              f"{row['max']:>8.1f}ms{row['error_rate']:>10.2%}")
+
+
+async def run(args) -> Dict[str, Dict[str, float]]:
+    url = args.url or f"http://127.0.0.1:{args.port}"
+    server = None if args.url else start_server(args.workers, args.port, args.with_cache)
+    try:
+        await wait_ready(url, server)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=args.timeout) as client:
+            results = await run_load(client, args.profile, args.concurrency, args.duration, args.rate)
+        return results.summary()
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="Servidor ya levantado (no se inicia uvicorn)")
+    parser.add_argument("--workers", type=int, default=1, help="Workers de uvicorn")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=32,
+                        help="Conexiones simultáneas (o requests pendientes con --rate)")
+    parser.add_argument("--rate", type=float, default=None, help="Requests por segundo objetivo")
+    parser.add_argument("--duration", type=float, default=10.0, help="Segundos de carga")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Timeout por request")
+    parser.add_argument("--with-cache", action="store_true", help="Deja activa la caché de resultados")
+    parser.add_argument("--json", metavar="PATH", help="Guarda el reporte en JSON")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""
+Suite de benchmarks de /stats y /stats/basic con umbral de regresión.
+
+Recorre tamaños (10 a 10M), distribuciones y motores. Cada caso se mide
+llamando directamente a calculate_stats / calculate_basic_stats y a través de
+la app ASGI, con body JSON y float64 binario:
+
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json --threshold 0.25
+
+Con --compare el proceso termina con código 1 si algún caso es más lento que
+la línea base en más del umbral. Desde pytest: pytest -m slow, con
+STATS_BENCH_BASELINE apuntando a la línea base a comparar.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import app as app_module
+from app import EngineName, calculate_basic_stats, calculate_stats
+from engines import ENGINES
+from ingest import OCTET_STREAM
+from warmup import call
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+SIZES = (10, 1_000, 100_000, 1_000_000, 10_000_000)
+# all-distinct es el peor caso de la moda: una entrada de frecuencias por valor
+DISTRIBUTIONS = ("uniform", "heavy-duplicate", "all-distinct")
+MODES = ("direct", "asgi-json", "asgi-binary")
+ENDPOINTS = {"stats": "/stats", "basic": "/stats/basic"}
+
+# Un JSON de 10M números pesa ~200 MB: por encima de esto solo se usa binario
+ASGI_JSON_MAX_SIZE = 1_000_000
+
+DEFAULT_THRESHOLD = 0.25
+# Diferencias absolutas por debajo de esto (segundos) se consideran ruido
+NOISE_FLOOR = 0.0005
+
+
+def make_numbers(distribution: str, size: int, seed: int = 0) -> List[float]:
+    """Números reproducibles de la distribución pedida"""
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Distribución desconocida: {distribution}")
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        if distribution == "uniform":
+            values = rng.integers(0, size, size)
+        elif distribution == "heavy-duplicate":
+            values = rng.integers(0, 10, size)
+        else:
+            values = rng.permutation(size)
+        return values.astype(np.float64).tolist()
+
+    rng = random.Random(seed)
+    if distribution == "uniform":
+        return [float(rng.randrange(size)) for _ in range(size)]
+    if distribution == "heavy-duplicate":
+        return [float(rng.randrange(10)) for _ in range(size)]
+    values = [float(i) for i in range(size)]
+    rng.shuffle(values)
+    return values
+
+
+def repeats_for(size: int) -> int:
+    if size <= 100_000:
+        return 5
+    return 3 if size <= 1_000_000 else 1
+
+
+def best_time(func: Callable[[], object], repeat: int, warmup: bool) -> float:
+    """Mejor tiempo en segundos"""
+    if warmup:
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def direct_case(endpoint: str, engine: str, nums: List[float]) -> Callable[[], object]:
+    """Llama al handler sin pasar por HTTP ni validación"""
+    if endpoint == "stats":
+        return lambda: calculate_stats(nums, engine=EngineName(engine), fields=None)
+    return lambda: calculate_basic_stats(nums, engine=EngineName(engine))
+
+
+def asgi_case(
+    loop: asyncio.AbstractEventLoop, endpoint: str, engine: str, body: bytes, content_type: str
+) -> Callable[[], object]:
+    """Request completo a través de la app ASGI"""
+    path = f"{ENDPOINTS[endpoint]}?engine={engine}"
+
+    def run():
+        request = call(app_module.app, "POST", path, body, content_type.encode())
+        status = loop.run_until_complete(request)
+        if status != 200:
+            raise RuntimeError(f"{path} respondió {status}")
+    return run
+
+
+def case_key(endpoint: str, mode: str, engine: str, distribution: str, size: int) -> str:
+    return f"{endpoint}/{mode}/{engine}/{distribution}/{size}"
+
+
+def run_suite(
+    sizes: Iterable[int] = SIZES,
+    distributions: Iterable[str] = DISTRIBUTIONS,
+    engines: Optional[Iterable[str]] = None,
+    modes: Iterable[str] = MODES,
+    progress: Optional[Callable[[str, float], None]] = None
+) -> Dict[str, float]:
+    """Mide todos los casos y retorna {clave: segundos}"""
+    engines = list(engines or ENGINES)
+    modes = list(modes)
+    # Sin caché: cada repetición recorre el camino completo
+    app_module.result_cache = None
+    # Un solo event loop: crear uno por request sumaría su costo a cada caso
+    loop = asyncio.new_event_loop()
+    try:
+        return _run_cases(loop, sizes, distributions, engines, modes, progress)
+    finally:
+        loop.close()
+
+
+def _run_cases(loop, sizes, distributions, engines, modes, progress) -> Dict[str, float]:
+    results = {}
+    for size in sizes:
+        repeat = repeats_for(size)
+        for distribution in distributions:
+            nums = make_numbers(distribution, size)
+            bodies = {}
+            if "asgi-json" in modes and size <= ASGI_JSON_MAX_SIZE:
+                bodies["asgi-json"] = (json.dumps({"numbers": nums}).encode(), "application/json")
+            if "asgi-binary" in modes:
+                bodies["asgi-binary"] = (array("d", nums).tobytes(), OCTET_STREAM)
+            for endpoint in ENDPOINTS:
+                for engine in engines:
+                    cases = {}
+                    if "direct" in modes:
+                        cases["direct"] = direct_case(endpoint, engine, nums)
+                    for mode, (body, content_type) in bodies.items():
+                        cases[mode] = asgi_case(loop, endpoint, engine, body, content_type)
+                    for mode, func in cases.items():
+                        key = case_key(endpoint, mode, engine, distribution, size)
+                        results[key] = best_time(func, repeat, warmup=size <= 100_000)
+                        if progress is not None:
+                            progress(key, results[key])
+    return results
+
+
+def compare(
+    results: Dict[str, float],
+    baseline: Dict[str, float],
+    threshold: float = DEFAULT_THRESHOLD,
+    noise_floor: float = NOISE_FLOOR
+) -> List[Tuple[str, float, float]]:
+    """
+    Casos más lentos que la línea base en más del umbral.
+
+    Retorna (clave, segundos base, segundos actuales); los casos que no
+    están en la línea base no se comparan.
+    """
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if current - base > noise_floor and current > base * (1 + threshold):
+            regressions.append((key, base, current))
+    return regressions
+
+
+def save_baseline(path: str, results: Dict[str, float]):
+    document = {
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "engines": sorted(ENGINES),
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def parse_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="Tamaños separados por coma")
+    parser.add_argument("--max-size", type=int, default=None,
+                        help="Omite los tamaños mayores a este")
+    parser.add_argument("--distributions", default=",".join(DISTRIBUTIONS))
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--save", metavar="PATH", help="Guarda los resultados como línea base")
+    parser.add_argument("--compare", metavar="PATH", help="Compara con una línea base")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Regresión relativa tolerada (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in parse_list(args.sizes)]
+    if args.max_size is not None:
+        sizes = [size for size in sizes if size <= args.max_size]
+    results = run_suite(
+        sizes,
+        parse_list(args.distributions),
+        parse_list(args.engines),
+        parse_list(args.modes),
+        progress=lambda key, seconds: print(f"{key:<55} {seconds * 1000:>10.2f}ms", flush=True),
+    )
+
+    if args.save:
+        save_baseline(args.save, results)
+    if args.compare:
+        regressions = compare(results, load_baseline(args.compare), args.threshold)
+        for key, base, current in regressions:
+            print(f"REGRESIÓN {key}: {base * 1000:.2f}ms -> {current * 1000:.2f}ms "
+                  f"(+{(current / base - 1) * 100:.0f}%)")
+        if regressions:
+            return 1
+        print(f"Sin regresiones mayores a {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
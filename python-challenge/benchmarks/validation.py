@@ -0,0 +1,69 @@
+"""
+Benchmark de validación de la entrada de /stats.
+
+Mide solo la validación (sin cálculo de estadísticas) para 10k, 100k y 1M
+elementos:
+
+    python -m benchmarks.validation
+"""
+import json
+import random
+import struct
+import timeit
+from typing import List
+
+from pydantic import BaseModel, field_validator
+
+from app import DataIn, DataInStrict
+from ingest import OCTET_STREAM, parse_binary
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+
+class LegacyDataIn(BaseModel):
+    """Validación anterior: List[float] más un bucle de isinstance en Python"""
+    numbers: List[float]
+
+    @field_validator("numbers")
+    @classmethod
+    def validate_numbers(cls, v):
+        if not isinstance(v, list):
+            raise ValueError("numbers debe ser una lista")
+        for num in v:
+            if not isinstance(num, (int, float)):
+                raise ValueError("Todos los elementos deben ser números")
+        return v
+
+
+def best_of(func, repeat: int = 5) -> float:
+    """Mejor tiempo en milisegundos"""
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def run(sizes=SIZES):
+    rng = random.Random(0)
+    rows = []
+    for size in sizes:
+        nums = [rng.uniform(-1e6, 1e6) for _ in range(size)]
+        body = json.dumps({"numbers": nums}).encode()
+        binary = struct.pack(f"<{size}d", *nums)
+        rows.append((size, {
+            "legacy (json.loads + bucle)": best_of(
+                lambda: LegacyDataIn.model_validate(json.loads(body))),
+            "DataIn (pydantic-core)": best_of(lambda: DataIn.model_validate_json(body)),
+            "DataInStrict": best_of(lambda: DataInStrict.model_validate_json(body)),
+            "float64 binario": best_of(lambda: parse_binary(binary, OCTET_STREAM)),
+        }))
+    return rows
+
+
+def main():
+    rows = run()
+    names = list(rows[0][1])
+    print(f"{'validación':<30}" + "".join(f"{size:>12,}" for size, _ in rows))
+    for name in names:
+        print(f"{name:<30}" + "".join(f"{timings[name]:>10.2f}ms" for _, timings in rows))
+
+
+if __name__ == "__main__":
+    main()
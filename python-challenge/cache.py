@@ -0,0 +1,192 @@
+"""
+Caché de resultados para la Statistics API.
+
+La clave es un hash blake2b de los números como float64 más el endpoint y el
+motor, y el valor es la respuesta JSON ya serializada: un acierto no recalcula
+ni vuelve a construir StatsOut.
+
+Configuración por variables de entorno:
+
+- STATS_CACHE_ENTRIES: máximo de entradas (por defecto 1024; 0 la desactiva)
+- STATS_CACHE_BYTES: máximo de bytes de respuestas guardadas (por defecto 64 MB)
+- STATS_CACHE_TTL: segundos de vida de cada entrada (por defecto 300)
+- STATS_CACHE_DB: archivo SQLite para compartir la caché entre workers
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+
+def cache_key(endpoint: str, engine: str, nums: Sequence[float]) -> str:
+    """Hash de la entrada canonizada como float64 nativos"""
+    if np is not None and isinstance(nums, np.ndarray):
+        data = np.ascontiguousarray(nums, dtype=np.float64).tobytes()
+    elif isinstance(nums, memoryview):
+        data = nums.tobytes()
+    else:
+        data = array("d", nums).tobytes()
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    return f"{endpoint}:{engine}:{digest}"
+
+
+class CacheCounters:
+    """Contadores de aciertos, fallos y desalojos"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class MemoryCache:
+    """Caché LRU con TTL en memoria del proceso"""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.counters = CacheCounters()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.counters.misses += 1
+                return None
+            expires, value = entry
+            if expires <= time.monotonic():
+                self._remove(key)
+                self.counters.expirations += 1
+                self.counters.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._bytes += len(value)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.counters.evictions += 1
+
+    def _remove(self, key: str):
+        _, value = self._entries.pop(key)
+        self._bytes -= len(value)
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.counters.as_dict(), "entries": len(self._entries), "bytes": self._bytes}
+
+
+class SQLiteCache:
+    """
+    Caché LRU con TTL en un archivo SQLite compartido entre workers.
+
+    Los contadores son del proceso; las entradas son comunes a todos.
+    """
+
+    def __init__(self, path: str, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.counters = CacheCounters()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " expires REAL NOT NULL,"
+                " used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.counters.misses += 1
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self.counters.expirations += 1
+                self.counters.misses += 1
+                return None
+            self._conn.execute("UPDATE results SET used = ? WHERE key = ?", (now, key))
+            self.counters.hits += 1
+            return bytes(row[0])
+
+    def set(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, expires, used)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now + self.ttl, now),
+            )
+            while True:
+                entries, total = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+                ).fetchone()
+                if entries <= self.max_entries and total <= self.max_bytes:
+                    break
+                self._conn.execute(
+                    "DELETE FROM results WHERE key = (SELECT key FROM results ORDER BY used LIMIT 1)"
+                )
+                self.counters.evictions += 1
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+        return {**self.counters.as_dict(), "entries": entries, "bytes": total}
+
+
+def create_cache():
+    """Crea la caché configurada; None si está desactivada"""
+    max_entries = int(os.environ.get("STATS_CACHE_ENTRIES", 1024))
+    if max_entries <= 0:
+        return None
+    max_bytes = int(os.environ.get("STATS_CACHE_BYTES", 64 * 1024 * 1024))
+    ttl = float(os.environ.get("STATS_CACHE_TTL", 300))
+    path = os.environ.get("STATS_CACHE_DB")
+    if path:
+        return SQLiteCache(path, max_entries, max_bytes, ttl)
+    return MemoryCache(max_entries, max_bytes, ttl)
@@ -0,0 +1,144 @@
+"""
+Datasets incrementales para la Statistics API.
+
+Cada dataset guarda un resumen combinable (count, sum, M2, min, max y tabla de
+frecuencias), así que agregar un lote cuesta O(lote) y no O(total).
+
+Por defecto los datasets viven en memoria del proceso; si la variable de
+entorno STATS_DATASETS_DB apunta a un archivo se usa SQLite.
+"""
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from collections import Counter
+from typing import Any, Dict, Optional, Sequence
+
+from engines import RunningStats, as_python_floats, stats_from_accumulators
+
+
+def summarize(values: Sequence[float]):
+    """Resumen de un lote: acumulador de momentos y frecuencias"""
+    values = as_python_floats(values)
+    return RunningStats().update(values), Counter(values)
+
+
+class DatasetNotFound(KeyError):
+    """El dataset pedido no existe"""
+
+
+class MemoryDatasetStore:
+    """Datasets en memoria del proceso"""
+
+    def __init__(self):
+        self._datasets: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def create(self) -> str:
+        dataset_id = uuid.uuid4().hex
+        with self._lock:
+            self._datasets[dataset_id] = (RunningStats(), Counter())
+        return dataset_id
+
+    def append(self, dataset_id: str, values: Sequence[float]) -> int:
+        """Agrega un lote y retorna el total de elementos del dataset"""
+        batch_moments, batch_counts = summarize(values)
+        with self._lock:
+            if dataset_id not in self._datasets:
+                raise DatasetNotFound(dataset_id)
+            moments, counter = self._datasets[dataset_id]
+            moments.merge(batch_moments)
+            counter.update(batch_counts)
+            return moments.count
+
+    def stats(self, dataset_id: str) -> Dict[str, Any]:
+        with self._lock:
+            if dataset_id not in self._datasets:
+                raise DatasetNotFound(dataset_id)
+            moments, counter = self._datasets[dataset_id]
+            return stats_from_accumulators(moments, counter)
+
+
+class SQLiteDatasetStore:
+    """
+    Datasets persistidos en SQLite.
+
+    La tabla de frecuencias guarda la posición de la primera aparición de
+    cada valor, para que la moda respete el mismo orden que /stats.
+    """
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS datasets ("
+                " id TEXT PRIMARY KEY,"
+                " moments TEXT NOT NULL,"
+                " next_position INTEGER NOT NULL DEFAULT 0)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS frequencies ("
+                " dataset_id TEXT NOT NULL,"
+                " value REAL NOT NULL,"
+                " count INTEGER NOT NULL,"
+                " position INTEGER NOT NULL,"
+                " PRIMARY KEY (dataset_id, value))"
+            )
+
+    def create(self) -> str:
+        dataset_id = uuid.uuid4().hex
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO datasets (id, moments) VALUES (?, ?)",
+                (dataset_id, json.dumps(RunningStats().state())),
+            )
+        return dataset_id
+
+    def _load_moments(self, dataset_id: str):
+        row = self._conn.execute(
+            "SELECT moments, next_position FROM datasets WHERE id = ?", (dataset_id,)
+        ).fetchone()
+        if row is None:
+            raise DatasetNotFound(dataset_id)
+        return RunningStats.from_state(json.loads(row[0])), row[1]
+
+    def append(self, dataset_id: str, values: Sequence[float]) -> int:
+        """Agrega un lote y retorna el total de elementos del dataset"""
+        batch_moments, batch_counts = summarize(values)
+        with self._lock, self._conn:
+            moments, next_position = self._load_moments(dataset_id)
+            moments.merge(batch_moments)
+            self._conn.executemany(
+                "INSERT INTO frequencies (dataset_id, value, count, position)"
+                " VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (dataset_id, value) DO UPDATE SET count = count + excluded.count",
+                (
+                    (dataset_id, value, count, next_position + offset)
+                    for offset, (value, count) in enumerate(batch_counts.items())
+                ),
+            )
+            self._conn.execute(
+                "UPDATE datasets SET moments = ?, next_position = ? WHERE id = ?",
+                (json.dumps(moments.state()), next_position + len(batch_counts), dataset_id),
+            )
+            return moments.count
+
+    def stats(self, dataset_id: str) -> Dict[str, Any]:
+        with self._lock:
+            moments, _ = self._load_moments(dataset_id)
+            rows = self._conn.execute(
+                "SELECT value, count FROM frequencies WHERE dataset_id = ? ORDER BY position",
+                (dataset_id,),
+            )
+            counter = Counter(dict(rows))
+        return stats_from_accumulators(moments, counter)
+
+
+def create_store(path: Optional[str] = None):
+    """Crea el almacenamiento configurado (SQLite si hay ruta, si no memoria)"""
+    path = path if path is not None else os.environ.get("STATS_DATASETS_DB")
+    if path:
+        return SQLiteDatasetStore(path)
+    return MemoryDatasetStore()
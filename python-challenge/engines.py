@@ -0,0 +1,553 @@
+"""
+Motores de cálculo para la Statistics API.
+
+El cálculo se hace en un solo recorrido para los momentos (count, sum, min,
+max, media y varianza) y un recorrido de frecuencias que sirve tanto para la
+moda como para seleccionar la mediana.
+
+Hay dos motores intercambiables: el de Python puro (siempre disponible) y uno
+vectorizado con NumPy, que se usa cuando la librería está instalada.
+
+Los cálculos completos aceptan un diccionario timings opcional donde anotan
+la duración de cada paso (ver metrics.py).
+"""
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate, repeat
+from math import fsum, inf, sqrt
+from operator import mul, sub
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from metrics import stage_timer
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+# Tamaño a partir del cual el modo "auto" elige NumPy
+NUMPY_MIN_SIZE = 256
+
+STATS_FIELDS = (
+    "count", "mean", "median", "mode", "std_dev",
+    "variance", "min", "max", "range", "sum",
+)
+
+
+class RunningStats:
+    """
+    Acumulador de momentos en un solo paso.
+
+    Usa el algoritmo de Welford para la varianza y suma compensada
+    (Neumaier) para que la suma y la media queden prácticamente exactas.
+    """
+
+    __slots__ = ("count", "_sum", "_comp", "_mean", "_m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self._sum = 0.0
+        self._comp = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.min = inf
+        self.max = -inf
+
+    def update(self, values: Iterable[float]) -> "RunningStats":
+        """Incorpora todos los valores de un iterable"""
+        # Variables locales: el bucle es la parte caliente del cálculo
+        n, s, c, mean, m2 = self.count, self._sum, self._comp, self._mean, self._m2
+        lo, hi = self.min, self.max
+        for x in values:
+            n += 1
+            t = s + x
+            if abs(s) >= abs(x):
+                c += (s - t) + x
+            else:
+                c += (x - t) + s
+            s = t
+            delta = x - mean
+            mean += delta / n
+            m2 += delta * (x - mean)
+            if x < lo:
+                lo = x
+            if x > hi:
+                hi = x
+        self.count, self._sum, self._comp, self._mean, self._m2 = n, s, c, mean, m2
+        self.min, self.max = lo, hi
+        return self
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Combina otro acumulador (fórmula de Chan et al.), O(1)"""
+        if not other.count:
+            return self
+        if not self.count:
+            self.count, self._sum, self._comp = other.count, other._sum, other._comp
+            self._mean, self._m2 = other._mean, other._m2
+            self.min, self.max = other.min, other.max
+            return self
+
+        n = self.count + other.count
+        delta = other._mean - self._mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / n
+        self._mean += delta * other.count / n
+        self.count = n
+
+        t = self._sum + other._sum
+        if abs(self._sum) >= abs(other._sum):
+            self._comp += (self._sum - t) + other._sum
+        else:
+            self._comp += (other._sum - t) + self._sum
+        self._sum = t
+        self._comp += other._comp
+
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def state(self) -> List[float]:
+        """Estado serializable del acumulador"""
+        return [self.count, self._sum, self._comp, self._mean, self._m2, self.min, self.max]
+
+    @classmethod
+    def from_state(cls, state: Sequence[float]) -> "RunningStats":
+        """Reconstruye un acumulador a partir de state()"""
+        acc = cls()
+        (acc.count, acc._sum, acc._comp, acc._mean,
+         acc._m2, acc.min, acc.max) = state
+        acc.count = int(acc.count)
+        return acc
+
+    @property
+    def sum(self) -> float:
+        return self._sum + self._comp
+
+    @property
+    def mean(self) -> Optional[float]:
+        if not self.count:
+            return None
+        return self.sum / self.count
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Varianza muestral (n - 1), 0.0 con un único valor"""
+        if not self.count:
+            return None
+        if self.count < 2:
+            return 0.0
+        return self._m2 / (self.count - 1)
+
+
+def empty_stats() -> Dict[str, Any]:
+    """Estadísticas de una lista vacía: count 0 y el resto None"""
+    stats = dict.fromkeys(STATS_FIELDS)
+    stats["count"] = 0
+    return stats
+
+
+def mode_from_counts(counter: Counter) -> Optional[List[float]]:
+    """Moda con el mismo criterio que statistics.mode (primer valor más frecuente)"""
+    if not counter:
+        return None
+    return [counter.most_common(1)[0][0]]
+
+
+def median_from_counts(counter: Counter, count: int) -> Optional[float]:
+    """Selecciona la mediana ordenando solo los valores distintos"""
+    if not count:
+        return None
+    keys = sorted(counter)
+    if len(keys) == count:
+        # Todos distintos: los índices coinciden con las posiciones
+        mid = count // 2
+        if count % 2:
+            return keys[mid]
+        return (keys[mid - 1] + keys[mid]) / 2
+    cumulative = list(accumulate(map(counter.__getitem__, keys)))
+    mid = count // 2
+    upper = keys[bisect_right(cumulative, mid)]
+    if count % 2:
+        return upper
+    lower = keys[bisect_right(cumulative, mid - 1)]
+    return (lower + upper) / 2
+
+
+def stats_from_accumulators(
+    moments: RunningStats,
+    counter: Optional[Counter] = None,
+    timings: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """
+    Arma los campos de StatsOut a partir de acumuladores ya alimentados.
+
+    Sin tabla de frecuencias, la mediana y la moda quedan en None.
+    """
+    count = moments.count
+    if not count:
+        return empty_stats()
+
+    variance_val = moments.variance
+    median = mode = None
+    if counter is not None:
+        with stage_timer(timings, "median"):
+            median = median_from_counts(counter, count)
+        with stage_timer(timings, "mode"):
+            mode = mode_from_counts(counter)
+    return {
+        "count": count,
+        "mean": round(moments.mean, 6),
+        "median": median,
+        "mode": mode,
+        "std_dev": round(sqrt(variance_val), 6),
+        "variance": round(variance_val, 6),
+        "min": moments.min,
+        "max": moments.max,
+        "range": moments.max - moments.min,
+        "sum": moments.sum,
+    }
+
+
+def compute_stats(nums: Sequence[float], timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Calcula todos los campos de StatsOut.
+
+    - Un paso para los momentos (RunningStats)
+    - Un paso de frecuencias (Counter) reutilizado por moda y mediana
+    """
+    with stage_timer(timings, "moments"):
+        moments = RunningStats().update(nums)
+    with stage_timer(timings, "frequencies"):
+        counter = Counter(nums)
+    return stats_from_accumulators(moments, counter, timings)
+
+
+def compute_basic_stats(nums: Sequence[float]) -> Dict[str, Any]:
+    """Media, máximo y mínimo"""
+    if not len(nums):
+        return {"mean": None, "max": None, "min": None}
+    return {"mean": sum(nums) / len(nums), "max": max(nums), "min": min(nums)}
+
+
+def interpolate_quantiles(ordered: Sequence[float], qs: Sequence[float]) -> List[Optional[float]]:
+    """Cuantiles con interpolación lineal sobre datos ordenados (como np.quantile)"""
+    count = len(ordered)
+    if not count:
+        return [None] * len(qs)
+    result = []
+    for q in qs:
+        position = (count - 1) * q
+        lower = int(position)
+        upper = min(lower + 1, count - 1)
+        fraction = position - lower
+        value = ordered[lower]
+        if fraction and ordered[upper] != value:
+            value = value + (ordered[upper] - value) * fraction
+        result.append(value)
+    return result
+
+
+def compute_quantiles(nums: Sequence[float], qs: Sequence[float]) -> List[Optional[float]]:
+    """Cuantiles exactos; para q=0.5 coincide con la mediana de compute_stats"""
+    return interpolate_quantiles(sorted(nums), qs)
+
+
+def numpy_quantiles(nums: Sequence[float], qs: Sequence[float]) -> List[Optional[float]]:
+    """Cuantiles exactos por selección (np.quantile usa np.partition)"""
+    arr = np.asarray(nums, dtype=np.float64)
+    if not arr.size:
+        return [None] * len(qs)
+    return [float(v) for v in np.quantile(arr, qs)]
+
+
+def compute_top_k(nums: Sequence[float], k: int) -> List[Tuple[float, int]]:
+    """Los k valores más frecuentes en una pasada; los empates, por primera aparición"""
+    return Counter(nums).most_common(k)
+
+
+def numpy_top_k(nums: Sequence[float], k: int) -> List[Tuple[float, int]]:
+    """Versión vectorizada de compute_top_k (np.unique ordena una sola vez)"""
+    arr = np.asarray(nums, dtype=np.float64)
+    if not arr.size:
+        return []
+    values, first, counts = np.unique(arr, return_index=True, return_counts=True)
+    top = np.lexsort((first, -counts))[:k]
+    return list(zip(values[top].tolist(), counts[top].tolist()))
+
+
+def median_from_sorted(ordered: Sequence[float]) -> float:
+    """Mediana de datos ya ordenados"""
+    count = len(ordered)
+    mid = count // 2
+    if count % 2:
+        return float(ordered[mid])
+    return (float(ordered[mid - 1]) + float(ordered[mid])) / 2
+
+
+def numpy_mode(arr, ordered) -> float:
+    """Moda a partir de las rachas de valores iguales del arreglo ordenado"""
+    starts = np.flatnonzero(np.concatenate(([True], ordered[1:] != ordered[:-1])))
+    counts = np.diff(np.append(starts, ordered.size))
+    max_count = counts.max()
+    candidates = ordered[starts[counts == max_count]]
+    if candidates.size == 1:
+        return float(candidates[0])
+    if max_count == 1:
+        return float(arr[0])
+    # Empate: igual que statistics.mode, el primero que aparece
+    return float(arr[np.argmax(np.isin(arr, candidates))])
+
+
+def numpy_stats(nums: Sequence[float], timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Versión vectorizada de compute_stats.
+
+    Un único ordenamiento da la mediana y las frecuencias (como np.unique),
+    el resto son reducciones de NumPy.
+    """
+    arr = np.asarray(nums, dtype=np.float64)
+    count = int(arr.size)
+    if not count:
+        return empty_stats()
+
+    with stage_timer(timings, "sort"):
+        ordered = np.sort(arr)
+    with stage_timer(timings, "median"):
+        median = median_from_sorted(ordered)
+    with stage_timer(timings, "mode"):
+        mode = numpy_mode(arr, ordered)
+    with stage_timer(timings, "moments"):
+        min_val = float(ordered[0])
+        max_val = float(ordered[-1])
+        variance_val = float(arr.var(ddof=1)) if count > 1 else 0.0
+        mean = float(arr.mean())
+        total = float(arr.sum())
+    return {
+        "count": count,
+        "mean": round(mean, 6),
+        "median": median,
+        "mode": [mode],
+        "std_dev": round(sqrt(variance_val), 6),
+        "variance": round(variance_val, 6),
+        "min": min_val,
+        "max": max_val,
+        "range": max_val - min_val,
+        "sum": total,
+    }
+
+
+def numpy_basic_stats(nums: Sequence[float]) -> Dict[str, Any]:
+    """Versión vectorizada de compute_basic_stats"""
+    arr = np.asarray(nums, dtype=np.float64)
+    if not arr.size:
+        return {"mean": None, "max": None, "min": None}
+    return {"mean": float(arr.mean()), "max": float(arr.max()), "min": float(arr.min())}
+
+
+# Orden de cálculo para ?fields=: la moda va antes que la mediana para que
+# la mediana pueda reutilizar la tabla de frecuencias o el arreglo ordenado
+SELECT_ORDER = (
+    "count", "sum", "min", "max", "mean", "range",
+    "variance", "std_dev", "mode", "median",
+)
+ROUNDED_FIELDS = ("mean", "variance", "std_dev")
+
+
+def parse_fields(fields: str) -> Tuple[str, ...]:
+    """Valida una lista de campos separada por comas"""
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in STATS_FIELDS]
+    if unknown or not names:
+        raise ValueError(f"Campos inválidos: {', '.join(unknown) or fields!r}")
+    return names
+
+
+class FieldResolver:
+    """
+    Calcula campos bajo demanda.
+
+    Cada kernel recibe el resolver y pide sus dependencias con resolver[name];
+    los resultados intermedios (suma, tabla de frecuencias, arreglo ordenado)
+    se calculan una sola vez aunque varios campos los usen.
+    """
+
+    def __init__(self, nums: Sequence[float], kernels: Dict[str, Any]):
+        self.nums = nums
+        self.kernels = kernels
+        self.values: Dict[str, Any] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.values
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.values:
+            self.values[name] = self.kernels[name](self)
+        return self.values[name]
+
+
+def select_stats(
+    nums: Sequence[float],
+    fields: Sequence[str],
+    kernels: Dict[str, Any],
+    timings: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """
+    Calcula solo los campos pedidos, con los mismos valores que el cálculo completo.
+
+    En timings, cada campo incluye las dependencias que calculó primero.
+    """
+    if not len(nums):
+        return {name: empty_stats()[name] for name in fields}
+    resolver = FieldResolver(nums, kernels)
+    for name in SELECT_ORDER:
+        if name in fields:
+            with stage_timer(timings, name):
+                resolver[name]
+    result = {}
+    for name in STATS_FIELDS:
+        if name in fields:
+            value = resolver[name]
+            if name in ROUNDED_FIELDS:
+                value = round(value, 6)
+            elif name == "mode":
+                value = [value]
+            result[name] = value
+    return result
+
+
+def _python_variance(r: FieldResolver) -> float:
+    """Varianza en dos pasadas en C, corregida por el error de la media"""
+    count = r["count"]
+    if count < 2:
+        return 0.0
+    deviations = list(map(sub, r.nums, repeat(r["mean"])))
+    correction = fsum(deviations)
+    return (fsum(map(mul, deviations, deviations)) - correction * correction / count) / (count - 1)
+
+
+def _python_median(r: FieldResolver) -> float:
+    if "counts" in r:
+        return median_from_counts(r["counts"], r["count"])
+    ordered = sorted(r.nums)
+    return median_from_sorted(ordered)
+
+
+PYTHON_KERNELS = {
+    "count": lambda r: len(r.nums),
+    "sum": lambda r: fsum(r.nums),
+    "min": lambda r: min(r.nums),
+    "max": lambda r: max(r.nums),
+    "mean": lambda r: r["sum"] / r["count"],
+    "range": lambda r: r["max"] - r["min"],
+    "variance": _python_variance,
+    "std_dev": lambda r: sqrt(r["variance"]),
+    "counts": lambda r: Counter(r.nums),
+    "mode": lambda r: mode_from_counts(r["counts"])[0],
+    "median": _python_median,
+}
+
+
+def _numpy_median(r: FieldResolver) -> float:
+    if "sorted" in r:
+        return median_from_sorted(r["sorted"])
+    # Sin la moda no hace falta ordenar todo: selección con np.partition
+    arr = r["arr"]
+    mid = arr.size // 2
+    if arr.size % 2:
+        return float(np.partition(arr, mid)[mid])
+    part = np.partition(arr, [mid - 1, mid])
+    return (float(part[mid - 1]) + float(part[mid])) / 2
+
+
+NUMPY_KERNELS = {
+    "arr": lambda r: np.asarray(r.nums, dtype=np.float64),
+    "sorted": lambda r: np.sort(r["arr"]),
+    "count": lambda r: int(r["arr"].size),
+    "sum": lambda r: float(r["arr"].sum()),
+    "min": lambda r: float(r["arr"].min()),
+    "max": lambda r: float(r["arr"].max()),
+    "mean": lambda r: r["sum"] / r["count"],
+    "range": lambda r: r["max"] - r["min"],
+    "variance": lambda r: float(r["arr"].var(ddof=1)) if r["count"] > 1 else 0.0,
+    "std_dev": lambda r: sqrt(r["variance"]),
+    "mode": lambda r: numpy_mode(r["arr"], r["sorted"]),
+    "median": _numpy_median,
+}
+
+
+def as_python_floats(nums: Sequence[float]) -> Sequence[float]:
+    """Convierte arreglos de NumPy a lista; iterar np.float64 es mucho más lento"""
+    if np is not None and isinstance(nums, np.ndarray):
+        return nums.tolist()
+    return nums
+
+
+class PythonEngine:
+    """Motor de Python puro, sin dependencias externas"""
+
+    name = "python"
+
+    def stats(self, nums: Sequence[float], timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        return compute_stats(as_python_floats(nums), timings)
+
+    def basic(self, nums: Sequence[float]) -> Dict[str, Any]:
+        return compute_basic_stats(as_python_floats(nums))
+
+    def quantiles(self, nums: Sequence[float], qs: Sequence[float]) -> List[Optional[float]]:
+        return compute_quantiles(as_python_floats(nums), qs)
+
+    def top_k(self, nums: Sequence[float], k: int) -> List[Tuple[float, int]]:
+        return compute_top_k(as_python_floats(nums), k)
+
+    def select(
+        self, nums: Sequence[float], fields: Sequence[str], timings: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        return select_stats(as_python_floats(nums), fields, PYTHON_KERNELS, timings)
+
+
+class NumpyEngine:
+    """Motor vectorizado con NumPy"""
+
+    name = "numpy"
+
+    def stats(self, nums: Sequence[float], timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        return numpy_stats(nums, timings)
+
+    def basic(self, nums: Sequence[float]) -> Dict[str, Any]:
+        return numpy_basic_stats(nums)
+
+    def quantiles(self, nums: Sequence[float], qs: Sequence[float]) -> List[Optional[float]]:
+        return numpy_quantiles(nums, qs)
+
+    def top_k(self, nums: Sequence[float], k: int) -> List[Tuple[float, int]]:
+        return numpy_top_k(nums, k)
+
+    def select(
+        self, nums: Sequence[float], fields: Sequence[str], timings: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        return select_stats(nums, fields, NUMPY_KERNELS, timings)
+
+
+ENGINES: Dict[str, Any] = {"python": PythonEngine()}
+if np is not None:
+    ENGINES["numpy"] = NumpyEngine()
+
+
+def get_engine(name: Optional[str] = None, size: int = 0):
+    """
+    Retorna el motor pedido.
+
+    Con name None o "auto" elige NumPy si está disponible y la entrada
+    tiene al menos NUMPY_MIN_SIZE elementos.
+    """
+    if name in (None, "auto"):
+        use_numpy = "numpy" in ENGINES and size >= NUMPY_MIN_SIZE
+        name = "numpy" if use_numpy else "python"
+    if name not in ENGINES:
+        raise ValueError(f"Motor '{name}' no disponible")
+    return ENGINES[name]
+
+
+def named_stats(item: Tuple[str, Sequence[float], Optional[str]]) -> Tuple[str, Dict[str, Any]]:
+    """Estadísticas de una serie con nombre; se puede enviar a otro proceso"""
+    name, nums, engine = item
+    return name, get_engine(engine, len(nums)).stats(nums)
@@ -0,0 +1,228 @@
+"""
+Ejecución en varios procesos para cálculos pesados de la Statistics API.
+
+El pool se crea la primera vez que se necesita, así los procesos que nunca
+reciben trabajo grande no pagan su arranque. El warm-up lo arranca antes solo
+si algún cálculo puede llegar a usarlo (ver pool_in_use). Las listas grandes viajan a los
+workers por memoria compartida (float64) en lugar de serializarse con pickle.
+
+Configuración por variables de entorno:
+
+- STATS_POOL_WORKERS: procesos del pool (por defecto, una por CPU)
+- STATS_OFFLOAD_MIN_SIZE: elementos a partir de los cuales /stats se
+  calcula en el pool (por defecto 100000; 0 desactiva el offload)
+- STATS_POOL_MAX_PENDING: cálculos simultáneos en el pool; por encima se
+  responde 503 (por defecto, el doble de workers)
+
+Si un worker muere (por ejemplo, lo mata el OOM killer) el pool queda roto:
+los cálculos en curso responden 503 y el siguiente crea un pool nuevo.
+"""
+import os
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from engines import get_engine
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+FLOAT64_SIZE = 8
+
+# Total de elementos a partir del cual un lote se reparte entre procesos
+PARALLEL_MIN_SIZE = 200_000
+
+POOL_WORKERS = int(os.environ.get("STATS_POOL_WORKERS", 0)) or (os.cpu_count() or 1)
+OFFLOAD_MIN_SIZE = int(os.environ.get("STATS_OFFLOAD_MIN_SIZE", 100_000))
+MAX_PENDING = int(os.environ.get("STATS_POOL_MAX_PENDING", 0)) or POOL_WORKERS * 2
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_pending = 0
+
+
+class PoolBusy(Exception):
+    """El pool ya tiene MAX_PENDING cálculos en curso"""
+
+
+class PoolBroken(PoolBusy):
+    """Un worker del pool murió; el próximo cálculo usa un pool nuevo"""
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Pool de procesos compartido, uno por worker de uvicorn"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=POOL_WORKERS)
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Descarta un pool roto, salvo que otro hilo ya lo haya reemplazado"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_process_pool():
+    """Detiene el pool; los procesos no deben sobrevivir al worker de uvicorn"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _warm_worker() -> int:
+    return os.getpid()
+
+
+def pool_in_use() -> bool:
+    """Si algún cálculo puede ir al pool: offload activo o lotes repartidos entre procesos"""
+    return bool(OFFLOAD_MIN_SIZE) or POOL_WORKERS >= 2
+
+
+def warm_process_pool() -> bool:
+    """Arranca los procesos del pool antes del primer cálculo grande; False si no se usa"""
+    if not pool_in_use():
+        return False
+    pool = get_process_pool()
+    for future in [pool.submit(_warm_worker) for _ in range(POOL_WORKERS)]:
+        future.result()
+    return True
+
+
+def parallel_workers(total_size: int) -> int:
+    """Procesos entre los que conviene repartir total_size elementos (1: en línea)"""
+    if POOL_WORKERS < 2 or total_size < PARALLEL_MIN_SIZE:
+        return 1
+    return POOL_WORKERS
+
+
+def parallel_map(func: Callable, items: List[Any], total_size: int) -> Iterable[Any]:
+    """
+    Aplica func a cada item, en procesos si el trabajo lo justifica.
+
+    Con pocos items, pocos elementos o un solo proceso en el pool se calcula
+    en línea: enviar los datos a otro proceso costaría más que el cálculo.
+    En el pool cuenta como un cálculo en curso hasta tener todos los
+    resultados; lanza PoolBusy si ya hay MAX_PENDING y PoolBroken si murió
+    un worker.
+    """
+    workers = parallel_workers(total_size)
+    if len(items) < 2 or workers < 2:
+        return map(func, items)
+    chunksize = max(1, len(items) // (workers * 4))
+    _acquire_slot()
+    try:
+        pool = get_process_pool()
+        return list(pool.map(func, items, chunksize=chunksize))
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise PoolBroken()
+    finally:
+        _release_slot()
+
+
+def _acquire_slot():
+    global _pending
+    with _pool_lock:
+        if _pending >= MAX_PENDING:
+            raise PoolBusy()
+        _pending += 1
+
+
+def _release_slot():
+    global _pending
+    with _pool_lock:
+        _pending -= 1
+
+
+def pending_tasks() -> int:
+    """Cálculos en curso en el pool"""
+    return _pending
+
+
+def _write_float64(buffer: memoryview, nums: Sequence[float]):
+    """Copia los números al segmento compartido como float64 nativos"""
+    if np is not None:
+        target = np.ndarray((len(nums),), dtype=np.float64, buffer=buffer)
+        target[:] = nums
+        del target
+    else:
+        buffer[:len(nums) * FLOAT64_SIZE] = array("d", nums).tobytes()
+
+
+def _float64_view(buffer: memoryview, count: int) -> Sequence[float]:
+    """Vista sin copia de los números del segmento compartido"""
+    if np is not None:
+        return np.ndarray((count,), dtype=np.float64, buffer=buffer)
+    return buffer[:count * FLOAT64_SIZE].cast("d")
+
+
+def _run_shared(shm_name: str, count: int, engine: str, method: str, args: tuple, kwargs: dict) -> Any:
+    """Se ejecuta en el worker: lee la memoria compartida y llama al motor"""
+    shm = SharedMemory(name=shm_name)
+    try:
+        values = _float64_view(shm.buf, count)
+        result = getattr(get_engine(engine, count), method)(values, *args, **kwargs)
+        if isinstance(values, memoryview):
+            values.release()
+        del values
+        # Los tiempos por paso vuelven junto con el resultado
+        return result, kwargs.get("timings")
+    finally:
+        shm.close()
+
+
+def offload(
+    engine: str,
+    method: str,
+    nums: Sequence[float],
+    *args,
+    timings: Optional[Dict[str, float]] = None
+) -> Any:
+    """
+    Ejecuta engine.method(nums, *args), en el pool si nums es grande.
+
+    Si se pasa timings, el motor anota ahí la duración de cada paso (también
+    cuando el cálculo corre en otro proceso).
+
+    Por debajo de OFFLOAD_MIN_SIZE se calcula en línea. Por encima, los
+    números se copian a memoria compartida y un worker hace el cálculo; el
+    hilo que espera no retiene el GIL, así /health sigue respondiendo.
+    Lanza PoolBusy si ya hay MAX_PENDING cálculos en curso y PoolBroken si
+    murió un worker.
+    """
+    count = len(nums)
+    kwargs = {} if timings is None else {"timings": timings}
+    if not OFFLOAD_MIN_SIZE or count < OFFLOAD_MIN_SIZE:
+        return getattr(get_engine(engine, count), method)(nums, *args, **kwargs)
+
+    _acquire_slot()
+    shm = None
+    try:
+        shm = SharedMemory(create=True, size=max(count * FLOAT64_SIZE, 1))
+        _write_float64(shm.buf, nums)
+        pool = get_process_pool()
+        future = pool.submit(_run_shared, shm.name, count, engine, method, args, kwargs)
+        result, worker_timings = future.result()
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise PoolBroken()
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+        _release_slot()
+    if timings is not None:
+        timings.update(worker_timings)
+    return result
@@ -0,0 +1,47 @@
+"""
+Serialización JSON rápida para la Statistics API.
+
+Usa orjson si está instalado y json de la librería estándar si no. Las
+respuestas se arman directamente desde los diccionarios de los motores, que
+ya tienen los tipos de StatsOut, sin volver a validarlos.
+"""
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional
+    orjson = None
+
+# Bodies a partir de este tamaño se decodifican con orjson antes de validar;
+# por debajo, model_validate_json de pydantic-core es más rápido
+ORJSON_MIN_BYTES = 64 * 1024
+
+
+def dumps(content: Any) -> bytes:
+    """Serializa a JSON compacto en bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(
+        content, separators=(",", ":"), ensure_ascii=False, allow_nan=False
+    ).encode("utf-8")
+
+
+def loads(body: bytes) -> Any:
+    """Decodifica JSON; lanza ValueError si no es válido"""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def use_orjson_decoder(body: bytes) -> bool:
+    return orjson is not None and len(body) >= ORJSON_MIN_BYTES
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse que serializa con orjson cuando está disponible"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
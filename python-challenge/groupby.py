@@ -0,0 +1,132 @@
+"""
+Estadísticas agrupadas por clave para la Statistics API.
+
+Las claves se factorizan en una sola pasada con un dict (clave -> código
+denso, en orden de aparición) y el resto del cálculo trabaja con códigos
+enteros:
+
+- python: cada valor va a la lista de su grupo y cada grupo se resume con
+  compute_stats, repartiendo los grupos entre procesos si el total es grande
+- numpy: ordenar por (grupo, valor) deja cada grupo como un segmento
+  ordenado y todas las estadísticas salen de reducciones por segmento
+  (reduceat), sin bucles por grupo; con muchos datos los grupos se reparten
+  entre procesos por código módulo la cantidad de workers
+"""
+from math import sqrt
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+from engines import as_python_floats, compute_stats, np
+from executor import parallel_map, parallel_workers
+
+GroupKey = Union[str, int]
+
+
+def factorize(keys: Sequence[GroupKey]) -> Tuple[List[int], List[str]]:
+    """Código denso de cada clave y nombres de los grupos en orden de aparición"""
+    index: Dict[str, int] = {}
+    codes = [index.setdefault(key if key.__class__ is str else str(key), len(index)) for key in keys]
+    return codes, list(index)
+
+
+def python_groupby(codes: List[int], values: Sequence[float], groups: int) -> List[Dict[str, Any]]:
+    buckets: List[List[float]] = [[] for _ in range(groups)]
+    appends = [bucket.append for bucket in buckets]
+    for code, value in zip(codes, as_python_floats(values)):
+        appends[code](value)
+    return list(parallel_map(compute_stats, buckets, len(codes)))
+
+
+def numpy_group_kernel(item: Tuple[Any, Any, int]) -> List[Dict[str, Any]]:
+    """Estadísticas de todos los grupos con reducciones por segmento; se puede enviar a otro proceso"""
+    codes, values, groups = item
+    codes = np.asarray(codes, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    size = values.size
+
+    # Orden por valor y luego por grupo (estable): cada grupo queda ordenado.
+    # Dentro de una racha de iguales el orden no importa, así que el primer
+    # argsort no necesita ser estable
+    order = np.argsort(values)
+    order = order[np.argsort(codes[order].astype(np.int32 if groups < 2 ** 31 else np.int64), kind="stable")]
+    sorted_codes = codes[order]
+    ordered = values[order]
+    counts = np.bincount(codes, minlength=groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    ends = starts + counts
+
+    sums = np.add.reduceat(ordered, starts)
+    means = sums / counts
+    deviations = ordered - np.repeat(means, counts)
+    m2 = np.add.reduceat(deviations * deviations, starts)
+    variances = np.where(counts > 1, m2 / np.maximum(counts - 1, 1), 0.0)
+    mid = starts + counts // 2
+    medians = np.where(counts % 2, ordered[mid], (ordered[mid - 1] + ordered[mid]) / 2)
+
+    # Moda: rachas de (grupo, valor); entre las más largas de cada grupo gana
+    # la de menor primera aparición, igual que statistics.mode
+    boundary = np.empty(size, dtype=bool)
+    boundary[0] = True
+    np.logical_or(sorted_codes[1:] != sorted_codes[:-1], ordered[1:] != ordered[:-1], out=boundary[1:])
+    run_starts = np.flatnonzero(boundary)
+    run_lengths = np.diff(np.append(run_starts, size))
+    run_groups = sorted_codes[run_starts]
+    run_first = np.minimum.reduceat(order, run_starts)
+    group_runs = np.flatnonzero(np.concatenate(([True], run_groups[1:] != run_groups[:-1])))
+    longest = np.maximum.reduceat(run_lengths, group_runs)
+    winners = np.flatnonzero(run_lengths == longest[run_groups])
+    winner_groups = run_groups[winners]
+    group_winners = np.flatnonzero(np.concatenate(([True], winner_groups[1:] != winner_groups[:-1])))
+    modes = values[np.minimum.reduceat(run_first[winners], group_winners)]
+
+    columns = zip(
+        counts.tolist(), means.tolist(), medians.tolist(), modes.tolist(), variances.tolist(),
+        ordered[starts].tolist(), ordered[ends - 1].tolist(), sums.tolist()
+    )
+    return [
+        {
+            "count": count,
+            "mean": round(mean, 6),
+            "median": median,
+            "mode": [mode],
+            "std_dev": round(sqrt(variance), 6),
+            "variance": round(variance, 6),
+            "min": lo,
+            "max": hi,
+            "range": hi - lo,
+            "sum": total,
+        }
+        for count, mean, median, mode, variance, lo, hi, total in columns
+    ]
+
+
+def numpy_groupby(codes: List[int], values: Sequence[float], groups: int) -> List[Dict[str, Any]]:
+    workers = min(parallel_workers(len(codes)), groups)
+    if workers < 2:
+        return numpy_group_kernel((codes, values, groups))
+    # Los códigos con el mismo resto forman una partición con códigos densos (código // workers)
+    codes = np.asarray(codes, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    remainders = codes % workers
+    parts = []
+    for worker in range(workers):
+        mask = remainders == worker
+        parts.append((codes[mask] // workers, values[mask], len(range(worker, groups, workers))))
+    results = list(parallel_map(numpy_group_kernel, parts, len(codes)))
+    return [results[code % workers][code // workers] for code in range(groups)]
+
+
+GROUPBY_ENGINES = {"python": python_groupby, "numpy": numpy_groupby}
+
+
+def groupby_stats(engine: str, keys: Sequence[GroupKey], values: Sequence[float]) -> Dict[str, Dict[str, Any]]:
+    """
+    StatsOut por clave, en orden de primera aparición.
+
+    Las claves se comparan como texto: 1 y "1" son el mismo grupo.
+    """
+    if len(keys) != len(values):
+        raise ValueError("keys y values deben tener el mismo largo")
+    codes, names = factorize(keys)
+    if not names:
+        return {}
+    return dict(zip(names, GROUPBY_ENGINES[engine](codes, values, len(names))))
@@ -0,0 +1,141 @@
+"""
+Histogramas para la Statistics API.
+
+Los bordes salen del mínimo y máximo (o de los cuantiles) calculados con los
+mismos kernels que /stats?fields=, así que el arreglo, el mínimo y el máximo
+se calculan una sola vez; los conteos son una pasada más (vectorizada con
+NumPy).
+
+Los intervalos son [borde_i, borde_i+1), salvo el último que incluye el
+máximo, igual que np.histogram.
+"""
+from bisect import bisect_right
+from math import ceil, floor, isfinite
+from typing import Any, Dict, List, Optional, Sequence
+
+from engines import (
+    NUMPY_KERNELS, PYTHON_KERNELS, FieldResolver, as_python_floats, interpolate_quantiles, np
+)
+
+HISTOGRAM_METHODS = ("count", "width", "quantile")
+MAX_BINS = 10_000
+
+
+def uniform_edges(lo: float, hi: float, bins: int) -> List[float]:
+    step = (hi - lo) / bins
+    return [lo + i * step for i in range(bins)] + [hi]
+
+
+def width_edges(lo: float, hi: float, width: float) -> List[float]:
+    """Bordes alineados a múltiplos de width que cubren [lo, hi]"""
+    # Se valida antes de floor/ceil, que con un cociente infinito lanzan OverflowError
+    span = (hi - lo) / width
+    if not (isfinite(span) and isfinite(lo / width)) or span > MAX_BINS:
+        raise ValueError(f"width genera más de {MAX_BINS} intervalos")
+    origin = floor(lo / width) * width
+    bins = max(1, ceil((hi - origin) / width))
+    if origin + bins * width < hi:
+        bins += 1
+    if bins > MAX_BINS:
+        raise ValueError(f"width genera más de {MAX_BINS} intervalos")
+    return [origin + i * width for i in range(bins + 1)]
+
+
+def python_counts(r: FieldResolver, edges: List[float], uniform: bool) -> List[int]:
+    """Conteos en una pasada; con bordes uniformes el intervalo se calcula sin búsqueda"""
+    bins = len(edges) - 1
+    counts = [0] * bins
+    last = bins - 1
+    lo, hi = edges[0], edges[-1]
+    if uniform:
+        scale = bins / (hi - lo)
+        for x in r.nums:
+            i = int((x - lo) * scale)
+            if i > last:
+                i = last
+            # El redondeo puede dejar un valor sobre un borde en el intervalo
+            # vecino: se corrige contra los bordes, igual que np.histogram
+            if x < edges[i]:
+                i -= 1
+            elif i < last and x >= edges[i + 1]:
+                i += 1
+            counts[i] += 1
+        return counts
+    for x in r.nums:
+        i = bisect_right(edges, x) - 1
+        counts[i if i < bins else last] += 1
+    return counts
+
+
+def numpy_counts(r: FieldResolver, edges: List[float], uniform: bool) -> List[int]:
+    bins = len(edges) - 1
+    # Con bins y range NumPy calcula el intervalo sin búsqueda binaria, pero
+    # contra sus propios bordes (linspace): solo sirve si coinciden con edges
+    if uniform and np.array_equal(np.linspace(edges[0], edges[-1], bins + 1), edges):
+        counts, _ = np.histogram(r["arr"], bins=bins, range=(edges[0], edges[-1]))
+    else:
+        counts, _ = np.histogram(r["arr"], bins=np.asarray(edges))
+    return counts.tolist()
+
+
+def python_sorted(r: FieldResolver) -> Sequence[float]:
+    return sorted(r.nums)
+
+
+ENGINE_BINNING: Dict[str, Any] = {
+    "python": (PYTHON_KERNELS, python_counts, python_sorted),
+    "numpy": (NUMPY_KERNELS, numpy_counts, lambda r: r["sorted"]),
+}
+
+
+def histogram(
+    engine: str,
+    nums: Sequence[float],
+    method: str = "count",
+    bins: int = 10,
+    width: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Bordes y conteos de un histograma.
+
+    - count: bins intervalos de igual ancho entre el mínimo y el máximo
+    - width: intervalos de ancho width alineados a sus múltiplos
+    - quantile: bins intervalos con la misma cantidad de valores; los bordes
+      repetidos (valores muy frecuentes) se unen, así que puede haber menos
+    """
+    if method not in HISTOGRAM_METHODS:
+        raise ValueError(f"Método desconocido: {method}")
+    if method == "width" and (width is None or width <= 0):
+        raise ValueError("El método width requiere width mayor que 0")
+    if not 1 <= bins <= MAX_BINS:
+        raise ValueError(f"bins debe estar entre 1 y {MAX_BINS}")
+
+    kernels, count_bins, sorted_values = ENGINE_BINNING[engine]
+    if engine == "python":
+        nums = as_python_floats(nums)
+    result = {"count": len(nums), "min": None, "max": None, "method": method, "edges": [], "counts": []}
+    if not len(nums):
+        return result
+
+    r = FieldResolver(nums, kernels)
+    lo, hi = r["min"], r["max"]
+    result.update(min=lo, max=hi)
+    if lo == hi and method != "width":
+        result.update(edges=[lo, hi], counts=[r["count"]])
+        return result
+
+    # Los bordes se interpolan entre valores: con un rango infinito saldrían inf o NaN
+    if not isfinite(hi - lo):
+        raise ValueError("max - min excede el rango de float64")
+    if method == "count":
+        edges = uniform_edges(lo, hi, bins)
+    elif method == "width":
+        edges = width_edges(lo, hi, width)
+    else:
+        quantiles = interpolate_quantiles(sorted_values(r), [i / bins for i in range(bins + 1)])
+        edges = [float(edge) for edge in dict.fromkeys(quantiles)]
+
+    # count y width tienen bordes equiespaciados
+    uniform = method != "quantile"
+    result.update(edges=edges, counts=count_bins(r, edges, uniform))
+    return result
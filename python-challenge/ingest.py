@@ -0,0 +1,439 @@
+"""
+Lectura de cuerpos binarios y en streaming para la Statistics API.
+
+Los buffers se envuelven sin copiar (np.frombuffer o memoryview), así que los
+números nunca se convierten uno a uno en objetos float de Python. Los cuerpos
+NDJSON se leen por bloques para no tener nunca la lista completa en memoria.
+
+Los bodies con Content-Encoding (gzip, deflate o zstd) se descomprimen a
+medida que llegan, en bloques de salida acotados: el body comprimido nunca
+se junta entero y una bomba de compresión se corta al pasar el tope sin
+haberse expandido.
+"""
+import io
+import json
+import os
+import sys
+import zlib
+from array import array
+from math import isfinite
+from typing import AsyncIterator, Iterator, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+try:
+    import zstandard
+except ImportError:  # zstd es opcional
+    zstandard = None
+
+OCTET_STREAM = "application/octet-stream"
+NPY = "application/x-npy"
+NDJSON = "application/x-ndjson"
+BINARY_CONTENT_TYPES = (OCTET_STREAM, NPY)
+
+FLOAT64_SIZE = 8
+
+# Una línea NDJSON no puede superar este tamaño (memoria acotada)
+MAX_LINE_BYTES = 1024 * 1024
+
+# Tope del body descomprimido y tamaño de cada bloque de salida
+MAX_DECOMPRESSED_BYTES = int(os.environ.get("STATS_MAX_DECOMPRESSED_BYTES", 256 * 1024 * 1024))
+DECOMPRESS_CHUNK = 256 * 1024
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+# Entrada comprimida que el lector de zstd toma por vez (la salida la acota
+# DECOMPRESS_CHUNK)
+ZSTD_READ_SIZE = 16 * 1024
+ZSTD_MAGIC = 0xFD2FB528
+ZSTD_SKIPPABLE_MAGIC = 0x184D2A50
+
+
+def parse_float64(body: bytes) -> Sequence[float]:
+    """Interpreta el body como float64 little-endian crudo"""
+    if len(body) % FLOAT64_SIZE:
+        raise ValueError(
+            f"El body debe tener un múltiplo de {FLOAT64_SIZE} bytes (float64)"
+        )
+    if np is not None:
+        return np.frombuffer(body, dtype="<f8")
+    if sys.byteorder == "little":
+        return memoryview(body).cast("d")
+    # Host big-endian: no hay forma de evitar la copia
+    values = array("d", body)
+    values.byteswap()
+    return values
+
+
+def read_npy(body: bytes, ndim: int = 1):
+    """Arreglo numérico float64 de ndim dimensiones a partir de un archivo .npy"""
+    if np is None:
+        raise ValueError("Los cuerpos .npy requieren NumPy")
+    npy_format = np.lib.format
+    header_readers = {
+        (1, 0): npy_format.read_array_header_1_0,
+        (2, 0): npy_format.read_array_header_2_0,
+    }
+    stream = io.BytesIO(body)
+    try:
+        version = npy_format.read_magic(stream)
+        shape, fortran_order, dtype = header_readers[version](stream)
+    except KeyError:
+        raise ValueError("Versión de .npy no soportada")
+    except Exception as e:
+        raise ValueError(f"Archivo .npy inválido: {e}")
+    if len(shape) != ndim:
+        dimensions = "una dimensión" if ndim == 1 else f"{ndim} dimensiones"
+        raise ValueError(f"El arreglo .npy debe ser de {dimensions}")
+    if dtype.kind not in "iuf":
+        raise ValueError("El arreglo .npy debe ser numérico")
+
+    offset = stream.tell()
+    size = 1
+    for length in shape:
+        size *= length
+    if len(body) - offset != size * dtype.itemsize:
+        raise ValueError("El tamaño del arreglo .npy no coincide con su cabecera")
+    values = np.frombuffer(body, dtype=dtype, count=size, offset=offset)
+    values = values.reshape(shape, order="F" if fortran_order else "C")
+    if dtype != np.float64:
+        # Solo se copia si el tipo no es ya float64
+        values = values.astype(np.float64)
+    return values
+
+
+def parse_npy(body: bytes) -> Sequence[float]:
+    """Interpreta el body como un archivo .npy con un arreglo 1-D numérico"""
+    return read_npy(body, 1)
+
+
+def ensure_finite(values: Sequence[float]) -> Sequence[float]:
+    """Rechaza NaN e infinitos con una sola pasada vectorizada"""
+    if np is not None and isinstance(values, np.ndarray):
+        finite = bool(np.isfinite(values).all())
+    else:
+        finite = all(map(isfinite, values))
+    if not finite:
+        raise ValueError("Los números deben ser finitos (sin NaN ni infinitos)")
+    return values
+
+
+def parse_binary(body: bytes, content_type: str) -> Sequence[float]:
+    """Despacha según el Content-Type binario y valida que todo sea finito"""
+    if content_type == NPY:
+        return ensure_finite(parse_npy(body))
+    return ensure_finite(parse_float64(body))
+
+
+def parse_shape(header: Optional[str]) -> List[int]:
+    """Lee la cabecera X-Matrix-Shape ("filas,columnas")"""
+    try:
+        rows, cols = (int(part) for part in (header or "").split(","))
+    except ValueError:
+        raise ValueError("X-Matrix-Shape debe ser 'filas,columnas'")
+    if rows < 0 or cols < 1:
+        raise ValueError("X-Matrix-Shape debe tener filas >= 0 y columnas >= 1")
+    return [rows, cols]
+
+
+def parse_matrix(body: bytes, content_type: str, shape_header: Optional[str]) -> Sequence[Sequence[float]]:
+    """
+    Matriz binaria como secuencia de columnas.
+
+    - application/octet-stream: float64 little-endian por columnas, con la
+      forma en X-Matrix-Shape
+    - application/x-npy: arreglo 2-D (filas, columnas) en cualquier orden
+    """
+    if content_type == NPY:
+        columns = read_npy(body, 2).T
+        if not len(columns):
+            raise ValueError("El arreglo .npy debe tener al menos una columna")
+    else:
+        rows, cols = parse_shape(shape_header)
+        if len(body) != rows * cols * FLOAT64_SIZE:
+            raise ValueError("El tamaño del body no coincide con X-Matrix-Shape")
+        values = parse_float64(body)
+        if np is not None:
+            columns = values.reshape(cols, rows)
+        else:
+            columns = [values[j * rows:(j + 1) * rows] for j in range(cols)]
+    for column in columns:
+        ensure_finite(column)
+    return columns
+
+
+def parse_ndjson_lines(lines: List[bytes], first_line: int = 1) -> List[float]:
+    """
+    Convierte líneas NDJSON en floats.
+
+    Cada línea es un número o un arreglo JSON de números; las líneas vacías
+    se ignoran.
+    """
+    try:
+        # Camino rápido: un número por línea, convertido en C
+        values = list(map(float, lines))
+    except ValueError:
+        values = []
+        for line_no, line in enumerate(lines, first_line):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                if line[:1] == b"[":
+                    items = json.loads(line)
+                    if any(isinstance(x, bool) or not isinstance(x, (int, float)) for x in items):
+                        raise ValueError
+                    values.extend(map(float, items))
+                else:
+                    values.append(float(line))
+            except ValueError:
+                raise ValueError(f"Línea {line_no}: se esperaba un número o un arreglo de números")
+    return ensure_finite(values)
+
+
+async def iter_ndjson_numbers(chunks: AsyncIterator[bytes]) -> AsyncIterator[List[float]]:
+    """Recorre un body NDJSON por bloques y entrega los números de cada bloque"""
+    buffer = bytearray()
+    line_no = 1
+    async for chunk in chunks:
+        buffer += chunk
+        cut = buffer.rfind(b"\n")
+        if cut < 0:
+            if len(buffer) > MAX_LINE_BYTES:
+                raise ValueError(f"Línea {line_no}: supera {MAX_LINE_BYTES} bytes")
+            continue
+        lines = bytes(buffer[:cut]).split(b"\n")
+        del buffer[:cut + 1]
+        values = parse_ndjson_lines(lines, line_no)
+        line_no += len(lines)
+        if values:
+            yield values
+    if buffer.strip():
+        yield parse_ndjson_lines([bytes(buffer)], line_no)
+
+
+
+class UnsupportedEncoding(ValueError):
+    """Content-Encoding que no se sabe descomprimir"""
+
+
+class PayloadTooLarge(ValueError):
+    """El body descomprimido supera el tope configurado"""
+
+
+class ZlibDecoder:
+    """gzip (uno o más miembros) y deflate, en bloques de salida acotados"""
+
+    def __init__(self, wbits: int):
+        self._wbits = wbits
+        self._decompressor = zlib.decompressobj(wbits)
+        self._open = False  # hay un stream empezado sin terminar
+        self._finished = 0
+
+    def feed(self, data: bytes) -> Iterator[bytes]:
+        while True:
+            if data:
+                if self._finished and self._wbits != GZIP_WBITS:
+                    raise ValueError("Body comprimido inválido: datos después del final")
+                self._open = True
+            try:
+                out = self._decompressor.decompress(data, DECOMPRESS_CHUNK)
+            except zlib.error as e:
+                raise ValueError(f"Body comprimido inválido: {e}")
+            if out:
+                yield out
+            if self._decompressor.eof:
+                data = self._decompressor.unused_data
+                self._decompressor = zlib.decompressobj(self._wbits)
+                self._open = False
+                self._finished += 1
+                if not data:
+                    return
+                continue
+            data = self._decompressor.unconsumed_tail
+            # Con la salida llena zlib puede tener más pendiente aunque no quede entrada
+            if not data and len(out) < DECOMPRESS_CHUNK:
+                return
+
+    def finish(self) -> Iterator[bytes]:
+        if self._open or not self._finished:
+            raise ValueError("Body comprimido inválido: terminó antes de tiempo")
+        return iter(())
+
+
+class ZstdFrames:
+    """
+    Sigue los encabezados de frames y bloques zstd de la entrada comprimida.
+
+    Solo lee los encabezados y salta el contenido de cada bloque: alcanza
+    para saber si el último frame terminó, algo que stream_reader no informa.
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self._buffer = bytearray()
+        self._skip = 0
+        self._state = "magic"
+        self._checksum = False
+
+    def complete(self) -> bool:
+        return self.frames > 0 and self._state == "magic" and not self._skip and not self._buffer
+
+    def feed(self, data: bytes):
+        buffer = self._buffer
+        buffer += data
+        pos = 0
+        while True:
+            if self._skip:
+                step = min(self._skip, len(buffer) - pos)
+                self._skip -= step
+                pos += step
+                if self._skip:
+                    break
+            size = self._header_size(buffer, pos)
+            if size is None or len(buffer) - pos < size:
+                break
+            self._read_header(buffer[pos:pos + size])
+            pos += size
+        del buffer[:pos]
+
+    def _header_size(self, buffer: bytearray, pos: int) -> Optional[int]:
+        if self._state == "magic":
+            if len(buffer) - pos < 4:
+                return None
+            magic = int.from_bytes(buffer[pos:pos + 4], "little")
+            return 4 if magic == ZSTD_MAGIC else 8
+        if self._state == "frame":
+            if pos == len(buffer):
+                return None
+            descriptor = buffer[pos]
+            single_segment = descriptor >> 5 & 1
+            return (
+                1 + (not single_segment) + (0, 1, 2, 4)[descriptor & 3]
+                + (single_segment, 2, 4, 8)[descriptor >> 6]
+            )
+        return 3
+
+    def _read_header(self, header: bytearray):
+        if self._state == "magic":
+            magic = int.from_bytes(header[:4], "little")
+            if magic == ZSTD_MAGIC:
+                self._state = "frame"
+            elif magic & 0xFFFFFFF0 == ZSTD_SKIPPABLE_MAGIC:
+                self._skip = int.from_bytes(header[4:], "little")
+                self.frames += 1
+            else:
+                raise ValueError("Body comprimido inválido: no es zstd")
+        elif self._state == "frame":
+            self._checksum = bool(header[0] >> 2 & 1)
+            self._state = "block"
+        else:
+            value = int.from_bytes(header, "little")
+            block_type = value >> 1 & 3
+            if block_type == 3:
+                raise ValueError("Body comprimido inválido: bloque zstd reservado")
+            self._skip = 1 if block_type == 1 else value >> 3
+            if value & 1:
+                self._skip += 4 * self._checksum
+                self._state = "magic"
+                self.frames += 1
+
+
+class _NeedInput(Exception):
+    """El lector de zstd pidió más entrada de la que llegó"""
+
+
+class _ZstdInput:
+    """Fuente de stream_reader alimentada por bloques"""
+
+    def __init__(self):
+        self.pending = bytearray()
+        self.eof = False
+
+    def read(self, size: int = -1) -> bytes:
+        if not self.pending:
+            if self.eof:
+                return b""
+            raise _NeedInput()
+        size = len(self.pending) if size < 0 else size
+        data = bytes(self.pending[:size])
+        del self.pending[:size]
+        return data
+
+
+class ZstdDecoder:
+    """
+    zstd con el paquete zstandard, en bloques de salida acotados.
+
+    decompressobj no tiene tope de salida (un bloque RLE de 4 bytes se
+    expande a 128 KiB), así que se usa stream_reader: read1 devuelve a lo
+    sumo DECOMPRESS_CHUNK bytes. Cuando se acaba la entrada llegada, la
+    fuente lanza _NeedInput; read1 solo lee la fuente mientras no produjo
+    salida, así que no se pierde nada y se sigue con el próximo bloque.
+    """
+
+    def __init__(self):
+        self._input = _ZstdInput()
+        self._frames = ZstdFrames()
+        self._reader = zstandard.ZstdDecompressor().stream_reader(self._input, read_size=ZSTD_READ_SIZE)
+
+    def feed(self, data: bytes) -> Iterator[bytes]:
+        self._frames.feed(data)
+        self._input.pending += data
+        return self._drain()
+
+    def _drain(self) -> Iterator[bytes]:
+        while True:
+            try:
+                out = self._reader.read1(DECOMPRESS_CHUNK)
+            except _NeedInput:
+                return
+            except zstandard.ZstdError as e:
+                raise ValueError(f"Body comprimido inválido: {e}")
+            if not out:
+                return
+            yield out
+
+    def finish(self) -> Iterator[bytes]:
+        # Lo que zstd retuvo del último bloque sale al ver el fin de la entrada
+        self._input.eof = True
+        yield from self._drain()
+        if not self._frames.complete():
+            raise ValueError("Body comprimido inválido: terminó antes de tiempo")
+
+
+def supported_encodings() -> List[str]:
+    return ["gzip", "deflate"] + (["zstd"] if zstandard is not None else [])
+
+
+def create_decoder(encoding: str):
+    """Descompresor para un Content-Encoding; UnsupportedEncoding si no hay"""
+    if encoding in ("gzip", "x-gzip"):
+        return ZlibDecoder(GZIP_WBITS)
+    if encoding == "deflate":
+        return ZlibDecoder(zlib.MAX_WBITS)
+    if encoding == "zstd" and zstandard is not None:
+        return ZstdDecoder()
+    raise UnsupportedEncoding(
+        f"Content-Encoding no soportado: {encoding} (soportados: {', '.join(supported_encodings())})"
+    )
+
+
+async def iter_decoded(
+    chunks: AsyncIterator[bytes], decoder, limit: Optional[int] = None
+) -> AsyncIterator[bytes]:
+    """Descomprime los bloques a medida que llegan y corta al pasar limit bytes"""
+    limit = MAX_DECOMPRESSED_BYTES if limit is None else limit
+    total = 0
+    async for chunk in chunks:
+        for out in decoder.feed(chunk):
+            total += len(out)
+            if total > limit:
+                raise PayloadTooLarge(f"El body descomprimido supera {limit} bytes")
+            yield out
+    for out in decoder.finish():
+        total += len(out)
+        if total > limit:
+            raise PayloadTooLarge(f"El body descomprimido supera {limit} bytes")
+        yield out
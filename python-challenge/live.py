@@ -0,0 +1,135 @@
+"""
+Estadísticas en vivo por WebSocket para la Statistics API.
+
+Cada conexión tiene sus propios acumuladores (RunningStats y, si se pide,
+un sketch KLL para la mediana aproximada), así que cada actualización cuesta
+O(lote) y no O(total).
+
+Las actualizaciones solo se envían cuando llegan datos: una conexión sin
+tráfico no tiene timers ni tareas pendientes, solo sus acumuladores.
+
+Los mensajes de LIVE_THREAD_MIN_BYTES o más se procesan en un hilo: un frame
+de 16 MiB con median=true tarda más de un segundo, y en el event loop frenaría
+a las demás conexiones y a /health.
+"""
+import asyncio
+from math import inf
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from engines import RunningStats, as_python_floats, stats_from_accumulators
+from fastjson import loads
+from ingest import ensure_finite, parse_float64
+from sketches import KLLSketch
+
+LIVE_FIELDS = ("count", "mean", "variance", "std_dev", "min", "max", "sum")
+
+# Tamaño de mensaje a partir del cual se parsea y acumula fuera del event loop
+LIVE_THREAD_MIN_BYTES = 64 << 10
+
+
+def live_message_size(message: Dict[str, Any]) -> int:
+    """Bytes (o caracteres) de un mensaje del cliente"""
+    data = message.get("bytes")
+    return len(data) if data is not None else len(message.get("text") or "")
+
+
+def parse_live_message(message: Dict[str, Any]) -> List[float]:
+    """
+    Números de un mensaje del cliente.
+
+    - Texto: un número, un arreglo de números o {"numbers": [...]}
+    - Binario: float64 little-endian
+    """
+    data = message.get("bytes")
+    if data is not None:
+        return as_python_floats(ensure_finite(parse_float64(data)))
+
+    try:
+        payload = loads(message.get("text") or "")
+    except ValueError:
+        raise ValueError("Mensaje JSON inválido")
+    if isinstance(payload, dict):
+        payload = payload.get("numbers")
+    if not isinstance(payload, list):
+        payload = [payload]
+    if any(isinstance(x, bool) or not isinstance(x, (int, float)) for x in payload):
+        raise ValueError("Se esperaba un número o un arreglo de números")
+    return ensure_finite([float(x) for x in payload])
+
+
+class LiveStats:
+    """Acumuladores de una conexión"""
+
+    __slots__ = ("moments", "sketch")
+
+    def __init__(self, median: bool = False):
+        self.moments = RunningStats()
+        self.sketch = KLLSketch() if median else None
+
+    def update(self, values: List[float]):
+        self.moments.update(values)
+        if self.sketch is not None:
+            self.sketch.update(values)
+
+    def ingest(self, message: Dict[str, Any]) -> int:
+        """Parsea un mensaje y acumula sus números; retorna cuántos eran"""
+        values = parse_live_message(message)
+        if values:
+            self.update(values)
+        return len(values)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Campos actuales con el mismo redondeo que /stats"""
+        stats = stats_from_accumulators(self.moments)
+        snapshot = {name: stats[name] for name in LIVE_FIELDS}
+        if self.sketch is not None:
+            snapshot["median"] = self.sketch.quantile(0.5)
+        return snapshot
+
+
+class UpdateThrottle:
+    """
+    Envía como máximo una actualización cada interval segundos.
+
+    Si llegan datos antes de que pase el intervalo se agenda un único envío
+    diferido con call_later; sin datos nuevos no hay nada agendado.
+    """
+
+    def __init__(self, interval: float, send: Callable[[], Awaitable[None]]):
+        self.interval = interval
+        self._send = send
+        self._lock = asyncio.Lock()
+        self._last_sent = -inf
+        self._pending: Optional[asyncio.TimerHandle] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def notify(self):
+        """Hay datos nuevos: envía ahora o agenda el próximo envío"""
+        loop = asyncio.get_running_loop()
+        wait = self._last_sent + self.interval - loop.time()
+        if wait <= 0:
+            self.cancel()
+            await self.flush()
+        elif self._pending is None:
+            self._pending = loop.call_later(wait, self._flush_later)
+
+    def _flush_later(self):
+        self._pending = None
+        self._task = asyncio.ensure_future(self.flush())
+
+    async def flush(self):
+        async with self._lock:
+            self._last_sent = asyncio.get_running_loop().time()
+            await self._send()
+
+    def cancel(self) -> bool:
+        """Cancela el envío agendado o en curso; True si había uno"""
+        cancelled = False
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+            cancelled = True
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            cancelled = True
+        return cancelled
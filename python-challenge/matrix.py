@@ -0,0 +1,127 @@
+"""
+Estadísticas de matrices para la Statistics API.
+
+La matriz llega por columnas (una lista de números por columna), y se
+calculan los mismos campos que /stats para cada columna más las matrices de
+covarianza y correlación.
+
+Con NumPy las columnas forman un arreglo (columnas, filas) contiguo por
+columna: un solo np.sort por filas da medianas y modas de todas las columnas,
+y cada reducción es una llamada vectorizada con el mismo orden de suma que
+/stats, así que los resultados por columna coinciden exactamente.
+"""
+from itertools import repeat
+from math import fsum, sqrt
+from operator import mul, sub
+from typing import Any, Dict, List, Optional, Sequence
+
+from engines import (
+    as_python_floats, compute_stats, empty_stats, median_from_sorted, np, numpy_mode
+)
+
+
+def correlation_from_covariance(covariance: List[List[float]]) -> List[List[Optional[float]]]:
+    """Correlación de Pearson; None si alguna de las columnas es constante"""
+    std = [sqrt(max(covariance[i][i], 0.0)) for i in range(len(covariance))]
+    return [
+        [
+            max(-1.0, min(1.0, value / (std[i] * std[j]))) if std[i] and std[j] else None
+            for j, value in enumerate(row)
+        ]
+        for i, row in enumerate(covariance)
+    ]
+
+
+def rounded(matrix: List[List[Optional[float]]]) -> List[List[Optional[float]]]:
+    return [[None if value is None else round(value, 6) for value in row] for row in matrix]
+
+
+def python_matrix_stats(columns: Sequence[Sequence[float]]) -> Dict[str, Any]:
+    """Versión de Python puro: compute_stats por columna y covarianza con fsum"""
+    columns = [as_python_floats(column) for column in columns]
+    rows = len(columns[0]) if columns else 0
+    summaries = [compute_stats(column) for column in columns]
+    size = len(columns)
+    if rows < 2:
+        fill = 0.0 if rows else None
+        return {
+            "columns": summaries,
+            "covariance": [[fill] * size for _ in range(size)],
+            "correlation": [[None] * size for _ in range(size)],
+        }
+
+    deviations = [list(map(sub, column, repeat(fsum(column) / rows))) for column in columns]
+    covariance = [[0.0] * size for _ in range(size)]
+    for i in range(size):
+        for j in range(i, size):
+            value = fsum(map(mul, deviations[i], deviations[j])) / (rows - 1)
+            covariance[i][j] = covariance[j][i] = value
+    return {
+        "columns": summaries,
+        "covariance": rounded(covariance),
+        "correlation": rounded(correlation_from_covariance(covariance)),
+    }
+
+
+def numpy_matrix_stats(columns: Sequence[Sequence[float]]) -> Dict[str, Any]:
+    """Versión vectorizada: todas las columnas en cada llamada de NumPy"""
+    arr = np.ascontiguousarray(columns, dtype=np.float64)
+    if arr.ndim != 2:
+        arr = arr.reshape(len(columns), -1)
+    size, rows = arr.shape
+    if not rows:
+        return {
+            "columns": [empty_stats() for _ in range(size)],
+            "covariance": [[None] * size for _ in range(size)],
+            "correlation": [[None] * size for _ in range(size)],
+        }
+
+    ordered = np.sort(arr, axis=1)
+    means = arr.mean(axis=1).tolist()
+    sums = arr.sum(axis=1).tolist()
+    mins = ordered[:, 0].tolist()
+    maxs = ordered[:, -1].tolist()
+    if rows > 1:
+        variances = arr.var(axis=1, ddof=1).tolist()
+        covariance = np.atleast_2d(np.cov(arr)).tolist()
+    else:
+        variances = [0.0] * size
+        covariance = [[0.0] * size for _ in range(size)]
+
+    summaries = []
+    for j in range(size):
+        variance_val = variances[j]
+        summaries.append({
+            "count": rows,
+            "mean": round(means[j], 6),
+            "median": median_from_sorted(ordered[j]),
+            "mode": [numpy_mode(arr[j], ordered[j])],
+            "std_dev": round(sqrt(variance_val), 6),
+            "variance": round(variance_val, 6),
+            "min": mins[j],
+            "max": maxs[j],
+            "range": maxs[j] - mins[j],
+            "sum": sums[j],
+        })
+    return {
+        "columns": summaries,
+        "covariance": rounded(covariance),
+        "correlation": rounded(correlation_from_covariance(covariance)),
+    }
+
+
+MATRIX_ENGINES = {"python": python_matrix_stats, "numpy": numpy_matrix_stats}
+
+
+def matrix_stats(engine: str, columns: Sequence[Sequence[float]]) -> Dict[str, Any]:
+    """
+    Resumen por columna, covarianza y correlación de una matriz por columnas.
+
+    Todas las columnas deben tener la misma cantidad de filas. La covarianza
+    es muestral (n - 1), como la varianza de /stats; con una sola fila es 0
+    y la correlación queda en None.
+    """
+    lengths = {len(column) for column in columns}
+    if len(lengths) > 1:
+        raise ValueError("Todas las columnas deben tener la misma cantidad de filas")
+    return MATRIX_ENGINES[engine](columns)
@@ -0,0 +1,165 @@
+"""
+Métricas de latencia por etapa para la Statistics API.
+
+Cada etapa de un request (lectura del body, decodificación, validación, cada
+paso del cálculo y serialización) se registra en un histograma etiquetado por
+endpoint y tamaño del payload, y se expone en formato de texto de Prometheus.
+
+Etapas registradas:
+
+- body_read: lectura del body
+- json_decode y validation: decodificación con orjson y validación de DataIn
+  (bodies grandes); en los chicos pydantic-core hace ambas cosas en una sola
+  llamada, registrada como json_decode_validation
+- binary_parse: lectura de bodies float64 o .npy
+- compute: cálculo completo en el motor, y stat.<nombre> para cada paso
+  (momentos, frecuencias, mediana, moda, ...)
+- serialization: armado de la respuesta JSON
+
+Registrar una observación es una búsqueda binaria y tres sumas bajo un lock,
+así que se puede dejar activo en producción. STATS_METRICS=0 lo desactiva.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+ENABLED = os.environ.get("STATS_METRICS", "1") != "0"
+
+# Límites superiores de los buckets en segundos (100µs a 10s)
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+SIZE_BUCKETS = ((0, "0"), (100, "<=100"), (10_000, "<=10k"), (1_000_000, "<=1M"))
+
+
+def size_bucket(count: int) -> str:
+    """Etiqueta de tamaño de payload"""
+    for limit, label in SIZE_BUCKETS:
+        if count <= limit:
+            return label
+    return ">1M"
+
+
+class Histogram:
+    """Histograma acumulativo por combinación de etiquetas"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...],
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # [conteo por bucket..., +Inf, suma]
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def snapshot(self) -> Dict[Tuple[str, ...], List[float]]:
+        with self._lock:
+            return {labels: list(series) for labels, series in self._series.items()}
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self.snapshot().items()):
+            label_text = ",".join(f'{k}="{v}"' for k, v in zip(self.label_names, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), series):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{label_text},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {series[-1]!r}")
+            lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+        return lines
+
+
+STAGE_SECONDS = Histogram(
+    "stats_stage_seconds",
+    "Duración de cada etapa del request en segundos",
+    ("stage", "endpoint", "size"),
+)
+
+
+class RequestMetrics:
+    """Requests en curso, actualizado por InFlightMiddleware"""
+
+    def __init__(self):
+        self.in_flight = 0
+
+
+requests = RequestMetrics()
+
+
+def observe_stage(stage: str, endpoint: str, count: int, seconds: float):
+    if not ENABLED:
+        return
+    STAGE_SECONDS.observe((stage, endpoint, size_bucket(count)), seconds)
+
+
+def observe_stages(timings: Dict[str, float], endpoint: str, count: int, prefix: str = ""):
+    """Registra un diccionario {etapa: segundos}"""
+    if not ENABLED:
+        return
+    bucket = size_bucket(count)
+    for stage, seconds in timings.items():
+        STAGE_SECONDS.observe((prefix + stage, endpoint, bucket), seconds)
+
+
+@contextmanager
+def stage_timer(timings: Optional[Dict[str, float]], stage: str) -> Iterator[None]:
+    """Suma la duración del bloque en timings[stage] (no hace nada si timings es None)"""
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+class InFlightMiddleware:
+    """Middleware ASGI que cuenta los requests HTTP en curso"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        requests.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            requests.in_flight -= 1
+
+
+def render_prometheus(
+    gauges: Dict[str, Tuple[str, float]],
+    counters: Optional[Dict[str, Tuple[str, float]]] = None
+) -> str:
+    """Texto de Prometheus con los histogramas, gauges y contadores indicados"""
+    lines = STAGE_SECONDS.render()
+    for kind, metrics in (("gauge", gauges), ("counter", counters or {})):
+        for name, (help_text, value) in metrics.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,335 @@
+"""
+Estadísticas fuera de memoria para archivos más grandes que la RAM.
+
+El upload se vuelca a un archivo temporal de float64 (un CSV se convierte al
+vuelo) y cada pasada lo lee con mmap en bloques de CHUNK_VALUES, así que la
+memoria usada no depende del tamaño del archivo:
+
+1. Momentos, mínimo y máximo por bloque, combinados con RunningStats.merge
+2. Histograma de rangos entre el mínimo y el máximo; los intervalos se
+   agrupan en particiones de a lo sumo PARTITION_VALUES valores
+3. Cada valor se copia al archivo de su partición
+4. Las particiones se ordenan de a una en orden de valores: dan la mediana
+   exacta por rango y las rachas de valores iguales para la moda; una
+   partición que no entra en memoria se vuelve a dividir
+
+El disco extra usado es como máximo el tamaño del archivo. Requiere NumPy.
+
+Uso como CLI sobre un archivo local:
+
+    python -m outofcore captura.f64
+    python -m outofcore --csv captura.csv
+"""
+import argparse
+import os
+import sys
+import tempfile
+from array import array
+from math import inf
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from engines import RunningStats, empty_stats, np, stats_from_accumulators
+from fastjson import dumps
+from ingest import FLOAT64_SIZE, MAX_LINE_BYTES, PayloadTooLarge, ensure_finite
+
+CHUNK_VALUES = 1 << 20
+PARTITION_VALUES = int(os.environ.get("STATS_OUTOFCORE_PARTITION", 8 << 20))
+MAX_PARTITIONS = 256
+HISTOGRAM_BINS = 1 << 16
+
+# Directorio de los archivos temporales y tope de los bytes recibidos, ya
+# descomprimidos (16 GiB por defecto; 0 quita el tope, solo para confiar en
+# el origen de los datos)
+SPOOL_DIR = os.environ.get("STATS_SPOOL_DIR") or None
+SPOOL_MAX_BYTES = int(os.environ.get("STATS_SPOOL_MAX_BYTES", 16 << 30))
+
+CSV_CONTENT_TYPES = ("text/csv", "text/plain")
+CSV_SEPARATORS = (b"\n", b"\r", b",", b" ", b"\t")
+
+# Un bloque ordenado: (valores, constante, cantidad); valores es None si todos
+# son iguales a la constante
+SortedBlock = Tuple[Optional[Any], float, int]
+
+
+def parse_csv_fields(block: bytes) -> array:
+    """Números separados por comas, espacios o saltos de línea"""
+    fields = block.replace(b",", b" ").split()
+    try:
+        values = array("d", map(float, fields))
+    except ValueError:
+        bad = next(field for field in fields if not is_number(field))
+        raise ValueError(f"CSV inválido: {bad.decode(errors='replace')!r} no es un número")
+    return ensure_finite(values)
+
+
+def is_number(field: bytes) -> bool:
+    try:
+        float(field)
+    except ValueError:
+        return False
+    return True
+
+
+class Spool:
+    """Archivo de float64 que se llena con el body a medida que llega"""
+
+    def __init__(self, path: str, csv: bool = False, max_bytes: Optional[int] = None):
+        self.path = path
+        self.csv = csv
+        self.max_bytes = SPOOL_MAX_BYTES if max_bytes is None else max_bytes
+        self.received = 0
+        self._file = open(path, "wb")
+        self._pending = bytearray()
+
+    def __enter__(self) -> "Spool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self._file.close()
+
+    def limit(self) -> float:
+        """Tope de bytes para el descompresor (inf si no hay tope)"""
+        return self.max_bytes or inf
+
+    def write(self, data: bytes):
+        self.received += len(data)
+        if self.max_bytes and self.received > self.max_bytes:
+            raise PayloadTooLarge(f"El upload supera {self.max_bytes} bytes")
+        self._pending += data
+        if self.csv:
+            cut = max(self._pending.rfind(separator) for separator in CSV_SEPARATORS) + 1
+            if not cut and len(self._pending) > MAX_LINE_BYTES:
+                raise ValueError(f"CSV inválido: un valor supera {MAX_LINE_BYTES} bytes")
+            self._file.write(parse_csv_fields(bytes(self._pending[:cut])).tobytes())
+        else:
+            cut = len(self._pending) - len(self._pending) % FLOAT64_SIZE
+            self._file.write(ensure_finite(np.frombuffer(self._pending, "<f8", cut // FLOAT64_SIZE)))
+        del self._pending[:cut]
+
+    def close(self):
+        """Termina el volcado; un float64 incompleto es un error"""
+        if self.csv:
+            self._file.write(parse_csv_fields(bytes(self._pending)).tobytes())
+        elif self._pending:
+            raise ValueError(f"El body debe tener un múltiplo de {FLOAT64_SIZE} bytes (float64)")
+        self._pending.clear()
+        self._file.close()
+
+
+def iter_file_chunks(path: str) -> Iterator[Any]:
+    """Vistas de CHUNK_VALUES valores sobre el archivo mapeado en memoria"""
+    size = os.path.getsize(path)
+    if size % FLOAT64_SIZE:
+        raise ValueError(f"El archivo debe tener un múltiplo de {FLOAT64_SIZE} bytes (float64)")
+    if not size:
+        return
+    values = np.memmap(path, dtype="<f8", mode="r")
+    for start in range(0, values.size, CHUNK_VALUES):
+        yield np.asarray(values[start:start + CHUNK_VALUES])
+
+
+def file_moments(path: str) -> RunningStats:
+    """Pasada 1: momentos por bloque combinados con la fórmula de Chan"""
+    moments = RunningStats()
+    for chunk in iter_file_chunks(path):
+        mean = float(chunk.mean())
+        moments.merge(RunningStats.from_state([
+            chunk.size, float(chunk.sum()), 0.0, mean, float(chunk.var()) * chunk.size,
+            float(chunk.min()), float(chunk.max())
+        ]))
+    return moments
+
+
+def bin_indices(chunk, lo: float, hi: float):
+    """Intervalo de cada valor; monótono en el valor, así que cada intervalo es un rango"""
+    # Con las mitades hi - lo no desborda aunque los extremos sean enormes
+    width = hi * 0.5 - lo * 0.5
+    if not width:
+        return (chunk > lo).astype(np.int64) * (HISTOGRAM_BINS - 1)
+    scaled = (chunk * 0.5 - lo * 0.5) * (HISTOGRAM_BINS / width)
+    return np.minimum(scaled.astype(np.int64), HISTOGRAM_BINS - 1)
+
+
+def partition_file(
+    path: str, count: int, lo: float, hi: float, workdir: str
+) -> List[Tuple[str, int, float, float]]:
+    """
+    Pasadas 2 y 3: divide el archivo por rangos de valores.
+
+    Devuelve (ruta, cantidad, mínimo, máximo) de cada partición no vacía,
+    en orden de valores.
+    """
+    counts = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+    for chunk in iter_file_chunks(path):
+        counts += np.bincount(bin_indices(chunk, lo, hi), minlength=HISTOGRAM_BINS)
+
+    budget = max(PARTITION_VALUES, -(-count // MAX_PARTITIONS))
+    bin_to_part = np.empty(HISTOGRAM_BINS, dtype=np.int64)
+    parts = filled = 0
+    for index, bin_count in enumerate(counts.tolist()):
+        if filled and filled + bin_count > budget:
+            parts += 1
+            filled = 0
+        bin_to_part[index] = parts
+        filled += bin_count
+    parts += 1
+
+    handles = [tempfile.mkstemp(suffix=".f64", dir=workdir) for _ in range(parts)]
+    paths = [part_path for _, part_path in handles]
+    files = [os.fdopen(fd, "wb") for fd, _ in handles]
+    sizes = [0] * parts
+    mins = [float("inf")] * parts
+    maxs = [float("-inf")] * parts
+    try:
+        for chunk in iter_file_chunks(path):
+            part = bin_to_part[bin_indices(chunk, lo, hi)]
+            order = np.argsort(part, kind="stable")
+            part, values = part[order], chunk[order]
+            bounds = np.searchsorted(part, np.arange(parts + 1)).tolist()
+            for index in range(parts):
+                start, end = bounds[index], bounds[index + 1]
+                if start == end:
+                    continue
+                block = values[start:end]
+                files[index].write(block.tobytes())
+                sizes[index] += end - start
+                mins[index] = min(mins[index], float(block.min()))
+                maxs[index] = max(maxs[index], float(block.max()))
+    finally:
+        for part_file in files:
+            part_file.close()
+
+    result = []
+    for index in range(parts):
+        if sizes[index]:
+            result.append((paths[index], sizes[index], mins[index], maxs[index]))
+        else:
+            os.remove(paths[index])
+    return result
+
+
+def iter_sorted_blocks(path: str, count: int, lo: float, hi: float, workdir: str) -> Iterator[SortedBlock]:
+    """Bloques ordenados que recorren el archivo en orden de valores"""
+    if lo == hi:
+        yield None, lo, count
+        return
+    if count <= PARTITION_VALUES:
+        values = np.fromfile(path, dtype="<f8")
+        values.sort()
+        yield values, lo, count
+        return
+    for part_path, part_count, part_lo, part_hi in partition_file(path, count, lo, hi, workdir):
+        try:
+            yield from iter_sorted_blocks(part_path, part_count, part_lo, part_hi, workdir)
+        finally:
+            os.remove(part_path)
+
+
+def first_of(path: str, candidates_path: str) -> float:
+    """Primer valor del archivo que está entre los candidatos (ordenados)"""
+    candidates = np.memmap(candidates_path, dtype="<f8", mode="r")
+    last = candidates.size - 1
+    for chunk in iter_file_chunks(path):
+        found = np.searchsorted(candidates, chunk)
+        hits = np.flatnonzero(candidates[np.minimum(found, last)] == chunk)
+        if hits.size:
+            return float(chunk[hits[0]])
+    raise AssertionError("Ningún candidato aparece en el archivo")
+
+
+def order_statistics(path: str, moments: RunningStats, workdir: str) -> Tuple[float, float]:
+    """
+    Mediana exacta y moda recorriendo los bloques ordenados una vez.
+
+    La moda desempata como statistics.mode (el primero que aparece): los
+    valores empatados se guardan ordenados en disco y una última pasada busca
+    el primero en el archivo.
+    """
+    count = moments.count
+    low_rank, high_rank = (count - 1) // 2, count // 2
+    low = high = None
+    seen = best = tied = 0
+    candidates_path = os.path.join(workdir, "mode-candidates.f64")
+    with open(candidates_path, "wb") as candidates:
+        for values, constant, size in iter_sorted_blocks(path, count, moments.min, moments.max, workdir):
+            if seen <= low_rank < seen + size:
+                low = constant if values is None else float(values[low_rank - seen])
+            if seen <= high_rank < seen + size:
+                high = constant if values is None else float(values[high_rank - seen])
+            seen += size
+
+            if values is None:
+                run_values, run_counts = np.array([constant]), np.array([size])
+            else:
+                starts = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+                run_values, run_counts = values[starts], np.diff(np.append(starts, size))
+            block_best = int(run_counts.max())
+            if block_best > best:
+                best, tied = block_best, 0
+                candidates.seek(0)
+                candidates.truncate()
+            if block_best == best and best > 1:
+                winners = run_values[run_counts == best]
+                candidates.write(winners.tobytes())
+                tied += winners.size
+
+    median = high if count % 2 else (low + high) / 2
+    if best == 1:
+        # Todos distintos: como statistics.mode, el primero
+        mode = float(next(iter_file_chunks(path))[0])
+    elif tied == 1:
+        mode = float(np.fromfile(candidates_path, dtype="<f8")[0])
+    else:
+        mode = first_of(path, candidates_path)
+    os.remove(candidates_path)
+    return median, mode
+
+
+def file_stats(path: str, workdir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Todos los campos de StatsOut sobre un archivo de float64 little-endian.
+
+    Coincide con /stats salvo por el orden de suma (la suma se hace por
+    bloques y se combina con suma compensada).
+    """
+    if np is None:
+        raise ValueError("Las estadísticas fuera de memoria requieren NumPy")
+    moments = file_moments(path)
+    if not moments.count:
+        return empty_stats()
+    stats = stats_from_accumulators(moments)
+    median, mode = order_statistics(path, moments, workdir or os.path.dirname(os.path.abspath(path)))
+    stats.update(median=median, mode=[mode])
+    return stats
+
+
+def csv_to_float64(source: str, target: str):
+    """Convierte un CSV local a float64 por bloques"""
+    with open(source, "rb") as csv_file, Spool(target, csv=True, max_bytes=0) as spool:
+        for data in iter(lambda: csv_file.read(1 << 20), b""):
+            spool.write(data)
+        spool.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Estadísticas exactas de un archivo más grande que la RAM")
+    parser.add_argument("path", help="Archivo de float64 little-endian (o CSV con --csv)")
+    parser.add_argument("--csv", action="store_true", help="El archivo es un CSV de números")
+    args = parser.parse_args(argv)
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="stats-", dir=SPOOL_DIR) as workdir:
+            path = args.path
+            if args.csv:
+                path = os.path.join(workdir, "upload.f64")
+                csv_to_float64(args.path, path)
+            stats = file_stats(path, workdir)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(dumps(stats).decode())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Estadísticas por ventana deslizante para la Statistics API.
+
+Cada paso de la ventana quita un valor y agrega otro: la media y la varianza
+se actualizan en O(1) (Welford con reemplazo) y el mínimo y máximo salen de
+colas monótonas de índices, así que el total es O(n) sin importar el tamaño
+de la ventana.
+"""
+import sys
+from array import array
+from collections import deque
+from itertools import repeat
+from math import fsum, sqrt
+from operator import mul, sub
+from typing import Iterator, Sequence, Tuple
+
+from engines import as_python_floats
+
+ROLLING_COLUMNS = ("mean", "variance", "std_dev", "min", "max")
+
+
+def window_moments(values: Sequence[float]) -> Tuple[float, float]:
+    """Media y M2 exactos de una ventana (dos pasadas con fsum)"""
+    count = len(values)
+    mean = fsum(values) / count
+    deviations = list(map(sub, values, repeat(mean)))
+    correction = fsum(deviations)
+    return mean, fsum(map(mul, deviations, deviations)) - correction * correction / count
+
+
+def iter_rolling(
+    nums: Sequence[float], window: int, step: int = 1
+) -> Iterator[Tuple[float, float, float, float]]:
+    """
+    (media, varianza, mínimo, máximo) de cada ventana.
+
+    Las ventanas empiezan en 0, step, 2·step, ... y se generan de a una, así
+    que la memoria es O(window). La varianza es muestral (n - 1), 0.0 con
+    window=1, igual que /stats. Cada vez que la ventana se renueva por
+    completo la media y M2 se recalculan exactos, para que el error de las
+    actualizaciones no se acumule en series largas.
+    """
+    if window < 1 or step < 1:
+        raise ValueError("window y step deben ser al menos 1")
+    nums = as_python_floats(nums)
+    count = len(nums)
+    if window > count:
+        return
+
+    # Índices con valores crecientes (mins) y decrecientes (maxs)
+    mins: deque = deque()
+    maxs: deque = deque()
+    for i in range(window):
+        x = nums[i]
+        while mins and nums[mins[-1]] >= x:
+            mins.pop()
+        mins.append(i)
+        while maxs and nums[maxs[-1]] <= x:
+            maxs.pop()
+        maxs.append(i)
+    mean, m2 = window_moments(nums[:window])
+    divisor = window - 1
+
+    start = 0
+    next_emit = 0
+    last_start = count - window
+    while True:
+        if start == next_emit:
+            variance = max(m2, 0.0) / divisor if divisor else 0.0
+            yield mean, variance, nums[mins[0]], nums[maxs[0]]
+            next_emit += step
+        if start == last_start:
+            return
+
+        end = start + window
+        old = nums[start]
+        new = nums[end]
+        start += 1
+
+        while mins and nums[mins[-1]] >= new:
+            mins.pop()
+        mins.append(end)
+        if mins[0] < start:
+            mins.popleft()
+        while maxs and nums[maxs[-1]] <= new:
+            maxs.pop()
+        maxs.append(end)
+        if maxs[0] < start:
+            maxs.popleft()
+
+        if start % window == 0:
+            mean, m2 = window_moments(nums[start:end + 1])
+        else:
+            delta = new - old
+            new_mean = mean + delta / window
+            m2 += delta * ((new - new_mean) + (old - mean))
+            mean = new_mean
+
+
+def rolling_row(values: Tuple[float, float, float, float]) -> Tuple[float, ...]:
+    """Fila completa (ROLLING_COLUMNS) de una ventana"""
+    mean, variance, min_val, max_val = values
+    return mean, variance, sqrt(variance), min_val, max_val
+
+
+def rolling_float64(nums: Sequence[float], window: int, step: int = 1) -> bytes:
+    """
+    Resultado como float64 little-endian, una fila de ROLLING_COLUMNS por
+    ventana, sin redondear.
+    """
+    values = array("d")
+    for row in iter_rolling(nums, window, step):
+        values.extend(rolling_row(row))
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
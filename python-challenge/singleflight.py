@@ -0,0 +1,78 @@
+"""
+Deduplicación de cálculos idénticos en curso (singleflight) para la Statistics API.
+
+Cuando llegan a la vez varios requests con el mismo endpoint, motor y
+números, el primero calcula y los demás esperan ese mismo resultado. A
+diferencia de la caché no se retiene nada: la entrada desaparece apenas
+termina el cálculo, así que no hace falta política de expiración.
+
+STATS_SINGLEFLIGHT=0 lo desactiva.
+"""
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+ENABLED = os.environ.get("STATS_SINGLEFLIGHT", "1") != "0"
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Un cálculo por clave entre los threads que lo piden a la vez.
+
+    Los endpoints síncronos corren en el threadpool, así que los que llegan
+    después esperan con un threading.Event; si el cálculo falla, todos
+    reciben la misma excepción.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        """Cálculos en curso (uno por clave)"""
+        return len(self._calls)
+
+    def info(self) -> Dict[str, int]:
+        return {"in_flight": self.in_flight(), "leaders": self.leaders, "coalesced": self.coalesced}
+
+
+def create_singleflight() -> Optional[SingleFlight]:
+    return SingleFlight() if ENABLED else None
@@ -0,0 +1,208 @@
+"""
+Sketches de memoria acotada para la Statistics API.
+
+KLLSketch estima cuantiles con un error de rango acotado usando solo
+O(k · log(n / k)) valores, y MisraGries encuentra los valores más frecuentes
+con a lo sumo capacity contadores. Dos sketches del mismo tipo se pueden
+combinar.
+"""
+import heapq
+import random
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate, islice
+from math import ceil, inf
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from engines import np
+
+# Error de rango normalizado medido para k=200 (ver tests/test_sketches.py)
+KLL_DEFAULT_K = 200
+KLL_RANK_ERROR = 0.01
+
+# Valores que entran a la vez al nivel 0: acota la memoria de cada update
+KLL_BATCH = 8192
+
+MG_DEFAULT_CAPACITY = 1000
+# Valores contados por vez: acota la memoria del Counter de cada lote
+MG_BATCH = 65_536
+
+
+def iter_sorted_batches(values: Iterable[float], size: int) -> Iterator[List[float]]:
+    """
+    Tramos ordenados de a lo sumo size valores, sin copiar la entrada completa.
+
+    Las secuencias se rebanan (un arreglo de NumPy se ordena con np.sort); el
+    resto se recorre con islice.
+    """
+    if hasattr(values, "__len__") and hasattr(values, "__getitem__"):
+        for start in range(0, len(values), size):
+            batch = values[start:start + size]
+            if np is not None and isinstance(batch, np.ndarray):
+                yield np.sort(batch).tolist()
+            else:
+                yield sorted(batch)
+        return
+    iterator = iter(values)
+    while True:
+        batch = sorted(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class KLLSketch:
+    """
+    Sketch de cuantiles KLL (Karnin, Lang y Liberty, 2016).
+
+    Cada nivel h es un compactador cuyos elementos pesan 2**h; cuando un
+    nivel se llena se ordena y la mitad de sus elementos (pares o impares al
+    azar) sube al nivel siguiente. Con k=200 el error de rango normalizado
+    queda por debajo de KLL_RANK_ERROR (1%): el valor retornado para q tiene
+    un rango real entre (q - 0.01)·n y (q + 0.01)·n.
+
+    Los valores se agregan por lotes: extender, ordenar y rebanar listas
+    corre en C, así que el costo por elemento es bajo incluso sin NumPy.
+    """
+
+    def __init__(self, k: int = KLL_DEFAULT_K, seed: Optional[int] = None):
+        if k < 8:
+            raise ValueError("k debe ser al menos 8")
+        self.k = k
+        self.count = 0
+        self.min = inf
+        self.max = -inf
+        self._levels: List[List[float]] = [[]]
+        self._rng = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        # Los niveles bajos tienen menos capacidad (factor 2/3 por nivel)
+        depth = len(self._levels) - level - 1
+        return int(ceil(self.k * (2 / 3) ** depth)) + 1
+
+    def _size(self) -> int:
+        return sum(map(len, self._levels))
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(h) for h in range(len(self._levels)))
+
+    def _compress(self):
+        while self._size() >= self._max_size():
+            for h, level in enumerate(self._levels):
+                if len(level) >= self._capacity(h):
+                    if h + 1 == len(self._levels):
+                        self._levels.append([])
+                    level.sort()
+                    # Con largo impar el último elemento queda en el nivel
+                    end = len(level) - (len(level) % 2)
+                    offset = self._rng.random() < 0.5
+                    self._levels[h + 1].extend(level[offset:end:2])
+                    del level[:end]
+                    break
+
+    def update(self, values: Iterable[float]) -> "KLLSketch":
+        """Agrega valores por tramos de KLL_BATCH, compactando después de cada uno"""
+        # Cada tramo entra ordenado: al compactar, ordenar el nivel 0 es casi
+        # lineal (Timsort aprovecha las rachas)
+        for batch in iter_sorted_batches(values, KLL_BATCH):
+            self.count += len(batch)
+            self.min = min(self.min, batch[0])
+            self.max = max(self.max, batch[-1])
+            self._levels[0].extend(batch)
+            self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Combina otro sketch en este"""
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        for level, items in zip(self._levels, other._levels):
+            level.extend(items)
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def quantiles(self, qs: Sequence[float]) -> List[Optional[float]]:
+        """Cuantiles aproximados; q=0 y q=1 son el mínimo y máximo exactos"""
+        if not self.count:
+            return [None] * len(qs)
+        weighted = sorted(
+            (value, 1 << h) for h, level in enumerate(self._levels) for value in level
+        )
+        values = [value for value, _ in weighted]
+        cumulative = list(accumulate(weight for _, weight in weighted))
+        total = cumulative[-1]
+        result = []
+        for q in qs:
+            if q <= 0:
+                result.append(self.min)
+            elif q >= 1:
+                result.append(self.max)
+            else:
+                idx = bisect_left(cumulative, q * total)
+                result.append(values[min(idx, len(values) - 1)])
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.quantiles([q])[0]
+
+
+class MisraGries:
+    """
+    Valores más frecuentes (heavy hitters) con a lo sumo capacity contadores.
+
+    Versión por lotes y combinable de Misra-Gries (Agarwal et al., 2012):
+    cada lote se cuenta con Counter y se suma a los contadores; si quedan más
+    de capacity, a todos se les resta el contador número capacity + 1 y se
+    descartan los que llegan a 0.
+
+    Cada conteo estimado es una cota inferior que subestima a lo sumo
+    error(): todo valor con frecuencia mayor que error() está entre los
+    contadores.
+    """
+
+    def __init__(self, capacity: int = MG_DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity debe ser al menos 1")
+        self.capacity = capacity
+        self.count = 0
+        self._counters: Dict[float, int] = {}
+
+    def _reduce(self):
+        if len(self._counters) <= self.capacity:
+            return
+        cut = heapq.nlargest(self.capacity + 1, self._counters.values())[-1]
+        # El orden del dict (primera aparición) se conserva para los empates
+        self._counters = {value: c - cut for value, c in self._counters.items() if c > cut}
+
+    def update(self, values: Iterable[float]) -> "MisraGries":
+        """Agrega valores por lotes de MG_BATCH"""
+        iterator = iter(values)
+        while True:
+            batch = Counter(islice(iterator, MG_BATCH))
+            if not batch:
+                return self
+            counters = self._counters
+            for value, c in batch.items():
+                counters[value] = counters.get(value, 0) + c
+            self.count += sum(batch.values())
+            self._reduce()
+
+    def merge(self, other: "MisraGries") -> "MisraGries":
+        """Combina otro sketch en este; el error sigue acotado por el total"""
+        counters = self._counters
+        for value, c in other._counters.items():
+            counters[value] = counters.get(value, 0) + c
+        self.count += other.count
+        self._reduce()
+        return self
+
+    def error(self) -> int:
+        """Subestimación máxima de cualquier conteo"""
+        return (self.count - sum(self._counters.values())) // (self.capacity + 1)
+
+    def top(self, k: int) -> List[Tuple[float, int]]:
+        """Los k valores con mayor conteo estimado; los empates, por primera aparición"""
+        return heapq.nlargest(k, self._counters.items(), key=lambda item: item[1])
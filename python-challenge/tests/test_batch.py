@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+import executor
+
+
+class TestBatchEndpoint:
+    """Pruebas de /stats/batch"""
+
+    def test_batch_matches_single_requests(self, client):
+        """Test: Cada serie coincide con su propio /stats"""
+        series = {"a": [1, 2, 3, 4, 5], "b": [1.5, 2.3, 3.7], "c": [7, 7, 1]}
+        response = client.post("/stats/batch", json={"series": series})
+
+        assert response.status_code == 200
+        data = response.json()["series"]
+        assert list(data) == ["a", "b", "c"]
+        for name, numbers in series.items():
+            assert data[name] == client.post("/stats", json={"numbers": numbers}).json()
+
+    def test_batch_with_empty_series(self, client):
+        """Test: Series vacías y batch vacío"""
+        response = client.post("/stats/batch", json={"series": {"vacia": []}})
+        assert response.status_code == 200
+        assert response.json()["series"]["vacia"]["count"] == 0
+
+        response = client.post("/stats/batch", json={"series": {}})
+        assert response.status_code == 200
+        assert response.json() == {"series": {}}
+
+    def test_batch_in_processes(self, client, monkeypatch):
+        """Test: Lotes grandes se calculan en el pool de procesos"""
+        monkeypatch.setattr(executor, "PARALLEL_MIN_SIZE", 0)
+        monkeypatch.setattr(executor, "POOL_WORKERS", 2)
+        rng = random.Random(4)
+        series = {f"s{i}": [rng.randrange(10) for _ in range(50)] for i in range(8)}
+
+        response = client.post("/stats/batch?engine=python", json={"series": series})
+
+        assert response.status_code == 200
+        data = response.json()["series"]
+        assert list(data) == list(series)
+        for name, numbers in series.items():
+            assert data[name]["sum"] == sum(numbers)
+
+    @pytest.mark.parametrize("payload", [
+        {"series": {"a": ["x"]}},
+        {"series": {"a": None}},
+        {"series": [1, 2, 3]},
+        {"numbers": [1, 2, 3]},
+    ])
+    def test_batch_invalid(self, client, payload):
+        """Test: Body inválido retorna 422"""
+        response = client.post("/stats/batch", json=payload)
+
+        assert response.status_code == 422
@@ -0,0 +1,150 @@
+import asyncio
+import itertools
+import json
+import os
+
+import pytest
+
+from benchmarks import coldstart, load, suite
+
+
+class TestRegressionGate:
+    """Pruebas de la comparación contra la línea base"""
+
+    def test_regression_detected(self):
+        """Test: Un caso más lento que el umbral es una regresión"""
+        baseline = {"stats/direct/python/uniform/1000": 0.010}
+        results = {"stats/direct/python/uniform/1000": 0.020}
+        assert suite.compare(results, baseline, threshold=0.25) == [
+            ("stats/direct/python/uniform/1000", 0.010, 0.020)
+        ]
+
+    def test_within_threshold(self):
+        """Test: Variaciones dentro del umbral no fallan"""
+        baseline = {"a": 0.010}
+        assert suite.compare({"a": 0.012}, baseline, threshold=0.25) == []
+
+    def test_noise_floor(self):
+        """Test: Casos de microsegundos no fallan por ruido"""
+        baseline = {"a": 0.00001}
+        assert suite.compare({"a": 0.00004}, baseline, threshold=0.25) == []
+
+    def test_new_cases_ignored(self):
+        """Test: Casos sin línea base no se comparan"""
+        assert suite.compare({"new": 1.0}, {}, threshold=0.25) == []
+
+    def test_cli_save_and_compare(self, tmp_path, monkeypatch):
+        """Test: --save escribe la línea base y --compare falla con regresiones"""
+        timings = iter([0.010, 0.050])
+        monkeypatch.setattr(suite, "run_suite",
+                            lambda *args, **kwargs: {"a": next(timings)})
+        path = str(tmp_path / "baseline.json")
+        assert suite.main(["--save", path]) == 0
+        assert json.load(open(path))["results"] == {"a": 0.010}
+        assert suite.main(["--compare", path]) == 1
+
+
+class TestBenchmarkData:
+    """Pruebas de las distribuciones generadas"""
+
+    def test_distributions(self):
+        """Test: Cada distribución tiene la cantidad de valores distintos esperada"""
+        assert len(set(suite.make_numbers("all-distinct", 1000))) == 1000
+        assert len(set(suite.make_numbers("heavy-duplicate", 1000))) <= 10
+        assert len(suite.make_numbers("uniform", 1000)) == 1000
+
+    def test_reproducible(self):
+        """Test: La misma semilla da los mismos números"""
+        assert suite.make_numbers("uniform", 100) == suite.make_numbers("uniform", 100)
+
+    def test_unknown_distribution(self):
+        """Test: Distribución desconocida"""
+        with pytest.raises(ValueError):
+            suite.make_numbers("normal", 10)
+
+
+@pytest.mark.slow
+class TestBenchmarkSuite:
+    """Barrido de benchmarks (pytest -m slow)"""
+
+    def test_sweep(self, monkeypatch):
+        """Test: Barrido completo, comparado con STATS_BENCH_BASELINE si existe"""
+        import app as app_module
+        monkeypatch.setattr(app_module, "result_cache", None)
+        max_size = int(os.environ.get("STATS_BENCH_MAX_SIZE", 100_000))
+        sizes = [size for size in suite.SIZES if size <= max_size]
+        results = suite.run_suite(sizes)
+        assert all(seconds > 0 for seconds in results.values())
+
+        baseline_path = os.environ.get("STATS_BENCH_BASELINE")
+        if baseline_path:
+            threshold = float(os.environ.get("STATS_BENCH_THRESHOLD", suite.DEFAULT_THRESHOLD))
+            regressions = suite.compare(results, suite.load_baseline(baseline_path), threshold)
+            assert regressions == []
+
+
+class TestLoadHarness:
+    """Pruebas del generador de carga contra la app ASGI (sin uvicorn)"""
+
+    def run_against_app(self, **kwargs):
+        import httpx
+        from app import app
+
+        async def go():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await load.run_load(client, profile="small", duration=0.3, **kwargs)
+        return asyncio.run(go())
+
+    def test_closed_loop(self):
+        """Test: Carga cerrada con varias conexiones reporta cada endpoint"""
+        report = self.run_against_app(concurrency=4).summary()
+        assert {"POST /stats", "POST /stats/basic", "GET /health", "total"} <= set(report)
+        total = report["total"]
+        assert total["requests"] > 0 and total["rps"] > 0
+        assert total["error_rate"] == 0
+        assert total["p50"] <= total["p95"] <= total["p99"] <= total["max"]
+
+    def test_fixed_rate(self):
+        """Test: Con --rate se programa exactamente duration * rate requests"""
+        # Reloj falso que avanza 1 ms por lectura: el resultado no depende de la carga del CI
+        clock = itertools.count(0.0, 0.001).__next__
+        results = self.run_against_app(concurrency=8, rate=100, clock=clock)
+        total = results.summary()["total"]
+        assert total["requests"] == 30
+        assert total["error_rate"] == 0
+
+    def test_error_rate(self):
+        """Test: Status que no son 2xx cuentan como errores"""
+        results = load.LoadResults()
+        results.record("POST /stats", 0.01, "200")
+        results.record("POST /stats", 0.02, "503")
+        results.record("POST /stats", 0.03, "ConnectError")
+        results.elapsed = 1.0
+        summary = results.summary()["POST /stats"]
+        assert summary["error_rate"] == pytest.approx(2 / 3)
+        assert summary["statuses"] == {"200": 1, "503": 1, "ConnectError": 1}
+
+
+class TestColdStart:
+    """Pruebas del benchmark de arranque en frío"""
+
+    def test_probe_in_new_process(self):
+        """Test: Cada modo mide import y primeros requests en un proceso nuevo"""
+        cold = coldstart.run_probe("cold")
+        assert cold["import"] > 0 and cold["first"] > 0 and cold["second"] > 0
+        assert cold["warmup"] is None
+        assert coldstart.run_probe("warmup")["warmup"] > 0
+
+    def test_report(self, monkeypatch, capsys):
+        """Test: La mediana por modo y la tabla impresa"""
+        samples = iter([
+            {"import": 0.3, "warmup": None, "first": 0.05, "second": 0.001},
+            {"import": 0.5, "warmup": None, "first": 0.07, "second": 0.001},
+            {"import": 0.4, "warmup": None, "first": 0.06, "second": 0.001},
+        ])
+        monkeypatch.setattr(coldstart, "run_probe", lambda mode: next(samples))
+        report = coldstart.run(["cold"], runs=3)
+        assert report == {"cold": {"import": 0.4, "warmup": None, "first": 0.06, "second": 0.001}}
+        coldstart.print_report(report)
+        assert "400.0ms" in capsys.readouterr().out
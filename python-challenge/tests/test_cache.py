@@ -0,0 +1,131 @@
+import pytest
+
+import app as app_module
+import cache
+from cache import MemoryCache, SQLiteCache, cache_key
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    """Fábrica de cachés de cada tipo"""
+    def factory(max_entries=10, max_bytes=1000, ttl=60):
+        if request.param == "sqlite":
+            return SQLiteCache(str(tmp_path / "cache.db"), max_entries, max_bytes, ttl)
+        return MemoryCache(max_entries, max_bytes, ttl)
+    return factory
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    """Caché vacía para la app durante la prueba"""
+    result_cache = MemoryCache(100, 10 ** 6, 60)
+    monkeypatch.setattr(app_module, "result_cache", result_cache)
+    return result_cache
+
+
+class TestCacheKey:
+    """Pruebas de la clave de caché"""
+
+    def test_same_numbers_same_key(self):
+        """Test: Listas, enteros y memoryview con los mismos valores coinciden"""
+        key = cache_key("stats", "python", [1.0, 2.0])
+        assert cache_key("stats", "python", [1, 2]) == key
+        assert cache_key("stats", "python", memoryview(b"".join(
+            v.to_bytes(8, "little") for v in (0x3FF0000000000000, 0x4000000000000000)
+        )).cast("d")) == key
+
+    def test_endpoint_and_engine_in_key(self):
+        """Test: El endpoint y el motor forman parte de la clave"""
+        keys = {cache_key(e, m, [1.0]) for e in ("stats", "basic") for m in ("python", "numpy")}
+        assert len(keys) == 4
+        assert cache_key("stats", "python", [1.0, 2.0]) != cache_key("stats", "python", [2.0, 1.0])
+
+
+class TestCacheBackends:
+    """Pruebas de los almacenamientos de la caché"""
+
+    def test_hit_and_miss(self, make_cache):
+        """Test: Aciertos y fallos se cuentan"""
+        result_cache = make_cache()
+        assert result_cache.get("a") is None
+        result_cache.set("a", b"{}")
+        assert result_cache.get("a") == b"{}"
+        info = result_cache.info()
+        assert (info["hits"], info["misses"], info["entries"], info["bytes"]) == (1, 1, 1, 2)
+
+    def test_lru_eviction_by_entries(self, make_cache):
+        """Test: Se desaloja la entrada usada hace más tiempo"""
+        result_cache = make_cache(max_entries=2)
+        result_cache.set("a", b"1")
+        result_cache.set("b", b"2")
+        assert result_cache.get("a") == b"1"
+        result_cache.set("c", b"3")
+        assert result_cache.get("b") is None
+        assert result_cache.get("a") == b"1"
+        assert result_cache.info()["evictions"] == 1
+
+    def test_eviction_by_bytes(self, make_cache):
+        """Test: El límite de bytes también desaloja"""
+        result_cache = make_cache(max_bytes=10)
+        result_cache.set("a", b"x" * 6)
+        result_cache.set("b", b"y" * 6)
+        assert result_cache.get("a") is None
+        assert result_cache.info()["bytes"] == 6
+        result_cache.set("big", b"z" * 11)
+        assert result_cache.get("big") is None
+
+    def test_ttl(self, make_cache, monkeypatch):
+        """Test: Las entradas vencidas no se devuelven"""
+        result_cache = make_cache(ttl=10)
+        result_cache.set("a", b"1")
+        now = cache.time.time() + 20
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now)
+        monkeypatch.setattr(cache.time, "time", lambda: now)
+        assert result_cache.get("a") is None
+        assert result_cache.info()["expirations"] == 1
+
+    def test_create_cache_from_env(self, monkeypatch, tmp_path):
+        """Test: Configuración por variables de entorno"""
+        monkeypatch.setenv("STATS_CACHE_ENTRIES", "0")
+        assert cache.create_cache() is None
+        monkeypatch.setenv("STATS_CACHE_ENTRIES", "5")
+        monkeypatch.setenv("STATS_CACHE_DB", str(tmp_path / "shared.db"))
+        assert isinstance(cache.create_cache(), SQLiteCache)
+
+
+class TestCachedEndpoints:
+    """Pruebas de la caché en /stats y /stats/basic"""
+
+    def test_stats_hit_returns_same_body(self, client, fresh_cache):
+        """Test: El acierto devuelve la misma respuesta sin recalcular"""
+        first = client.post("/stats", json={"numbers": [1, 2, 3, 4, 5]})
+        second = client.post("/stats", json={"numbers": [1, 2, 3, 4, 5]})
+
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert second.headers["content-type"] == "application/json"
+        assert fresh_cache.info()["hits"] == 1
+
+    def test_basic_hit(self, client, fresh_cache):
+        """Test: /stats/basic también usa la caché"""
+        first = client.post("/stats/basic", json={"numbers": [1, 2, 6]})
+        second = client.post("/stats/basic", json={"numbers": [1, 2, 6]})
+
+        assert second.json() == first.json() == {"mean": 3.0, "max": 6.0, "min": 1.0}
+        assert fresh_cache.info()["hits"] == 1
+
+    def test_cache_endpoint(self, client, fresh_cache):
+        """Test: /cache expone los contadores"""
+        client.post("/stats", json={"numbers": [9, 8]})
+        data = client.get("/cache").json()
+
+        assert data["enabled"] is True
+        assert data["misses"] == 1
+        assert data["entries"] == 1
+
+    def test_cache_disabled(self, client, monkeypatch):
+        """Test: Sin caché los endpoints funcionan igual"""
+        monkeypatch.setattr(app_module, "result_cache", None)
+
+        assert client.post("/stats", json={"numbers": [1, 2]}).status_code == 200
+        assert client.get("/cache").json() == {"enabled": False}
@@ -0,0 +1,187 @@
+import asyncio
+import gzip
+import json
+import os
+import struct
+import tracemalloc
+import zlib
+
+import pytest
+
+import ingest
+from ingest import (
+    DECOMPRESS_CHUNK, PayloadTooLarge, UnsupportedEncoding, create_decoder, iter_decoded, zstandard
+)
+
+
+def decode(encoding, chunks, limit=None):
+    async def collect():
+        async def source():
+            for chunk in chunks:
+                yield chunk
+        return [out async for out in iter_decoded(source(), create_decoder(encoding), limit)]
+    return asyncio.run(collect())
+
+
+def gzip_json(payload):
+    return gzip.compress(json.dumps(payload).encode())
+
+
+class TestDecoders:
+    """Pruebas de la descompresión por bloques"""
+
+    def test_gzip_byte_by_byte(self):
+        """Test: Alimentar de a un byte da el mismo resultado"""
+        data = json.dumps({"numbers": list(range(2000))}).encode()
+        compressed = gzip.compress(data)
+        chunks = [compressed[i:i + 1] for i in range(len(compressed))]
+        assert b"".join(decode("gzip", chunks)) == data
+
+    def test_gzip_members_and_deflate(self):
+        """Test: gzip con varios miembros y deflate (formato zlib)"""
+        assert b"".join(decode("gzip", [gzip.compress(b"[1,") + gzip.compress(b"2]")])) == b"[1,2]"
+        assert b"".join(decode("deflate", [zlib.compress(b"[3]")])) == b"[3]"
+
+    def test_output_blocks_are_bounded(self):
+        """Test: Un body muy comprimible sale en bloques acotados"""
+        data = b"0" * (DECOMPRESS_CHUNK * 5 + 7)
+        blocks = decode("gzip", [gzip.compress(data)])
+        assert max(map(len, blocks)) <= DECOMPRESS_CHUNK
+        assert b"".join(blocks) == data
+
+    def test_limit_stops_before_expanding(self):
+        """Test: Una bomba de compresión se corta al pasar el tope"""
+        bomb = gzip.compress(b"\0" * (16 * 1024 * 1024))
+        with pytest.raises(PayloadTooLarge):
+            decode("gzip", [bomb], limit=1024 * 1024)
+
+    def test_invalid_bodies(self):
+        """Test: Corrupto, truncado, vacío o con datos de más"""
+        compressed = gzip.compress(b"[1, 2, 3]")
+        for chunks, encoding in [
+            ([b"not gzip"], "gzip"),
+            ([compressed[:-4]], "gzip"),
+            ([], "gzip"),
+            ([zlib.compress(b"[1]") + b"xx"], "deflate"),
+        ]:
+            with pytest.raises(ValueError):
+                decode(encoding, chunks)
+
+    def test_unsupported(self):
+        """Test: Un Content-Encoding desconocido"""
+        with pytest.raises(UnsupportedEncoding):
+            create_decoder("br")
+
+    @pytest.mark.skipif(zstandard is None, reason="zstandard no instalado")
+    def test_zstd(self):
+        """Test: zstd alimentado por bloques"""
+        data = json.dumps(list(range(5000))).encode()
+        compressed = zstandard.ZstdCompressor().compress(data)
+        assert b"".join(decode("zstd", [compressed[:100], compressed[100:]])) == data
+
+
+@pytest.mark.skipif(zstandard is None, reason="zstandard no instalado")
+class TestZstd:
+    """Pruebas del descompresor zstd con salida acotada"""
+
+    def test_byte_by_byte_checksum_and_frames(self):
+        """Test: De a un byte, con checksum, varios frames y un frame salteable"""
+        data = json.dumps(list(range(20_000))).encode()
+        compressed = zstandard.ZstdCompressor(write_checksum=True).compress(data)
+        chunks = [compressed[i:i + 1] for i in range(len(compressed))]
+        assert b"".join(decode("zstd", chunks)) == data
+
+        skippable = struct.pack("<II", 0x184D2A53, 3) + b"abc"
+        body = zstandard.ZstdCompressor().compress(b"[1,") + skippable + zstandard.ZstdCompressor().compress(b"2]")
+        assert b"".join(decode("zstd", [body])) == b"[1,2]"
+
+    def test_output_blocks_are_bounded(self):
+        """Test: Un body muy comprimible sale en bloques acotados"""
+        data = b"0" * (DECOMPRESS_CHUNK * 5 + 7) + os.urandom(1000)
+        compressed = zstandard.ZstdCompressor().compress(data)
+        blocks = decode("zstd", [compressed])
+        assert max(map(len, blocks)) <= DECOMPRESS_CHUNK
+        assert b"".join(blocks) == data
+
+    def test_bomb_stops_without_expanding(self):
+        """Test: Unos KB de bloques RLE se cortan al pasar el tope sin asignar la salida completa"""
+        bomb = zstandard.ZstdCompressor(level=19).compress(b"\0" * (256 << 20))
+        assert len(bomb) < 16_384
+        tracemalloc.start()
+        try:
+            with pytest.raises(PayloadTooLarge):
+                decode("zstd", [bomb], limit=1 << 20)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        assert peak < 8 << 20
+
+    def test_invalid_bodies(self):
+        """Test: Truncado, vacío, corrupto o con datos de más"""
+        compressed = zstandard.ZstdCompressor(write_checksum=True).compress(b"[1, 2, 3]" * 100)
+        for chunks in ([compressed[:-2]], [compressed[:-12]], [], [b"not zstd at all"], [compressed + b"xyz"]):
+            with pytest.raises(ValueError):
+                decode("zstd", chunks)
+
+    def test_endpoint_bomb(self, client, monkeypatch):
+        """Test: /stats responde 413 con una bomba zstd"""
+        monkeypatch.setattr(ingest, "MAX_DECOMPRESSED_BYTES", 1 << 20)
+        bomb = zstandard.ZstdCompressor(level=19).compress(b"\0" * (64 << 20))
+        response = client.post("/stats", content=bomb, headers={
+            "Content-Type": "application/octet-stream", "Content-Encoding": "zstd"
+        })
+        assert response.status_code == 413
+
+
+class TestCompressedEndpoints:
+    """Pruebas de Content-Encoding en los endpoints"""
+
+    def test_stats_gzip_json(self, client, sample_numbers):
+        """Test: /stats con JSON en gzip da lo mismo que sin comprimir"""
+        response = client.post("/stats", content=gzip_json({"numbers": sample_numbers}), headers={
+            "Content-Type": "application/json", "Content-Encoding": "gzip"
+        })
+        assert response.status_code == 200
+        assert response.json() == client.post("/stats", json={"numbers": sample_numbers}).json()
+
+    def test_basic_gzip_binary(self, client):
+        """Test: /stats/basic con float64 en gzip"""
+        response = client.post("/stats/basic", content=gzip.compress(struct.pack("<3d", 1, 2, 6)), headers={
+            "Content-Type": "application/octet-stream", "Content-Encoding": "gzip"
+        })
+        assert response.status_code == 200
+        assert response.json()["mean"] == 3.0
+
+    def test_batch_deflate(self, client):
+        """Test: /stats/batch con deflate"""
+        body = zlib.compress(json.dumps({"series": {"a": [1, 2], "b": [3]}}).encode())
+        response = client.post("/stats/batch", content=body, headers={
+            "Content-Type": "application/json", "Content-Encoding": "deflate"
+        })
+        assert response.status_code == 200
+        assert response.json()["series"]["b"]["count"] == 1
+
+    def test_stream_gzip(self, client):
+        """Test: /stats/stream descomprime y parsea por bloques"""
+        body = gzip.compress(b"".join(b"%d\n" % i for i in range(1, 10001)))
+        response = client.post("/stats/stream", content=body, headers={
+            "Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"
+        })
+        assert response.status_code == 200
+        assert response.json()["sum"] == 50005000
+
+    def test_errors(self, client, monkeypatch):
+        """Test: 415 si no se soporta, 413 al pasar el tope y 422 si está corrupto"""
+        headers = {"Content-Type": "application/json"}
+        body = gzip_json({"numbers": [1, 2, 3]})
+        assert client.post("/stats", content=body, headers={
+            **headers, "Content-Encoding": "br"
+        }).status_code == 415
+        assert client.post("/stats", content=b"garbage", headers={
+            **headers, "Content-Encoding": "gzip"
+        }).status_code == 422
+        monkeypatch.setattr(ingest, "MAX_DECOMPRESSED_BYTES", 8)
+        for path in ["/stats", "/stats/stream"]:
+            assert client.post(path, content=body, headers={
+                **headers, "Content-Encoding": "gzip"
+            }).status_code == 413
@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+from datasets import DatasetNotFound, MemoryDatasetStore, SQLiteDatasetStore
+from engines import compute_stats
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """Fixture con cada tipo de almacenamiento"""
+    if request.param == "sqlite":
+        return SQLiteDatasetStore(str(tmp_path / "datasets.db"))
+    return MemoryDatasetStore()
+
+
+def assert_same_stats(result, expected):
+    assert result["count"] == expected["count"]
+    assert result["median"] == expected["median"]
+    assert result["mode"] == expected["mode"]
+    for key in ("mean", "variance", "std_dev", "min", "max", "range", "sum"):
+        assert result[key] == pytest.approx(expected[key], rel=1e-12)
+
+
+class TestDatasetStores:
+    """Pruebas de los almacenamientos de datasets"""
+
+    def test_batches_match_concatenated_data(self, store):
+        """Test: Agregar por lotes equivale a /stats sobre todo junto"""
+        rng = random.Random(3)
+        batches = [[float(rng.randrange(50)) for _ in range(rng.randrange(1, 200))]
+                   for _ in range(12)]
+        dataset_id = store.create()
+        for batch in batches:
+            store.append(dataset_id, batch)
+
+        everything = [x for batch in batches for x in batch]
+        assert_same_stats(store.stats(dataset_id), compute_stats(everything))
+
+    def test_mode_keeps_first_seen_order(self, store):
+        """Test: En empates la moda es el primer valor visto, como en /stats"""
+        dataset_id = store.create()
+        store.append(dataset_id, [9.0, 1.0])
+        store.append(dataset_id, [1.0, 9.0])
+        assert store.stats(dataset_id)["mode"] == [9.0]
+
+    def test_empty_dataset(self, store):
+        """Test: Dataset sin datos"""
+        dataset_id = store.create()
+        assert store.stats(dataset_id)["count"] == 0
+
+    def test_missing_dataset(self, store):
+        """Test: Dataset inexistente"""
+        with pytest.raises(DatasetNotFound):
+            store.append("nope", [1.0])
+        with pytest.raises(DatasetNotFound):
+            store.stats("nope")
+
+    def test_sqlite_persists_between_connections(self, tmp_path):
+        """Test: SQLite conserva los datos al reabrir el archivo"""
+        path = str(tmp_path / "datasets.db")
+        dataset_id = SQLiteDatasetStore(path).create()
+        SQLiteDatasetStore(path).append(dataset_id, [1.0, 2.0, 3.0])
+        assert SQLiteDatasetStore(path).stats(dataset_id)["mean"] == 2.0
+
+
+class TestDatasetEndpoints:
+    """Pruebas de los endpoints /datasets"""
+
+    def test_create_append_and_stats(self, client):
+        """Test: Flujo completo crear, agregar y consultar"""
+        response = client.post("/datasets")
+        assert response.status_code == 201
+        dataset_id = response.json()["id"]
+
+        response = client.post(f"/datasets/{dataset_id}/append", json={"numbers": [1, 2, 3]})
+        assert response.status_code == 200
+        assert response.json() == {"id": dataset_id, "count": 3}
+
+        response = client.post(f"/datasets/{dataset_id}/append", json={"numbers": [4, 5]})
+        assert response.json()["count"] == 5
+
+        response = client.get(f"/datasets/{dataset_id}/stats")
+        assert response.status_code == 200
+        expected = client.post("/stats", json={"numbers": [1, 2, 3, 4, 5]}).json()
+        assert response.json() == expected
+
+    def test_unknown_dataset(self, client):
+        """Test: Dataset inexistente retorna 404"""
+        assert client.get("/datasets/nope/stats").status_code == 404
+        response = client.post("/datasets/nope/append", json={"numbers": [1]})
+        assert response.status_code == 404
+
+    def test_append_invalid_numbers(self, client):
+        """Test: Lote inválido retorna 422"""
+        dataset_id = client.post("/datasets").json()["id"]
+        response = client.post(f"/datasets/{dataset_id}/append", json={"numbers": None})
+        assert response.status_code == 422
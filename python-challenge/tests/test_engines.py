@@ -0,0 +1,184 @@
+import random
+import statistics
+
+import pytest
+
+import engines
+from engines import RunningStats, compute_stats, get_engine
+
+requires_numpy = pytest.mark.skipif(engines.np is None, reason="NumPy no instalado")
+
+
+def reference_stats(nums):
+    """Resultado esperado calculado con el módulo statistics"""
+    variance = statistics.variance(nums) if len(nums) > 1 else 0.0
+    return {
+        "count": len(nums),
+        "mean": round(statistics.mean(nums), 6),
+        "median": statistics.median(nums),
+        "mode": [statistics.mode(nums)],
+        "std_dev": round(variance ** 0.5, 6),
+        "variance": round(variance, 6),
+        "min": min(nums),
+        "max": max(nums),
+        "range": max(nums) - min(nums),
+        "sum": sum(nums),
+    }
+
+
+def assert_matches_reference(nums):
+    result = compute_stats(nums)
+    expected = reference_stats(nums)
+    assert result["count"] == expected["count"]
+    assert result["median"] == expected["median"]
+    assert result["mode"] == expected["mode"]
+    assert result["min"] == expected["min"]
+    assert result["max"] == expected["max"]
+    assert result["range"] == expected["range"]
+    for key in ("mean", "variance", "std_dev", "sum"):
+        assert result[key] == pytest.approx(expected[key], rel=1e-9, abs=1e-6)
+
+
+class TestComputeStats:
+    """Pruebas del motor de cálculo en un solo paso"""
+
+    @pytest.mark.parametrize("nums", [
+        [1.0, 2.0, 3.0, 4.0, 5.0],
+        [42.0],
+        [1.5, 2.3, 3.7],
+        [-5.0, -2.0, 0.0, 3.0, 8.0],
+        [7.0, 7.0, 7.0, 7.0],
+        [3.0, 1.0, 3.0, 1.0, 2.0, 2.0],
+        [1e10, 2e10, 3e10],
+        [0.0001, 0.0002, 0.0003],
+    ])
+    def test_matches_statistics_module(self, nums):
+        """Test: Mismos valores que el módulo statistics"""
+        assert_matches_reference(nums)
+
+    @pytest.mark.parametrize("distinct", [10, 1000, 100000])
+    def test_matches_statistics_module_random(self, distinct):
+        """Test: Datos aleatorios con distintas cantidades de duplicados"""
+        rng = random.Random(distinct)
+        nums = [float(rng.randrange(distinct)) for _ in range(5001)]
+        assert_matches_reference(nums)
+        assert_matches_reference(nums[:-1])
+
+    def test_empty_list(self):
+        """Test: Lista vacía retorna None en todos los campos salvo count"""
+        result = compute_stats([])
+        assert result["count"] == 0
+        assert all(value is None for key, value in result.items() if key != "count")
+
+
+class TestRunningStats:
+    """Pruebas del acumulador de momentos"""
+
+    def test_incremental_updates(self):
+        """Test: Actualizar por bloques equivale a un solo paso"""
+        rng = random.Random(1)
+        nums = [rng.uniform(-1e6, 1e6) for _ in range(2000)]
+        acc = RunningStats()
+        for i in range(0, len(nums), 300):
+            acc.update(nums[i:i + 300])
+        assert acc.count == len(nums)
+        assert acc.mean == pytest.approx(statistics.mean(nums), rel=1e-12)
+        assert acc.variance == pytest.approx(statistics.variance(nums), rel=1e-12)
+
+    def test_merge_matches_single_pass(self):
+        """Test: Combinar acumuladores equivale a un solo paso"""
+        rng = random.Random(2)
+        left = [rng.gauss(1e6, 3.0) for _ in range(700)]
+        right = [rng.gauss(-5.0, 100.0) for _ in range(300)]
+        merged = RunningStats().update(left).merge(RunningStats().update(right))
+        single = RunningStats().update(left + right)
+        assert merged.count == single.count
+        assert merged.sum == pytest.approx(single.sum, rel=1e-15)
+        assert merged.variance == pytest.approx(single.variance, rel=1e-12)
+        assert (merged.min, merged.max) == (single.min, single.max)
+
+    def test_compensated_sum(self):
+        """Test: La suma compensada no pierde términos pequeños"""
+        acc = RunningStats().update([1e16, 1.0, -1e16])
+        assert acc.sum == 1.0
+
+
+@requires_numpy
+class TestNumpyEngine:
+    """Pruebas del motor vectorizado"""
+
+    @pytest.mark.parametrize("nums", [
+        [1.0, 2.0, 3.0, 4.0, 5.0],
+        [42.0],
+        [3.0, 1.0, 3.0, 1.0, 2.0, 2.0],
+        [5.0, 9.0, 9.0, 5.0],
+        [1.5, 2.3, 3.7, -8.25],
+    ])
+    def test_matches_python_engine(self, nums):
+        """Test: Mismos resultados que el motor de Python"""
+        expected = compute_stats(nums)
+        result = engines.numpy_stats(nums)
+        assert result["median"] == expected["median"]
+        assert result["mode"] == expected["mode"]
+        for key in ("count", "mean", "variance", "std_dev", "min", "max", "range", "sum"):
+            assert result[key] == pytest.approx(expected[key])
+
+    def test_matches_python_engine_random(self):
+        """Test: Datos aleatorios grandes con duplicados"""
+        rng = random.Random(7)
+        nums = [float(rng.randrange(500)) for _ in range(20001)]
+        expected = compute_stats(nums)
+        result = engines.numpy_stats(nums)
+        assert result["median"] == expected["median"]
+        assert result["mode"] == expected["mode"]
+        assert result["variance"] == pytest.approx(expected["variance"])
+
+    def test_quantiles_match_python_engine(self):
+        """Test: Cuantiles exactos iguales en ambos motores"""
+        nums = [9.0, 1.0, 4.0, 4.0, 7.5, -3.0]
+        qs = [0, 0.1, 0.5, 0.99, 1]
+        assert engines.numpy_quantiles(nums, qs) == pytest.approx(engines.compute_quantiles(nums, qs))
+        assert engines.numpy_quantiles([], qs) == [None] * len(qs)
+
+    def test_basic_and_empty(self):
+        """Test: Estadísticas básicas y lista vacía"""
+        assert engines.numpy_basic_stats([1.0, 2.0, 6.0]) == {"mean": 3.0, "max": 6.0, "min": 1.0}
+        assert engines.numpy_stats([]) == engines.empty_stats()
+
+
+class TestEngineSelection:
+    """Pruebas de selección de motor"""
+
+    def test_explicit_engines(self):
+        """Test: Motores pedidos explícitamente"""
+        assert get_engine("python", 10 ** 6).name == "python"
+
+    @requires_numpy
+    def test_auto_uses_size_threshold(self):
+        """Test: 'auto' elige NumPy solo en listas grandes"""
+        assert get_engine("auto", engines.NUMPY_MIN_SIZE - 1).name == "python"
+        assert get_engine(None, engines.NUMPY_MIN_SIZE).name == "numpy"
+
+    def test_unknown_engine(self):
+        """Test: Motor desconocido"""
+        with pytest.raises(ValueError):
+            get_engine("fortran")
+
+    @pytest.mark.parametrize("engine", ["python", "auto",
+                                        pytest.param("numpy", marks=requires_numpy)])
+    def test_api_engine_query(self, client, engine):
+        """Test: Parámetro ?engine= en /stats y /stats/basic"""
+        response = client.post(f"/stats?engine={engine}", json={"numbers": [1, 2, 2, 5]})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["median"] == 2.0
+        assert data["mode"] == [2.0]
+
+        response = client.post(f"/stats/basic?engine={engine}", json={"numbers": [1, 2, 2, 5]})
+        assert response.status_code == 200
+        assert response.json() == {"mean": 2.5, "max": 5, "min": 1}
+
+    def test_api_invalid_engine(self, client):
+        """Test: Motor inválido retorna 422"""
+        response = client.post("/stats?engine=fortran", json={"numbers": [1, 2]})
+        assert response.status_code == 422
@@ -0,0 +1,188 @@
+import os
+import signal
+import time
+
+import pytest
+
+import app as app_module
+import executor
+from engines import compute_stats
+
+
+@pytest.fixture
+def offload_everything(monkeypatch):
+    """Fuerza el offload al pool para cualquier tamaño de lista"""
+    monkeypatch.setattr(executor, "OFFLOAD_MIN_SIZE", 1)
+
+
+class TestOffload:
+    """Pruebas del offload al pool de procesos"""
+
+    @pytest.mark.parametrize("engine", ["python",
+                                        pytest.param("numpy", marks=pytest.mark.skipif(
+                                            executor.np is None, reason="NumPy no instalado"))])
+    def test_offload_matches_inline(self, offload_everything, engine):
+        """Test: El cálculo en el pool da el mismo resultado"""
+        nums = [3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0]
+        result = executor.offload(engine, "stats", nums)
+        expected = compute_stats(nums)
+        assert result == pytest.approx(expected)
+        assert executor.pending_tasks() == 0
+
+    def test_offload_without_numpy(self, offload_everything, monkeypatch):
+        """Test: Sin NumPy la memoria compartida se lee con memoryview"""
+        monkeypatch.setattr(executor, "np", None)
+        result = executor.offload("python", "basic", [1.0, 2.0, 6.0])
+        assert result == {"mean": 3.0, "max": 6.0, "min": 1.0}
+
+    def test_small_lists_stay_inline(self, monkeypatch):
+        """Test: Por debajo del umbral no se usa el pool"""
+        monkeypatch.setattr(executor, "get_process_pool", None)
+        assert executor.offload("python", "basic", [1.0, 3.0])["mean"] == 2.0
+
+    def test_pool_busy(self, offload_everything, monkeypatch):
+        """Test: Con la cola llena se lanza PoolBusy"""
+        monkeypatch.setattr(executor, "MAX_PENDING", 0)
+        with pytest.raises(executor.PoolBusy):
+            executor.offload("python", "stats", [1.0, 2.0])
+        assert executor.pending_tasks() == 0
+
+    def test_shared_memory_error_releases_slot(self, offload_everything, monkeypatch):
+        """Test: Si no se puede crear la memoria compartida el lugar en la cola se libera"""
+        def no_space(*args, **kwargs):
+            raise OSError(28, "No space left on device")
+
+        monkeypatch.setattr(executor, "SharedMemory", no_space)
+        with pytest.raises(OSError):
+            executor.offload("python", "stats", [1.0, 2.0])
+        assert executor.pending_tasks() == 0
+
+    def test_shutdown_process_pool(self, offload_everything):
+        """Test: El pool se detiene al apagar la app y se recrea si hace falta"""
+        executor.offload("python", "basic", [1.0, 2.0])
+        pool = executor.get_process_pool()
+        executor.shutdown_process_pool()
+        assert executor._pool is None
+        assert executor.get_process_pool() is not pool
+        assert executor.offload("python", "basic", [1.0, 3.0])["mean"] == 2.0
+
+
+class TestOffloadEndpoints:
+    """Pruebas de /stats con offload"""
+
+    def test_stats_offloaded(self, client, offload_everything, monkeypatch):
+        """Test: /stats y /stats/basic responden igual desde el pool"""
+        monkeypatch.setattr(app_module, "result_cache", None)
+        response = client.post("/stats", json={"numbers": [1, 2, 3, 4, 5]})
+        assert response.status_code == 200
+        assert response.json()["variance"] == 2.5
+
+        response = client.post("/stats/basic", json={"numbers": [1, 2, 6]})
+        assert response.json() == {"mean": 3.0, "max": 6.0, "min": 1.0}
+
+    def test_dead_worker_replaced(self, client, offload_everything, monkeypatch):
+        """Test: Si muere un worker se responde 503 y el siguiente request usa un pool nuevo"""
+        monkeypatch.setattr(app_module, "result_cache", None)
+        try:
+            assert client.post("/stats", json={"numbers": [1, 2, 3]}).status_code == 200
+            pool = executor.get_process_pool()
+            for pid in list(pool._processes):
+                os.kill(pid, signal.SIGKILL)
+            deadline = time.monotonic() + 10
+            while not pool._broken:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+            response = client.post("/stats", json={"numbers": [1, 2, 3]})
+            assert response.status_code == 503
+            assert response.headers["retry-after"] == "1"
+            assert executor.pending_tasks() == 0
+
+            response = client.post("/stats", json={"numbers": [1, 2, 3, 4, 5]})
+            assert response.status_code == 200
+            assert response.json()["variance"] == 2.5
+            assert executor.get_process_pool() is not pool
+        finally:
+            executor.shutdown_process_pool()
+
+    def test_backpressure_returns_503(self, client, offload_everything, monkeypatch):
+        """Test: Cola llena responde 503 con Retry-After"""
+        monkeypatch.setattr(executor, "MAX_PENDING", 0)
+        monkeypatch.setattr(app_module, "result_cache", None)
+        response = client.post("/stats", json={"numbers": [1, 2, 3]})
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+
+        response = client.post("/stats/basic", json={"numbers": [1, 2, 3]})
+        assert response.status_code == 503
+
+
+class TestParallelMap:
+    """Pruebas del reparto de lotes entre procesos"""
+
+    def test_workers_follow_pool_size(self, monkeypatch):
+        """Test: STATS_POOL_WORKERS decide en cuántos procesos se reparte"""
+        monkeypatch.setattr(executor, "POOL_WORKERS", 3)
+        assert executor.parallel_workers(executor.PARALLEL_MIN_SIZE) == 3
+        assert executor.parallel_workers(executor.PARALLEL_MIN_SIZE - 1) == 1
+        monkeypatch.setattr(executor, "POOL_WORKERS", 1)
+        assert executor.parallel_workers(executor.PARALLEL_MIN_SIZE) == 1
+
+    def test_slot_held_until_results(self, monkeypatch):
+        """Test: El lote ocupa un lugar de la cola mientras se calcula"""
+        monkeypatch.setattr(executor, "PARALLEL_MIN_SIZE", 0)
+        monkeypatch.setattr(executor, "POOL_WORKERS", 2)
+        try:
+            assert executor.parallel_map(abs, [-1, -2, 3], 3) == [1, 2, 3]
+            assert executor.pending_tasks() == 0
+
+            monkeypatch.setattr(executor, "MAX_PENDING", 0)
+            with pytest.raises(executor.PoolBusy):
+                executor.parallel_map(abs, [-1, -2, 3], 3)
+            assert executor.pending_tasks() == 0
+            assert list(executor.parallel_map(abs, [-1], 1)) == [1]
+        finally:
+            executor.shutdown_process_pool()
+
+    @pytest.mark.parametrize("path, body", [
+        ("/stats/batch", {"series": {"a": [1, 2], "b": [3, 4]}}),
+        ("/stats/groupby", {"keys": ["a", "b", "a", "b"], "values": [1, 2, 3, 4]}),
+    ])
+    def test_backpressure_returns_503(self, client, monkeypatch, path, body):
+        """Test: /stats/batch y /stats/groupby también responden 503 con la cola llena"""
+        monkeypatch.setattr(executor, "PARALLEL_MIN_SIZE", 0)
+        monkeypatch.setattr(executor, "POOL_WORKERS", 2)
+        monkeypatch.setattr(executor, "MAX_PENDING", 0)
+        response = client.post(path, json=body)
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+
+
+class TestWarmProcessPool:
+    """Pruebas del arranque anticipado del pool"""
+
+    def test_workers_started(self):
+        """Test: Después del warm-up el pool ya tiene sus procesos"""
+        executor.shutdown_process_pool()
+        try:
+            executor.warm_process_pool()
+            assert len(executor.get_process_pool()._processes) == executor.POOL_WORKERS
+        finally:
+            executor.shutdown_process_pool()
+
+    def test_skipped_when_pool_unused(self, monkeypatch):
+        """Test: Sin offload y con un solo proceso el warm-up no crea el pool"""
+        executor.shutdown_process_pool()
+        monkeypatch.setattr(executor, "OFFLOAD_MIN_SIZE", 0)
+        monkeypatch.setattr(executor, "POOL_WORKERS", 1)
+        assert executor.warm_process_pool() is False
+        assert executor._pool is None
+
+        monkeypatch.setattr(executor, "POOL_WORKERS", 2)
+        try:
+            assert executor.warm_process_pool() is True
+            assert len(executor._pool._processes) == 2
+        finally:
+            executor.shutdown_process_pool()
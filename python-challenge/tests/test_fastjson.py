@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+import fastjson
+from fastjson import FastJSONResponse, dumps, loads
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_backend(request, monkeypatch):
+    """Ejecuta la prueba con orjson y con la librería estándar"""
+    if request.param == "orjson" and fastjson.orjson is None:
+        pytest.skip("orjson no instalado")
+    if request.param == "json":
+        monkeypatch.setattr(fastjson, "orjson", None)
+    return request.param
+
+
+class TestFastJSON:
+    """Pruebas de serialización rápida"""
+
+    def test_dumps_is_compact_json(self, json_backend):
+        """Test: JSON compacto equivalente a json.dumps"""
+        content = {"count": 2, "mean": 1.5, "mode": [1.0], "median": None, "name": "ñ"}
+        assert json.loads(dumps(content)) == content
+        assert b" " not in dumps(content)
+
+    def test_loads_rejects_invalid(self, json_backend):
+        """Test: JSON inválido lanza ValueError"""
+        assert loads(b'{"numbers": [1, 2]}') == {"numbers": [1, 2]}
+        with pytest.raises(ValueError):
+            loads(b"{invalid")
+
+    def test_response_class(self, json_backend):
+        """Test: Content-Type y body de la respuesta"""
+        response = FastJSONResponse({"mean": 3.0})
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == {"mean": 3.0}
+
+
+class TestLargeBodyDecoder:
+    """Pruebas del decodificador para bodies grandes"""
+
+    @pytest.fixture(autouse=True)
+    def always_decode_first(self, monkeypatch):
+        monkeypatch.setattr(fastjson, "ORJSON_MIN_BYTES", 0)
+
+    def test_valid_body(self, client, json_backend):
+        """Test: Mismo resultado que la validación directa"""
+        response = client.post("/stats", json={"numbers": [1, 2, 3, 4, 5]})
+        assert response.status_code == 200
+        assert response.json()["variance"] == 2.5
+
+    @pytest.mark.parametrize("body", [b"invalid json", b'{"numbers": null}', b'{"numbers": ["x"]}'])
+    def test_invalid_body(self, client, json_backend, body):
+        """Test: Errores de decodificación y validación retornan 422"""
+        response = client.post("/stats", content=body, headers={"content-type": "application/json"})
+        assert response.status_code == 422
+
+    def test_strict_mode(self, client, json_backend):
+        """Test: El modo estricto sigue rechazando strings"""
+        response = client.post("/stats?strict=true", json={"numbers": ["1"]})
+        assert response.status_code == 422
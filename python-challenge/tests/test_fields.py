@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+import engines
+from engines import NUMPY_KERNELS, PYTHON_KERNELS, STATS_FIELDS, compute_stats, parse_fields, select_stats
+
+KERNELS = [pytest.param(PYTHON_KERNELS, id="python"),
+           pytest.param(NUMPY_KERNELS, id="numpy", marks=pytest.mark.skipif(
+               engines.np is None, reason="NumPy no instalado"))]
+
+
+def counting_kernels(kernels, calls):
+    """Envuelve los kernels para registrar cuáles se ejecutan"""
+    def wrap(name, kernel):
+        def counted(resolver):
+            calls.append(name)
+            return kernel(resolver)
+        return counted
+    return {name: wrap(name, kernel) for name, kernel in kernels.items()}
+
+
+class TestSelectStats:
+    """Pruebas del cálculo por campos"""
+
+    @pytest.mark.parametrize("kernels", KERNELS)
+    @pytest.mark.parametrize("field", STATS_FIELDS)
+    def test_each_field_matches_full_stats(self, kernels, field):
+        """Test: Cada campo por separado coincide con el cálculo completo"""
+        rng = random.Random(field)
+        nums = [float(rng.randrange(-50, 50)) for _ in range(301)]
+        expected = compute_stats(nums)[field]
+        assert select_stats(nums, (field,), kernels) == {field: pytest.approx(expected)}
+
+    @pytest.mark.parametrize("kernels", KERNELS)
+    def test_only_needed_kernels_run(self, kernels):
+        """Test: Pedir la media no calcula mediana, moda ni varianza"""
+        calls = []
+        select_stats([1.0, 2.0, 3.0], ("mean", "max"), counting_kernels(kernels, calls))
+        assert not {"median", "mode", "variance", "counts", "sorted"} & set(calls)
+
+    def test_shared_dependencies_run_once(self):
+        """Test: std_dev y variance comparten el cálculo; range reutiliza min y max"""
+        calls = []
+        select_stats([1.0, 5.0, 2.0], ("std_dev", "variance", "range", "min"),
+                     counting_kernels(PYTHON_KERNELS, calls))
+        assert calls.count("variance") == 1
+        assert calls.count("min") == 1
+
+    def test_median_reuses_counts_when_mode_requested(self):
+        """Test: Con moda y mediana se usa una sola tabla de frecuencias"""
+        calls = []
+        result = select_stats([2.0, 1.0, 2.0, 3.0], ("median", "mode"),
+                              counting_kernels(PYTHON_KERNELS, calls))
+        assert result == {"median": 2.0, "mode": [2.0]}
+        assert calls.count("counts") == 1
+
+    def test_empty_list(self):
+        """Test: Lista vacía"""
+        assert select_stats([], ("count", "mean"), PYTHON_KERNELS) == {"count": 0, "mean": None}
+
+    def test_parse_fields(self):
+        """Test: Validación de la lista de campos"""
+        assert parse_fields(" mean,max , mean") == ("mean", "max")
+        with pytest.raises(ValueError):
+            parse_fields("mean,avg")
+        with pytest.raises(ValueError):
+            parse_fields(",")
+
+
+class TestFieldsEndpoint:
+    """Pruebas de /stats?fields="""
+
+    @pytest.mark.parametrize("engine", ["python", "auto"])
+    def test_only_requested_fields(self, client, engine):
+        """Test: La respuesta solo trae los campos pedidos"""
+        response = client.post(f"/stats?fields=mean,max,std_dev&engine={engine}",
+                               json={"numbers": [1, 2, 3, 4, 5]})
+
+        assert response.status_code == 200
+        assert response.json() == {"mean": 3.0, "max": 5.0, "std_dev": pytest.approx(1.581139)}
+
+    def test_all_fields_is_full_response(self, client):
+        """Test: Pedir todos los campos equivale a no filtrar"""
+        numbers = [1, 2, 2, 9]
+        full = client.post("/stats", json={"numbers": numbers}).json()
+        response = client.post(f"/stats?fields={','.join(STATS_FIELDS)}", json={"numbers": numbers})
+        assert response.json() == full
+
+    def test_empty_list_with_fields(self, client):
+        """Test: Lista vacía con campos"""
+        response = client.post("/stats?fields=count,median", json={"numbers": []})
+        assert response.json() == {"count": 0, "median": None}
+
+    def test_invalid_field(self, client):
+        """Test: Campo desconocido retorna 422"""
+        response = client.post("/stats?fields=mean,avg", json={"numbers": [1, 2]})
+        assert response.status_code == 422
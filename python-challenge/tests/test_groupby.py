@@ -0,0 +1,106 @@
+import random
+
+import pytest
+
+import executor
+from engines import ENGINES, compute_stats
+from groupby import factorize, groupby_stats
+
+ENGINE_PARAMS = [
+    "python",
+    pytest.param("numpy", marks=pytest.mark.skipif("numpy" not in ENGINES, reason="NumPy no instalado")),
+]
+
+
+def random_groups(size=3000, groups=200, seed=4):
+    rng = random.Random(seed)
+    keys = [f"g{rng.randrange(groups)}" for _ in range(size)]
+    values = [float(rng.randint(-10, 10)) for _ in range(size)]
+    return keys, values
+
+
+def expected_groups(keys, values):
+    series = {}
+    for key, value in zip(keys, values):
+        series.setdefault(str(key), []).append(value)
+    return {key: compute_stats(nums) for key, nums in series.items()}
+
+
+class TestGroupByStats:
+    """Pruebas de la agregación por clave"""
+
+    @pytest.mark.parametrize("engine", ENGINE_PARAMS)
+    def test_matches_stats_per_group(self, engine):
+        """Test: Cada grupo coincide con /stats, en orden de aparición"""
+        keys, values = random_groups()
+        result = groupby_stats(engine, keys, values)
+        expected = expected_groups(keys, values)
+        assert list(result) == list(expected)
+        assert result == expected
+
+    @pytest.mark.parametrize("engine", ENGINE_PARAMS)
+    def test_mode_ties_and_single_values(self, engine):
+        """Test: Empates de moda por primera aparición y grupos de un valor"""
+        keys = ["a", "a", "a", "a", "b", "c", "c"]
+        values = [5.0, 1.0, 1.0, 5.0, 2.0, 9.0, 8.0]
+        result = groupby_stats(engine, keys, values)
+        assert result["a"]["mode"] == [5.0]
+        assert result["a"]["median"] == 3.0
+        assert result["b"]["variance"] == 0.0
+        assert result["c"]["mode"] == [9.0]
+
+    def test_keys_compare_as_text(self):
+        """Test: 1 y "1" son el mismo grupo"""
+        codes, names = factorize([1, "1", "x", 2])
+        assert names == ["1", "x", "2"]
+        assert codes == [0, 0, 1, 2]
+
+    def test_empty_and_uneven(self):
+        """Test: Sin filas no hay grupos; largos distintos es un error"""
+        assert groupby_stats("python", [], []) == {}
+        with pytest.raises(ValueError):
+            groupby_stats("python", ["a"], [])
+
+    @pytest.mark.parametrize("engine", ENGINE_PARAMS)
+    def test_in_processes(self, engine, monkeypatch):
+        """Test: Repartido entre procesos da lo mismo"""
+        monkeypatch.setattr(executor, "PARALLEL_MIN_SIZE", 0)
+        monkeypatch.setattr(executor, "POOL_WORKERS", 2)
+        keys, values = random_groups(size=500, groups=25)
+        result = groupby_stats(engine, keys, values)
+        assert list(result) == list(expected_groups(keys, values))
+        assert result == expected_groups(keys, values)
+
+
+class TestGroupByEndpoint:
+    """Pruebas de /stats/groupby"""
+
+    def test_keys_and_values(self, client):
+        """Test: Arreglos paralelos con claves de texto y números"""
+        response = client.post("/stats/groupby", json={
+            "keys": ["a", 1, "a", 1, "b"],
+            "values": [1, 10, 3, 20, 7]
+        })
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 5
+        assert list(data["groups"]) == ["a", "1", "b"]
+        assert data["groups"]["a"]["mean"] == 2.0
+        assert data["groups"]["1"]["sum"] == 30.0
+
+    def test_rows(self, client):
+        """Test: Filas [clave, valor] dan lo mismo que los arreglos"""
+        rows = client.post("/stats/groupby", json={"rows": [["x", 1], ["y", 2], ["x", 4]]}).json()
+        arrays = client.post("/stats/groupby", json={"keys": ["x", "y", "x"], "values": [1, 2, 4]}).json()
+        assert rows == arrays
+        assert rows["groups"]["x"]["median"] == 2.5
+
+    def test_errors(self, client):
+        """Test: Formas incompletas, mezcladas o de distinto largo responden 422"""
+        for body in [
+            {"keys": ["a"]},
+            {"rows": [["a", 1]], "keys": ["a"], "values": [1]},
+            {"keys": ["a", "b"], "values": [1]},
+            {"rows": [["a", "x"]]},
+        ]:
+            assert client.post("/stats/groupby", json=body).status_code == 422
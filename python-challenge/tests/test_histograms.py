@@ -0,0 +1,150 @@
+import random
+import struct
+
+import pytest
+
+from engines import ENGINES, np
+from histograms import HISTOGRAM_METHODS, MAX_BINS, histogram, width_edges
+
+ENGINE_PARAMS = [
+    "python",
+    pytest.param("numpy", marks=pytest.mark.skipif("numpy" not in ENGINES, reason="NumPy no instalado")),
+]
+
+
+class TestHistogram:
+    """Pruebas del cálculo de histogramas"""
+
+    @pytest.mark.parametrize("engine", ENGINE_PARAMS)
+    def test_fixed_count(self, engine):
+        """Test: bins intervalos de igual ancho; el máximo cae en el último"""
+        result = histogram(engine, [0.0, 1.0, 2.0, 3.0, 4.0], "count", bins=4)
+        assert result["edges"] == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert result["counts"] == [1, 1, 1, 2]
+        assert (result["count"], result["min"], result["max"]) == (5, 0.0, 4.0)
+
+    @pytest.mark.parametrize("engine", ENGINE_PARAMS)
+    def test_fixed_width(self, engine):
+        """Test: Bordes alineados a múltiplos del ancho"""
+        result = histogram(engine, [3.0, 7.0, 12.0, 19.5], "width", width=5)
+        assert result["edges"] == [0.0, 5.0, 10.0, 15.0, 20.0]
+        assert result["counts"] == [1, 1, 1, 1]
+
+    @pytest.mark.parametrize("engine", ENGINE_PARAMS)
+    def test_quantile(self, engine):
+        """Test: Intervalos con la misma cantidad de valores"""
+        nums = [float(i) for i in range(1, 101)]
+        result = histogram(engine, nums, "quantile", bins=4)
+        assert result["counts"] == [25, 25, 25, 25]
+        assert result["edges"][0] == 1.0 and result["edges"][-1] == 100.0
+
+    @pytest.mark.parametrize("engine", ENGINE_PARAMS)
+    def test_quantile_merges_repeated_edges(self, engine):
+        """Test: Un valor muy frecuente une bordes repetidos"""
+        nums = [1.0] * 90 + [2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0]
+        result = histogram(engine, nums, "quantile", bins=10)
+        assert len(result["edges"]) == len(set(result["edges"]))
+        assert sum(result["counts"]) == 100
+
+    @pytest.mark.skipif(np is None, reason="NumPy no instalado")
+    @pytest.mark.parametrize("method", ["count", "quantile"])
+    def test_engines_match_numpy_histogram(self, method):
+        """Test: Ambos motores coinciden con np.histogram"""
+        rng = random.Random(7)
+        nums = [rng.gauss(0, 1) for _ in range(5000)]
+        python = histogram("python", nums, method, bins=20)
+        vectorized = histogram("numpy", nums, method, bins=20)
+        expected, _ = np.histogram(nums, bins=np.asarray(python["edges"]))
+        assert python["counts"] == expected.tolist()
+        assert vectorized["counts"] == expected.tolist()
+        assert python["edges"] == pytest.approx(vectorized["edges"])
+
+    @pytest.mark.skipif(np is None, reason="NumPy no instalado")
+    @pytest.mark.parametrize("method", ["count", "width"])
+    def test_values_on_edges(self, method):
+        """Test: Valores justo sobre los bordes caen en el mismo intervalo en ambos motores"""
+        rng = random.Random(11)
+        trials = [[round(i / 10, 1) for i in range(11)]]
+        trials += [[round(rng.uniform(-3, 3), 1) for _ in range(50)] for _ in range(300)]
+        for nums in trials:
+            python = histogram("python", nums, method, bins=10, width=0.1)
+            vectorized = histogram("numpy", nums, method, bins=10, width=0.1)
+            expected, _ = np.histogram(nums, bins=np.asarray(python["edges"]))
+            assert python["edges"] == vectorized["edges"]
+            assert python["counts"] == vectorized["counts"] == expected.tolist()
+
+    @pytest.mark.parametrize("engine", ENGINE_PARAMS)
+    def test_constant_and_empty(self, engine):
+        """Test: Todos iguales da un solo intervalo; vacío no tiene intervalos"""
+        assert histogram(engine, [2.0, 2.0], "count")["counts"] == [2]
+        assert histogram(engine, [2.0, 2.0], "width", width=1)["counts"] == [2]
+        empty = histogram(engine, [], "count")
+        assert (empty["count"], empty["edges"], empty["counts"]) == (0, [], [])
+
+    @pytest.mark.parametrize("engine", ENGINE_PARAMS)
+    def test_extreme_ranges(self, engine):
+        """Test: Cocientes o rangos que no caben en float64 dan ValueError, no OverflowError"""
+        with pytest.raises(ValueError, match="intervalos"):
+            histogram(engine, [1e10, 2e10], "width", width=1e-300)
+        with pytest.raises(ValueError, match="intervalos"):
+            histogram(engine, [1e300, 1e300], "width", width=1e-10)
+        for method in HISTOGRAM_METHODS:
+            with pytest.raises(ValueError, match="float64"):
+                histogram(engine, [-1e308, 1e308], method, bins=2, width=1e308)
+
+    def test_invalid_arguments(self):
+        """Test: Parámetros inválidos"""
+        with pytest.raises(ValueError):
+            histogram("python", [1.0], "width")
+        with pytest.raises(ValueError):
+            histogram("python", [1.0], "log")
+        with pytest.raises(ValueError):
+            histogram("python", [1.0], "count", bins=0)
+        with pytest.raises(ValueError):
+            width_edges(0.0, 1e9, 1.0)
+        assert len(width_edges(0.0, MAX_BINS - 0.5, 1.0)) == MAX_BINS + 1
+
+
+class TestHistogramEndpoint:
+    """Pruebas de /stats/histogram"""
+
+    def test_default_bins(self, client):
+        """Test: 10 intervalos de igual ancho por defecto"""
+        response = client.post("/stats/histogram", json={"numbers": list(range(101))})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["method"] == "count"
+        assert len(data["edges"]) == 11
+        assert sum(data["counts"]) == 101
+        assert (data["min"], data["max"]) == (0.0, 100.0)
+
+    def test_binary_body(self, client):
+        """Test: Body float64 con ancho fijo"""
+        body = struct.pack("<4d", 0.5, 1.5, 1.7, 2.5)
+        response = client.post(
+            "/stats/histogram?method=width&width=1",
+            content=body,
+            headers={"Content-Type": "application/octet-stream"}
+        )
+        assert response.json()["counts"] == [1, 2, 1]
+
+    def test_width_required(self, client):
+        """Test: method=width sin width responde 422"""
+        response = client.post("/stats/histogram?method=width", json={"numbers": [1, 2]})
+        assert response.status_code == 422
+
+    @pytest.mark.parametrize("query, numbers", [
+        ("method=width&width=1e-300", [1e10, 2e10]),
+        ("method=width&width=1e308", [-1e308, 1e308]),
+        ("method=count", [-1e308, 1e308]),
+    ])
+    def test_extreme_ranges(self, client, query, numbers):
+        """Test: Rangos que desbordan float64 responden 422 con un mensaje claro"""
+        response = client.post(f"/stats/histogram?{query}", json={"numbers": numbers})
+        assert response.status_code == 422
+        assert "NaN" not in response.json()["detail"]
+
+    def test_too_many_bins(self, client):
+        """Test: bins por encima del máximo responde 422"""
+        response = client.post(f"/stats/histogram?bins={MAX_BINS + 1}", json={"numbers": [1, 2]})
+        assert response.status_code == 422
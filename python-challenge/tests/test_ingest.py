@@ -0,0 +1,116 @@
+import io
+import struct
+
+import pytest
+
+import ingest
+from ingest import parse_float64, parse_npy
+
+requires_numpy = pytest.mark.skipif(ingest.np is None, reason="NumPy no instalado")
+
+OCTET = {"content-type": "application/octet-stream"}
+NPY = {"content-type": "application/x-npy"}
+
+
+def float64_body(nums):
+    return struct.pack(f"<{len(nums)}d", *nums)
+
+
+class TestParseBinary:
+    """Pruebas de lectura de buffers binarios"""
+
+    def test_parse_float64(self):
+        """Test: float64 little-endian"""
+        assert list(parse_float64(float64_body([1.5, -2.0, 3.25]))) == [1.5, -2.0, 3.25]
+
+    def test_parse_float64_without_numpy(self, monkeypatch):
+        """Test: Sin NumPy se usa un memoryview sobre el mismo buffer"""
+        monkeypatch.setattr(ingest, "np", None)
+        values = parse_float64(float64_body([1.0, 2.0]))
+        assert list(values) == [1.0, 2.0]
+
+    def test_ensure_finite_without_numpy(self, monkeypatch):
+        """Test: Chequeo de finitud sobre un memoryview"""
+        monkeypatch.setattr(ingest, "np", None)
+        values = parse_float64(float64_body([1.0, float("-inf")]))
+        with pytest.raises(ValueError):
+            ingest.ensure_finite(values)
+
+    def test_parse_float64_bad_length(self):
+        """Test: Longitud que no es múltiplo de 8"""
+        with pytest.raises(ValueError):
+            parse_float64(b"\x00" * 12)
+
+    @requires_numpy
+    def test_parse_npy(self):
+        """Test: Archivo .npy con enteros se convierte a float64"""
+        np = ingest.np
+        buffer = io.BytesIO()
+        np.save(buffer, np.array([3, 1, 2], dtype=np.int32))
+        values = parse_npy(buffer.getvalue())
+        assert values.dtype == np.float64
+        assert values.tolist() == [3.0, 1.0, 2.0]
+
+    @requires_numpy
+    def test_parse_npy_rejects_2d(self):
+        """Test: Arreglos de más de una dimensión"""
+        np = ingest.np
+        buffer = io.BytesIO()
+        np.save(buffer, np.zeros((2, 2)))
+        with pytest.raises(ValueError):
+            parse_npy(buffer.getvalue())
+
+
+class TestBinaryEndpoints:
+    """Pruebas de /stats y /stats/basic con cuerpos binarios"""
+
+    @pytest.mark.parametrize("engine", ["auto", "python"])
+    def test_stats_octet_stream(self, client, engine):
+        """Test: /stats con float64 crudos"""
+        body = float64_body([1, 2, 2, 5])
+        response = client.post(f"/stats?engine={engine}", content=body, headers=OCTET)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 4
+        assert data["mean"] == 2.5
+        assert data["median"] == 2.0
+        assert data["mode"] == [2.0]
+        assert data["variance"] == 3.0
+
+    def test_basic_octet_stream(self, client):
+        """Test: /stats/basic con float64 crudos"""
+        response = client.post("/stats/basic", content=float64_body([1, 2, 6]), headers=OCTET)
+
+        assert response.status_code == 200
+        assert response.json() == {"mean": 3.0, "max": 6.0, "min": 1.0}
+
+    def test_empty_octet_stream(self, client):
+        """Test: Body binario vacío equivale a lista vacía"""
+        response = client.post("/stats", content=b"", headers=OCTET)
+
+        assert response.status_code == 200
+        assert response.json()["count"] == 0
+
+    def test_invalid_octet_stream(self, client):
+        """Test: Body binario truncado retorna 422"""
+        response = client.post("/stats", content=b"\x00" * 9, headers=OCTET)
+
+        assert response.status_code == 422
+
+    def test_non_finite_octet_stream(self, client):
+        """Test: NaN o infinitos en el buffer retornan 422"""
+        for bad in (float("nan"), float("inf")):
+            response = client.post("/stats", content=float64_body([1, bad]), headers=OCTET)
+            assert response.status_code == 422
+
+    @requires_numpy
+    def test_stats_npy(self, client):
+        """Test: /stats con un archivo .npy"""
+        np = ingest.np
+        buffer = io.BytesIO()
+        np.save(buffer, np.array([1.0, 2.0, 3.0]))
+        response = client.post("/stats", content=buffer.getvalue(), headers=NPY)
+
+        assert response.status_code == 200
+        assert response.json()["mean"] == 2.0
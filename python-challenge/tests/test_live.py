@@ -0,0 +1,127 @@
+import asyncio
+import random
+import struct
+from array import array
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from engines import compute_stats
+import live
+from live import LIVE_FIELDS, LIVE_THREAD_MIN_BYTES, LiveStats, parse_live_message
+from sketches import KLL_RANK_ERROR
+
+
+class TestLiveStats:
+    """Pruebas de los acumuladores por conexión"""
+
+    def test_snapshot_matches_stats(self):
+        """Test: Tras varios lotes coincide con /stats sobre todos los valores"""
+        rng = random.Random(5)
+        batches = [[rng.uniform(-100, 100) for _ in range(rng.randint(1, 50))] for _ in range(20)]
+        live = LiveStats()
+        for batch in batches:
+            live.update(batch)
+        expected = compute_stats([x for batch in batches for x in batch])
+        snapshot = live.snapshot()
+        assert set(snapshot) == set(LIVE_FIELDS)
+        for name in ("count", "mean", "variance", "std_dev", "min", "max"):
+            assert snapshot[name] == pytest.approx(expected[name])
+
+    def test_approximate_median(self):
+        """Test: La mediana del sketch tiene error de rango acotado"""
+        live = LiveStats(median=True)
+        nums = [float(i) for i in range(10_000)]
+        random.Random(1).shuffle(nums)
+        for i in range(0, len(nums), 100):
+            live.update(nums[i:i + 100])
+        assert abs(live.snapshot()["median"] - 5000) <= 2 * KLL_RANK_ERROR * 10_000
+
+    def test_parse_messages(self):
+        """Test: Número, arreglo, objeto y float64 binario"""
+        assert parse_live_message({"text": "2.5"}) == [2.5]
+        assert parse_live_message({"text": "[1, 2]"}) == [1.0, 2.0]
+        assert parse_live_message({"text": '{"numbers": [3]}'}) == [3.0]
+        assert list(parse_live_message({"bytes": struct.pack("<2d", 1, 2)})) == [1.0, 2.0]
+        for text in ["[1, true]", '{"values": [1]}', '"a"', "[1,", "[1, NaN]"]:
+            with pytest.raises(ValueError):
+                parse_live_message({"text": text})
+        with pytest.raises(ValueError):
+            parse_live_message({"bytes": b"\x00" * 7})
+
+
+class TestLiveEndpoint:
+    """Pruebas de /stats/live"""
+
+    def test_every_message(self, client):
+        """Test: Con interval=0 cada mensaje responde el acumulado"""
+        with client.websocket_connect("/stats/live?interval=0") as ws:
+            ws.send_json([1, 2, 3])
+            assert ws.receive_json()["count"] == 3
+            ws.send_json({"numbers": [4, 5]})
+            data = ws.receive_json()
+        assert (data["count"], data["mean"], data["min"], data["max"]) == (5, 3.0, 1.0, 5.0)
+        assert data["variance"] == 2.5
+        assert "median" not in data
+
+    def test_throttled_updates(self, client):
+        """Test: Los mensajes dentro del intervalo salen en una sola actualización"""
+        with client.websocket_connect("/stats/live?interval=0.2&median=true") as ws:
+            ws.send_json(1)
+            assert ws.receive_json()["count"] == 1
+            for x in range(2, 6):
+                ws.send_json(x)
+            data = ws.receive_json()
+        assert data["count"] == 5
+        assert data["median"] == 3.0
+
+    def test_binary_messages(self, client):
+        """Test: Mensajes float64 binarios"""
+        with client.websocket_connect("/stats/live?interval=0") as ws:
+            ws.send_bytes(struct.pack("<3d", 1.5, 2.5, 3.5))
+            data = ws.receive_json()
+        assert (data["count"], data["sum"]) == (3, 7.5)
+
+    def test_large_frame_off_event_loop(self, client, monkeypatch):
+        """Test: Un frame grande se acumula en un hilo y respeta el orden de los mensajes"""
+        on_loop = []
+        ingest = LiveStats.ingest
+
+        def recording_ingest(self, message):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return ingest(self, message)
+
+        monkeypatch.setattr(live.LiveStats, "ingest", recording_ingest)
+        values = [float(i % 1000) for i in range(LIVE_THREAD_MIN_BYTES // 8 * 4)]
+        with client.websocket_connect("/stats/live?interval=0&median=true") as ws:
+            ws.send_json([5000])
+            ws.receive_json()
+            ws.send_bytes(array("d", values).tobytes())
+            data = ws.receive_json()
+            ws.send_bytes(b"\x00" * (LIVE_THREAD_MIN_BYTES + 1))
+            assert "error" in ws.receive_json()
+        assert on_loop == [True, False, False]
+        assert data["count"] == len(values) + 1
+        assert (data["min"], data["max"]) == (0.0, 5000.0)
+        assert data["sum"] == sum(values) + 5000
+        assert abs(data["median"] - 500) <= 1000 * KLL_RANK_ERROR * 2
+
+    def test_invalid_message_keeps_connection(self, client):
+        """Test: Un mensaje inválido responde error sin cerrar ni alterar el acumulado"""
+        with client.websocket_connect("/stats/live?interval=0") as ws:
+            ws.send_json([1, 2])
+            ws.receive_json()
+            ws.send_text("[1, \"x\"]")
+            assert "error" in ws.receive_json()
+            ws.send_json(3)
+            assert ws.receive_json()["count"] == 3
+
+    def test_invalid_interval(self, client):
+        """Test: interval fuera de rango cierra la conexión"""
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect("/stats/live?interval=-1") as ws:
+                ws.receive_json()
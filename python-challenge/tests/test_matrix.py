@@ -0,0 +1,158 @@
+import io
+import random
+import struct
+
+import pytest
+
+from engines import ENGINES, compute_stats, np, numpy_stats
+from ingest import parse_matrix
+from matrix import matrix_stats
+
+ENGINE_PARAMS = [
+    "python",
+    pytest.param("numpy", marks=pytest.mark.skipif("numpy" not in ENGINES, reason="NumPy no instalado")),
+]
+
+
+def random_columns(cols=4, rows=50, seed=3):
+    rng = random.Random(seed)
+    return [[float(rng.randint(-20, 20)) for _ in range(rows)] for _ in range(cols)]
+
+
+class TestMatrixStats:
+    """Pruebas del cálculo por columnas"""
+
+    @pytest.mark.parametrize("engine", ENGINE_PARAMS)
+    def test_columns_match_stats(self, engine):
+        """Test: Cada columna coincide con /stats sobre esa columna"""
+        columns = random_columns()
+        result = matrix_stats(engine, columns)
+        single = numpy_stats if engine == "numpy" else compute_stats
+        assert result["columns"] == [single(column) for column in columns]
+
+    @pytest.mark.skipif(np is None, reason="NumPy no instalado")
+    @pytest.mark.parametrize("engine", ENGINE_PARAMS)
+    def test_covariance_and_correlation(self, engine):
+        """Test: Coinciden con np.cov y np.corrcoef"""
+        columns = random_columns()
+        result = matrix_stats(engine, columns)
+        assert np.allclose(result["covariance"], np.cov(columns), atol=1e-6)
+        assert np.allclose(result["correlation"], np.corrcoef(columns), atol=1e-6)
+        assert result["covariance"][1][1] == result["columns"][1]["variance"]
+
+    @pytest.mark.parametrize("engine", ENGINE_PARAMS)
+    def test_perfect_and_constant_columns(self, engine):
+        """Test: Correlación 1 y -1, y None con columnas constantes"""
+        columns = [[1.0, 2.0, 3.0], [2.0, 4.0, 6.0], [3.0, 2.0, 1.0], [5.0, 5.0, 5.0]]
+        correlation = matrix_stats(engine, columns)["correlation"]
+        assert correlation[0][1] == 1.0
+        assert correlation[0][2] == -1.0
+        assert correlation[0][3] is None and correlation[3][3] is None
+
+    @pytest.mark.parametrize("engine", ENGINE_PARAMS)
+    def test_small_matrices(self, engine):
+        """Test: Una fila da covarianza 0; sin filas todo es None"""
+        one_row = matrix_stats(engine, [[1.0], [2.0]])
+        assert one_row["covariance"] == [[0.0, 0.0], [0.0, 0.0]]
+        assert one_row["correlation"] == [[None, None], [None, None]]
+        empty = matrix_stats(engine, [[], []])
+        assert empty["columns"][0]["count"] == 0
+        assert empty["covariance"] == [[None, None], [None, None]]
+
+    def test_uneven_columns(self):
+        """Test: Columnas de distinto largo"""
+        with pytest.raises(ValueError):
+            matrix_stats("python", [[1.0, 2.0], [1.0]])
+
+
+class TestParseMatrix:
+    """Pruebas de la lectura binaria de matrices"""
+
+    def test_float64_by_columns(self):
+        """Test: float64 por columnas con X-Matrix-Shape"""
+        body = struct.pack("<6d", 1, 2, 3, 10, 20, 30)
+        columns = parse_matrix(body, "application/octet-stream", "3,2")
+        assert [list(column) for column in columns] == [[1.0, 2.0, 3.0], [10.0, 20.0, 30.0]]
+
+    def test_shape_errors(self):
+        """Test: Forma ausente o que no coincide con el body"""
+        body = struct.pack("<4d", 1, 2, 3, 4)
+        with pytest.raises(ValueError):
+            parse_matrix(body, "application/octet-stream", None)
+        with pytest.raises(ValueError):
+            parse_matrix(body, "application/octet-stream", "3,2")
+        with pytest.raises(ValueError):
+            parse_matrix(struct.pack("<2d", 1, float("nan")), "application/octet-stream", "2,1")
+
+    @pytest.mark.skipif(np is None, reason="NumPy no instalado")
+    @pytest.mark.parametrize("order", ["C", "F"])
+    def test_npy_any_order(self, order):
+        """Test: .npy 2-D (filas, columnas) en orden C o Fortran"""
+        arr = np.array([[1, 10], [2, 20], [3, 30]], dtype=np.int32, order=order)
+        buffer = io.BytesIO()
+        np.save(buffer, arr)
+        columns = parse_matrix(buffer.getvalue(), "application/x-npy", None)
+        assert columns.tolist() == [[1.0, 2.0, 3.0], [10.0, 20.0, 30.0]]
+
+
+    @pytest.mark.skipif(np is None, reason="NumPy no instalado")
+    def test_npy_without_columns(self):
+        """Test: .npy sin columnas es un error, como en X-Matrix-Shape"""
+        buffer = io.BytesIO()
+        np.save(buffer, np.zeros((3, 0)))
+        with pytest.raises(ValueError):
+            parse_matrix(buffer.getvalue(), "application/x-npy", None)
+
+
+class TestMatrixEndpoint:
+    """Pruebas de /stats/matrix"""
+
+    def test_json(self, client):
+        """Test: Columnas en JSON con nombres"""
+        response = client.post("/stats/matrix", json={
+            "columns": [[1, 2, 3, 4], [2, 4, 6, 8.5]],
+            "names": ["x", "y"]
+        })
+        assert response.status_code == 200
+        data = response.json()
+        assert data["rows"] == 4
+        assert data["names"] == ["x", "y"]
+        assert data["columns"][0]["mean"] == 2.5
+        assert data["columns"][1]["max"] == 8.5
+        assert data["covariance"][0][0] == data["columns"][0]["variance"]
+        assert data["correlation"][0][0] == 1.0
+
+    def test_binary(self, client):
+        """Test: Body float64 con forma y nombres en cabeceras"""
+        body = struct.pack("<6d", 1, 2, 3, 3, 2, 1)
+        response = client.post("/stats/matrix", content=body, headers={
+            "Content-Type": "application/octet-stream",
+            "X-Matrix-Shape": "3,2",
+            "X-Matrix-Names": "up, down"
+        })
+        assert response.status_code == 200
+        data = response.json()
+        assert data["names"] == ["up", "down"]
+        assert data["correlation"][0][1] == -1.0
+
+    def test_default_names(self, client):
+        """Test: Sin nombres se usan los índices"""
+        data = client.post("/stats/matrix", json={"columns": [[1, 2], [3, 4], [5, 6]]}).json()
+        assert data["names"] == ["0", "1", "2"]
+
+    def test_errors(self, client):
+        """Test: Columnas desparejas, nombres de más, sin columnas (JSON o .npy) o NaN responden 422"""
+        assert client.post("/stats/matrix", json={"columns": [[1, 2], [1]]}).status_code == 422
+        assert client.post("/stats/matrix", json={
+            "columns": [[1, 2]], "names": ["a", "b"]
+        }).status_code == 422
+        assert client.post("/stats/matrix", json={"columns": []}).status_code == 422
+        if np is not None:
+            buffer = io.BytesIO()
+            np.save(buffer, np.zeros((3, 0)))
+            response = client.post("/stats/matrix", content=buffer.getvalue(),
+                                   headers={"Content-Type": "application/x-npy"})
+            assert response.status_code == 422
+        response = client.post("/stats/matrix", content=b'{"columns": [[1, NaN]]}',
+                               headers={"Content-Type": "application/json"})
+        assert response.status_code == 422
@@ -0,0 +1,142 @@
+import struct
+
+import pytest
+
+import app as app_module
+import executor
+import metrics
+from engines import compute_stats, numpy_stats, np
+from metrics import Histogram, size_bucket, stage_timer
+
+
+@pytest.fixture
+def fresh_metrics(monkeypatch):
+    """Histogramas vacíos y sin caché, para que cada request calcule"""
+    metrics.STAGE_SECONDS.clear()
+    monkeypatch.setattr(app_module, "result_cache", None)
+    yield metrics.STAGE_SECONDS
+    metrics.STAGE_SECONDS.clear()
+
+
+def observed_stages(histogram, endpoint):
+    return {labels[0] for labels in histogram.snapshot() if labels[1] == endpoint}
+
+
+class TestHistogram:
+    """Pruebas del histograma y del formato de Prometheus"""
+
+    def test_size_bucket(self):
+        """Test: Etiquetas de tamaño del payload"""
+        assert size_bucket(0) == "0"
+        assert size_bucket(5) == "<=100"
+        assert size_bucket(10_000) == "<=10k"
+        assert size_bucket(500_000) == "<=1M"
+        assert size_bucket(2_000_000) == ">1M"
+
+    def test_render_is_cumulative(self):
+        """Test: Los buckets se exponen acumulados con _sum y _count"""
+        histogram = Histogram("demo_seconds", "Demo", ("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(("compute",), value)
+        text = "\n".join(histogram.render())
+        assert '# TYPE demo_seconds histogram' in text
+        assert 'demo_seconds_bucket{stage="compute",le="0.1"} 1' in text
+        assert 'demo_seconds_bucket{stage="compute",le="1.0"} 3' in text
+        assert 'demo_seconds_bucket{stage="compute",le="+Inf"} 4' in text
+        assert 'demo_seconds_count{stage="compute"} 4' in text
+        assert 'demo_seconds_sum{stage="compute"} 4.25' in text
+
+    def test_stage_timer(self):
+        """Test: stage_timer acumula por etapa y no hace nada sin diccionario"""
+        timings = {}
+        with stage_timer(timings, "a"):
+            pass
+        with stage_timer(timings, "a"):
+            pass
+        assert list(timings) == ["a"] and timings["a"] >= 0
+        with stage_timer(None, "a"):
+            pass
+
+    def test_disabled(self, fresh_metrics, monkeypatch):
+        """Test: Con STATS_METRICS=0 no se registra nada"""
+        monkeypatch.setattr(metrics, "ENABLED", False)
+        metrics.observe_stage("compute", "/stats", 3, 0.1)
+        metrics.observe_stages({"compute": 0.1}, "/stats", 3)
+        assert fresh_metrics.snapshot() == {}
+
+
+class TestEngineTimings:
+    """Pruebas del desglose por paso en los motores"""
+
+    def test_python_steps(self):
+        """Test: El motor de Python anota momentos, frecuencias, mediana y moda"""
+        timings = {}
+        stats = compute_stats([1.0, 2.0, 2.0, 5.0], timings)
+        assert set(timings) == {"moments", "frequencies", "median", "mode"}
+        assert stats == compute_stats([1.0, 2.0, 2.0, 5.0])
+
+    @pytest.mark.skipif(np is None, reason="NumPy no instalado")
+    def test_numpy_steps(self):
+        """Test: El motor de NumPy anota orden, mediana, moda y momentos"""
+        timings = {}
+        numpy_stats([1.0, 2.0, 2.0, 5.0], timings)
+        assert set(timings) == {"sort", "median", "mode", "moments"}
+
+    def test_offloaded_steps(self, monkeypatch):
+        """Test: Los tiempos vuelven desde el pool de procesos"""
+        monkeypatch.setattr(executor, "OFFLOAD_MIN_SIZE", 1)
+        timings = {}
+        executor.offload("python", "stats", [1.0, 2.0, 3.0], timings=timings)
+        assert set(timings) == {"moments", "frequencies", "median", "mode"}
+
+
+class TestMetricsEndpoints:
+    """Pruebas de /metrics y /health"""
+
+    def test_stats_stages(self, client, fresh_metrics):
+        """Test: /stats registra cada etapa con endpoint y tamaño"""
+        response = client.post("/stats?engine=python", json={"numbers": [1, 2, 3]})
+        assert response.status_code == 200
+        stages = observed_stages(fresh_metrics, "/stats")
+        assert {
+            "body_read", "json_decode_validation", "compute", "serialization",
+            "stat.moments", "stat.frequencies", "stat.median", "stat.mode",
+        } <= stages
+        assert all(labels[2] == "<=100" for labels in fresh_metrics.snapshot())
+
+    def test_selected_fields_stages(self, client, fresh_metrics):
+        """Test: Con ?fields= se registra cada campo calculado"""
+        client.post("/stats?fields=mean,max", json={"numbers": [1, 2, 3]})
+        stages = observed_stages(fresh_metrics, "/stats")
+        assert {"stat.mean", "stat.max"} <= stages
+        assert "stat.median" not in stages
+
+    def test_binary_and_basic_stages(self, client, fresh_metrics):
+        """Test: Bodies binarios y /stats/basic"""
+        body = struct.pack("<3d", 1.0, 2.0, 6.0)
+        client.post("/stats/basic", content=body, headers={"Content-Type": "application/octet-stream"})
+        stages = observed_stages(fresh_metrics, "/stats/basic")
+        assert {"body_read", "binary_parse", "compute", "serialization"} <= stages
+
+    def test_metrics_endpoint(self, client, fresh_metrics):
+        """Test: /metrics expone histogramas y gauges en texto de Prometheus"""
+        client.post("/stats", json={"numbers": [1, 2, 3]})
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert '# TYPE stats_stage_seconds histogram' in text
+        assert 'stats_stage_seconds_count{stage="serialization",endpoint="/stats",size="<=100"} 1' in text
+        assert "stats_requests_in_flight 1" in text
+        assert "# TYPE stats_threadpool_busy gauge" in text
+        assert "stats_process_pool_pending 0" in text
+
+    def test_health_reports_load(self, client):
+        """Test: /health informa requests en curso y ocupación del threadpool"""
+        data = client.get("/health").json()
+        assert data["status"] == "healthy"
+        assert data["in_flight"] == 1
+        assert data["threadpool"]["size"] > 0
+        assert 0 <= data["threadpool"]["saturation"] <= 1
+        assert data["process_pool"]["pending"] == 0
+        assert data["dependencies"]["fastapi"]
@@ -0,0 +1,167 @@
+import gzip
+import json
+import os
+import random
+import struct
+import subprocess
+import sys
+from math import inf
+
+import pytest
+
+import outofcore
+from engines import compute_stats, np
+from ingest import PayloadTooLarge
+from outofcore import Spool, file_stats, main
+
+pytestmark = pytest.mark.skipif(np is None, reason="NumPy no instalado")
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    """Bloques y particiones chicos para recorrer todas las pasadas con pocos datos"""
+    monkeypatch.setattr(outofcore, "CHUNK_VALUES", 64)
+    monkeypatch.setattr(outofcore, "PARTITION_VALUES", 100)
+
+
+def write_float64(path, nums):
+    path.write_bytes(struct.pack(f"<{len(nums)}d", *nums))
+    return str(path)
+
+
+class TestFileStats:
+    """Pruebas del cálculo fuera de memoria"""
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_stats(self, tmp_path, small_blocks, seed):
+        """Test: Coincide con /stats con varias particiones y recursión"""
+        rng = random.Random(seed)
+        nums = [float(rng.randint(-50, 50)) for _ in range(2001 + seed)]
+        nums += [7.0] * 300  # una partición que no entra y es constante
+        rng.shuffle(nums)
+        assert file_stats(write_float64(tmp_path / "data.f64", nums)) == compute_stats(nums)
+
+    def test_mode_ties_and_distinct(self, tmp_path, small_blocks):
+        """Test: La moda desempata por el primero que aparece, como statistics.mode"""
+        nums = [float(i) for i in range(500)] + [400.0, 3.0, 3.0, 400.0]
+        assert file_stats(write_float64(tmp_path / "ties.f64", nums))["mode"] == [3.0]
+        distinct = [float(i) for i in range(500, 0, -1)]
+        assert file_stats(write_float64(tmp_path / "distinct.f64", distinct))["mode"] == [500.0]
+
+    @pytest.mark.filterwarnings("ignore:overflow")
+    def test_extreme_values(self, tmp_path, small_blocks):
+        """Test: Extremos enormes y valores casi iguales"""
+        nums = [-1.7e308, 1.7e308] + [1.0 + i * 2.2e-16 for i in range(300)]
+        stats = file_stats(write_float64(tmp_path / "extreme.f64", nums))
+        assert stats["median"] == compute_stats(nums)["median"]
+        assert (stats["min"], stats["max"]) == (-1.7e308, 1.7e308)
+
+    def test_empty_and_partial(self, tmp_path):
+        """Test: Archivo vacío y tamaño que no es múltiplo de 8"""
+        empty = tmp_path / "empty.f64"
+        empty.write_bytes(b"")
+        assert file_stats(str(empty))["count"] == 0
+        partial = tmp_path / "partial.f64"
+        partial.write_bytes(b"\0" * 12)
+        with pytest.raises(ValueError):
+            file_stats(str(partial))
+
+
+class TestSpool:
+    """Pruebas del volcado del upload"""
+
+    def test_binary_unaligned_chunks(self, tmp_path):
+        """Test: Bloques que cortan un float64 a la mitad"""
+        body = struct.pack("<3d", 1.5, 2.5, 3.5)
+        with Spool(str(tmp_path / "up.f64")) as spool:
+            for start in range(0, len(body), 5):
+                spool.write(body[start:start + 5])
+            spool.close()
+        assert file_stats(spool.path)["sum"] == 7.5
+
+    def test_csv_split_numbers(self, tmp_path):
+        """Test: Un número partido entre bloques y separadores mezclados"""
+        with Spool(str(tmp_path / "up.f64"), csv=True) as spool:
+            for part in [b"1,2", b"5\n3 4\r\n", b"1e", b"1\t-2"]:
+                spool.write(part)
+            spool.close()
+        assert list(np.fromfile(spool.path)) == [1.0, 25.0, 3.0, 4.0, 10.0, -2.0]
+
+    def test_errors(self, tmp_path):
+        """Test: CSV no numérico, NaN, float64 incompleto y tope de bytes"""
+        for data, csv in [(b"value\n1\n", True), (b"1,nan\n", True), (b"\0" * 9, False)]:
+            with pytest.raises(ValueError):
+                with Spool(str(tmp_path / "up.f64"), csv=csv) as spool:
+                    spool.write(data)
+                    spool.close()
+        with pytest.raises(PayloadTooLarge):
+            with Spool(str(tmp_path / "up.f64"), max_bytes=16) as spool:
+                spool.write(b"\0" * 24)
+
+
+class TestFileEndpoint:
+    """Pruebas de /stats/file"""
+
+    def test_binary(self, client, sample_numbers):
+        """Test: float64 da lo mismo que /stats"""
+        body = struct.pack(f"<{len(sample_numbers)}d", *sample_numbers)
+        response = client.post("/stats/file", content=body, headers={"Content-Type": "application/octet-stream"})
+        assert response.status_code == 200
+        assert response.json() == client.post("/stats", json={"numbers": sample_numbers}).json()
+
+    def test_gzip_csv(self, client):
+        """Test: CSV comprimido con gzip"""
+        body = gzip.compress(b"".join(b"%d,%d\n" % (i, i) for i in range(1000)))
+        response = client.post("/stats/file", content=body, headers={
+            "Content-Type": "text/csv", "Content-Encoding": "gzip"
+        })
+        data = response.json()
+        assert (data["count"], data["median"], data["mode"]) == (2000, 499.5, [0.0])
+
+    def test_errors(self, client, monkeypatch):
+        """Test: 415 por Content-Type, 422 por CSV inválido y 413 por tope"""
+        assert client.post("/stats/file", json={"numbers": [1]}).status_code == 415
+        headers = {"Content-Type": "text/csv"}
+        assert client.post("/stats/file", content=b"1,x\n", headers=headers).status_code == 422
+        monkeypatch.setattr(outofcore, "SPOOL_MAX_BYTES", 4)
+        assert client.post("/stats/file", content=b"1,2,3\n", headers=headers).status_code == 413
+
+
+    def test_gzip_bomb(self, client, monkeypatch):
+        """Test: El tope del spool cuenta bytes descomprimidos y corta antes de volcarlos"""
+        monkeypatch.setattr(outofcore, "SPOOL_MAX_BYTES", 1 << 20)
+        written = []
+        monkeypatch.setattr(Spool, "write", lambda self, data: written.append(len(data)))
+        body = gzip.compress(b"\0" * (64 << 20))
+        assert len(body) < 100_000
+        response = client.post("/stats/file", content=body, headers={
+            "Content-Type": "application/octet-stream", "Content-Encoding": "gzip"
+        })
+        assert response.status_code == 413
+        assert sum(written) <= 1 << 20
+
+    def test_default_cap_is_finite(self):
+        """Test: Sin STATS_SPOOL_MAX_BYTES el spool tiene tope"""
+        env = dict(os.environ)
+        env.pop("STATS_SPOOL_MAX_BYTES", None)
+        code = "import outofcore; print(outofcore.SPOOL_MAX_BYTES)"
+        output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True,
+                                check=True, cwd=os.path.dirname(outofcore.__file__)).stdout
+        assert 0 < int(output) < inf
+
+
+class TestCli:
+    """Pruebas de python -m outofcore"""
+
+    def test_csv(self, tmp_path, capsys):
+        """Test: Imprime las estadísticas en JSON"""
+        path = tmp_path / "data.csv"
+        path.write_text("1\n2\n2\n10\n")
+        assert main(["--csv", str(path)]) == 0
+        stats = json.loads(capsys.readouterr().out)
+        assert stats == compute_stats([1.0, 2.0, 2.0, 10.0])
+
+    def test_missing_file(self, tmp_path, capsys):
+        """Test: Un archivo que no existe termina con código 1"""
+        assert main([str(tmp_path / "missing.f64")]) == 1
+        assert "error" in capsys.readouterr().err
@@ -0,0 +1,121 @@
+import json
+import random
+import struct
+
+import pytest
+
+from engines import compute_stats
+from rolling import ROLLING_COLUMNS, iter_rolling, rolling_float64
+
+
+def brute_force(nums, window, step):
+    """Cada ventana calculada por separado con compute_stats"""
+    return [compute_stats(nums[start:start + window])
+            for start in range(0, len(nums) - window + 1, step)]
+
+
+class TestIterRolling:
+    """Pruebas del cálculo por ventana deslizante"""
+
+    @pytest.mark.parametrize("window,step", [(1, 1), (3, 1), (5, 2), (7, 7), (10, 3), (50, 1)])
+    def test_matches_stats_per_window(self, window, step):
+        """Test: Cada ventana coincide con /stats sobre esa ventana"""
+        rng = random.Random(window * 31 + step)
+        nums = [float(rng.randint(-50, 50)) for _ in range(120)]
+        expected = brute_force(nums, window, step)
+        rows = list(iter_rolling(nums, window, step))
+        assert len(rows) == len(expected)
+        for (mean, variance, min_val, max_val), stats in zip(rows, expected):
+            assert round(mean, 6) == stats["mean"]
+            assert round(variance, 6) == stats["variance"]
+            assert min_val == stats["min"]
+            assert max_val == stats["max"]
+
+    def test_no_drift_on_long_series(self):
+        """Test: Valores grandes con poca varianza no acumulan error"""
+        rng = random.Random(1)
+        nums = [1e9 + rng.random() for _ in range(20_000)]
+        window = 100
+        rows = list(iter_rolling(nums, window))
+        for start in (0, 5_000, 12_345, len(nums) - window):
+            stats = compute_stats(nums[start:start + window])
+            assert rows[start][1] == pytest.approx(stats["variance"], abs=1e-6)
+
+    def test_monotonic_extremes(self):
+        """Test: Mínimos y máximos con secuencias crecientes y decrecientes"""
+        nums = [1.0, 2.0, 3.0, 4.0, 3.0, 2.0, 1.0, 5.0]
+        rows = list(iter_rolling(nums, 3))
+        assert [row[2] for row in rows] == [1.0, 2.0, 3.0, 2.0, 1.0, 1.0]
+        assert [row[3] for row in rows] == [3.0, 4.0, 4.0, 4.0, 3.0, 5.0]
+
+    def test_window_larger_than_input(self):
+        """Test: Sin ventanas si window supera la cantidad de números"""
+        assert list(iter_rolling([1.0, 2.0], 3)) == []
+
+    def test_invalid_window(self):
+        """Test: window y step deben ser positivos"""
+        with pytest.raises(ValueError):
+            list(iter_rolling([1.0], 0))
+        with pytest.raises(ValueError):
+            list(iter_rolling([1.0], 1, step=0))
+
+    def test_float64_layout(self):
+        """Test: Una fila de ROLLING_COLUMNS por ventana"""
+        body = rolling_float64([1.0, 2.0, 3.0, 5.0], 2, step=2)
+        values = struct.unpack("<10d", body)
+        assert values[:5] == (1.5, 0.5, 0.5 ** 0.5, 1.0, 2.0)
+        assert values[5:] == (4.0, 2.0, 2.0 ** 0.5, 3.0, 5.0)
+
+
+class TestRollingEndpoint:
+    """Pruebas de /stats/rolling"""
+
+    def test_json(self, client):
+        """Test: Columnas por ventana en JSON"""
+        response = client.post("/stats/rolling?window=3", json={"numbers": [1, 2, 3, 4, 10]})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["window"] == 3 and data["step"] == 1 and data["count"] == 3
+        assert data["mean"] == [2.0, 3.0, 5.666667]
+        assert data["min"] == [1.0, 2.0, 3.0]
+        assert data["max"] == [3.0, 4.0, 10.0]
+        assert data["variance"][0] == 1.0
+        assert data["std_dev"][0] == 1.0
+
+    def test_step(self, client):
+        """Test: step salta ventanas"""
+        response = client.post("/stats/rolling?window=2&step=2", json={"numbers": [1, 3, 5, 7, 9]})
+        assert response.json()["mean"] == [2.0, 6.0]
+
+    def test_ndjson(self, client):
+        """Test: Una línea por ventana con su posición de inicio"""
+        response = client.post(
+            "/stats/rolling?window=2&step=2&format=ndjson", json={"numbers": [1, 3, 5, 7, 9]}
+        )
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["start"] for line in lines] == [0, 2]
+        assert lines[1]["mean"] == 6.0 and lines[1]["max"] == 7.0
+
+    def test_float64_output(self, client):
+        """Test: Salida binaria desde un body binario"""
+        body = struct.pack("<4d", 1.0, 2.0, 3.0, 5.0)
+        response = client.post(
+            "/stats/rolling?window=4&format=float64",
+            content=body,
+            headers={"Content-Type": "application/octet-stream"}
+        )
+        assert response.headers["x-rolling-columns"] == ",".join(ROLLING_COLUMNS)
+        mean, variance, _, min_val, max_val = struct.unpack("<5d", response.content)
+        assert (mean, min_val, max_val) == (2.75, 1.0, 5.0)
+        assert variance == pytest.approx(2.9166666666666665)
+
+    def test_no_windows(self, client):
+        """Test: window mayor que la lista retorna cero ventanas"""
+        data = client.post("/stats/rolling?window=10", json={"numbers": [1, 2]}).json()
+        assert data["count"] == 0 and data["mean"] == []
+
+    def test_invalid_window(self, client):
+        """Test: window es obligatorio y positivo"""
+        assert client.post("/stats/rolling", json={"numbers": [1, 2]}).status_code == 422
+        assert client.post("/stats/rolling?window=0", json={"numbers": [1, 2]}).status_code == 422
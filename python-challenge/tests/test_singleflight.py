@@ -0,0 +1,143 @@
+import threading
+import time
+
+import pytest
+
+import app as app_module
+from singleflight import SingleFlight
+
+
+def wait_for(condition, timeout=5.0):
+    """Espera activa hasta que se cumpla la condición"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timeout esperando la condición"
+        time.sleep(0.005)
+
+
+def run_concurrently(target, count):
+    """Lanza count threads con target y devuelve sus resultados en orden"""
+    results = [None] * count
+
+    def run(i):
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+@pytest.fixture
+def flight(monkeypatch):
+    """Singleflight nuevo para la app y sin caché, para que cada request calcule"""
+    single_flight = SingleFlight()
+    monkeypatch.setattr(app_module, "single_flight", single_flight)
+    monkeypatch.setattr(app_module, "result_cache", None)
+    return single_flight
+
+
+class TestSingleFlight:
+    """Pruebas de la deduplicación de cálculos en curso"""
+
+    def test_concurrent_calls_share_result(self):
+        """Test: Los que llegan durante el cálculo reciben el mismo resultado"""
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return object()
+
+        threads, results = run_concurrently(lambda: flight.do("k", compute), 4)
+        wait_for(lambda: flight.coalesced == 3)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert flight.info() == {"in_flight": 0, "leaders": 1, "coalesced": 3}
+
+    def test_error_reaches_every_waiter(self):
+        """Test: Si el cálculo falla, todos reciben la excepción y la clave se libera"""
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def fail():
+            release.wait(5)
+            raise ValueError("boom")
+
+        threads, results = run_concurrently(lambda: flight.do("k", fail), 3)
+        wait_for(lambda: flight.coalesced == 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.do("k", lambda: 42) == 42
+        assert flight.in_flight() == 0
+
+    def test_nothing_is_retained(self):
+        """Test: Llamadas sucesivas vuelven a calcular; distintas claves no se agrupan"""
+        flight = SingleFlight()
+        assert flight.do("a", lambda: 1) == 1
+        assert flight.do("a", lambda: 2) == 2
+        assert flight.do("b", lambda: 3) == 3
+        assert flight.info() == {"in_flight": 0, "leaders": 3, "coalesced": 0}
+
+
+class TestSingleFlightEndpoints:
+    """Pruebas de singleflight en /stats y /stats/basic"""
+
+    @pytest.mark.parametrize("path", ["/stats", "/stats?fields=mean,max", "/stats/basic"])
+    def test_identical_requests_compute_once(self, client, flight, monkeypatch, path):
+        """Test: Requests idénticos simultáneos calculan una sola vez"""
+        original = app_module.compute_and_render
+        calls = []
+
+        def slow_compute(*args):
+            calls.append(1)
+            wait_for(lambda: flight.coalesced >= 2)
+            return original(*args)
+
+        monkeypatch.setattr(app_module, "compute_and_render", slow_compute)
+        threads, results = run_concurrently(
+            lambda: client.post(path, json={"numbers": [1, 2, 2, 5]}), 3
+        )
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert [response.status_code for response in results] == [200, 200, 200]
+        assert results[0].json()["max"] == 5.0
+        assert all(response.content == results[0].content for response in results)
+        assert flight.info() == {"in_flight": 0, "leaders": 1, "coalesced": 2}
+
+    def test_different_bodies_not_coalesced(self, client, flight):
+        """Test: Números distintos calculan por separado"""
+        assert client.post("/stats", json={"numbers": [1, 2]}).json()["mean"] == 1.5
+        assert client.post("/stats", json={"numbers": [1, 3]}).json()["mean"] == 2.0
+        assert flight.info() == {"in_flight": 0, "leaders": 2, "coalesced": 0}
+
+    def test_disabled(self, client, monkeypatch):
+        """Test: Sin caché ni singleflight no se calcula clave"""
+        monkeypatch.setattr(app_module, "single_flight", None)
+        monkeypatch.setattr(app_module, "result_cache", None)
+        monkeypatch.setattr(app_module, "cache_key", None)
+        assert client.post("/stats", json={"numbers": [1, 2]}).json()["mean"] == 1.5
+        assert client.get("/health").json()["singleflight"] is None
+
+    def test_counters_exposed(self, client, flight):
+        """Test: Contadores en /metrics y /health"""
+        client.post("/stats", json={"numbers": [4, 5]})
+        text = client.get("/metrics").text
+        assert "# TYPE stats_singleflight_coalesced_total counter" in text
+        assert "stats_singleflight_leaders_total 1" in text
+        assert "stats_singleflight_in_flight 0" in text
+        assert client.get("/health").json()["singleflight"]["leaders"] == 1
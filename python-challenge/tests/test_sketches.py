@@ -0,0 +1,213 @@
+import random
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+import pytest
+
+from engines import compute_quantiles, compute_stats, np
+from sketches import KLL_BATCH, KLL_RANK_ERROR, KLLSketch, MisraGries
+
+QS = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 0.999]
+
+
+def rank_error(ordered, q, value):
+    """Distancia entre q y el rango normalizado real del valor"""
+    n = len(ordered)
+    low = bisect_left(ordered, value) / n
+    high = bisect_right(ordered, value) / n
+    return max(0.0, low - q, q - high)
+
+
+class TestKLLSketch:
+    """Pruebas del sketch de cuantiles"""
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_rank_error_bound(self, seed):
+        """Test: El error de rango queda dentro de la cota documentada"""
+        rng = random.Random(seed)
+        data = [rng.lognormvariate(0, 2) for _ in range(200_000)]
+        sketch = KLLSketch(seed=seed)
+        for i in range(0, len(data), 5000):
+            sketch.update(data[i:i + 5000])
+
+        ordered = sorted(data)
+        for q, value in zip(QS, sketch.quantiles(QS)):
+            assert rank_error(ordered, q, value) <= KLL_RANK_ERROR
+
+    def test_memory_is_bounded(self):
+        """Test: El sketch guarda muchos menos valores que los recibidos"""
+        sketch = KLLSketch(seed=0).update(float(i) for i in range(100_000))
+        assert sum(map(len, sketch._levels)) < 1000
+        assert sketch.count == 100_000
+
+    @pytest.mark.parametrize("source", [
+        "list", "generator",
+        pytest.param("numpy", marks=pytest.mark.skipif(np is None, reason="NumPy no instalado")),
+    ])
+    def test_level_zero_bounded_in_one_update(self, source):
+        """Test: Una sola llamada con muchos valores compacta por tramos"""
+        rng = random.Random(4)
+        data = [rng.gauss(0, 1) for _ in range(300_000)]
+        values = {"list": data, "generator": (x for x in data), "numpy": np.asarray(data) if np else None}[source]
+        level_zero = []
+
+        class Recording(KLLSketch):
+            def _compress(self):
+                level_zero.append(len(self._levels[0]))
+                super()._compress()
+
+        sketch = Recording(seed=0).update(values)
+        assert len(level_zero) == -(-len(data) // KLL_BATCH)
+        assert max(level_zero) <= KLL_BATCH + sketch._max_size()
+        assert sum(map(len, sketch._levels)) < 1000
+        assert (sketch.min, sketch.max) == (min(data), max(data))
+        ordered = sorted(data)
+        for q, value in zip(QS, sketch.quantiles(QS)):
+            assert rank_error(ordered, q, value) <= KLL_RANK_ERROR
+
+    def test_merge(self):
+        """Test: Combinar sketches mantiene la cota de error"""
+        rng = random.Random(5)
+        left = [rng.random() for _ in range(50_000)]
+        right = [rng.random() + 0.5 for _ in range(50_000)]
+        merged = KLLSketch(seed=1).update(left).merge(KLLSketch(seed=2).update(right))
+
+        ordered = sorted(left + right)
+        assert merged.count == len(ordered)
+        assert (merged.min, merged.max) == (ordered[0], ordered[-1])
+        for q, value in zip(QS, merged.quantiles(QS)):
+            assert rank_error(ordered, q, value) <= KLL_RANK_ERROR
+
+    def test_small_and_empty(self):
+        """Test: Con pocos datos el sketch es exacto en sus extremos"""
+        assert KLLSketch().quantiles([0.5]) == [None]
+        sketch = KLLSketch().update([3.0, 1.0, 2.0])
+        assert sketch.quantiles([0, 0.5, 1]) == [1.0, 2.0, 3.0]
+
+
+def heavy_hitter_data(seed=0):
+    """Pocos valores repetidos mezclados con muchos valores casi únicos"""
+    rng = random.Random(seed)
+    data = [float(rng.randrange(50)) for _ in range(20_000)] + [rng.random() for _ in range(100_000)]
+    rng.shuffle(data)
+    return data
+
+
+class TestMisraGries:
+    """Pruebas del sketch de valores frecuentes"""
+
+    def assert_within_error(self, sketch, data):
+        exact = Counter(data)
+        error = sketch.error()
+        assert error <= len(data) // (sketch.capacity + 1)
+        for value, c in sketch.top(sketch.capacity):
+            assert exact[value] - error <= c <= exact[value]
+        # Todo valor con frecuencia mayor que el error está en el sketch
+        kept = dict(sketch.top(sketch.capacity))
+        assert all(value in kept for value, c in exact.items() if c > error)
+
+    @pytest.mark.parametrize("seed", [0, 1])
+    def test_error_bound(self, seed):
+        """Test: Cada conteo subestima a lo sumo error()"""
+        data = heavy_hitter_data(seed)
+        sketch = MisraGries(100)
+        for i in range(0, len(data), 7000):
+            sketch.update(data[i:i + 7000])
+        assert sketch.count == len(data)
+        assert len(sketch.top(1000)) <= 100
+        self.assert_within_error(sketch, data)
+
+    def test_merge(self):
+        """Test: Combinar sketches mantiene la cota"""
+        data = heavy_hitter_data(2)
+        half = len(data) // 2
+        merged = MisraGries(100).update(data[:half]).merge(MisraGries(100).update(data[half:]))
+        assert merged.count == len(data)
+        self.assert_within_error(merged, data)
+
+    def test_exact_when_it_fits(self):
+        """Test: Con menos valores distintos que contadores es exacto"""
+        sketch = MisraGries(10).update([2.0, 1.0, 1.0, 2.0, 3.0])
+        assert sketch.error() == 0
+        assert sketch.top(2) == [(2.0, 2), (1.0, 2)]
+        with pytest.raises(ValueError):
+            MisraGries(0)
+
+
+class TestExactQuantiles:
+    """Pruebas de cuantiles exactos"""
+
+    def test_median_matches_stats(self):
+        """Test: q=0.5 coincide con la mediana"""
+        for nums in ([1.0, 2.0, 3.0, 4.0], [5.0, 1.0, 3.0], [2.0, 2.0, 7.0, 9.0, 1.0, 4.0]):
+            assert compute_quantiles(nums, [0.5]) == [compute_stats(nums)["median"]]
+
+    def test_linear_interpolation(self):
+        """Test: Interpolación lineal entre estadísticos de orden"""
+        assert compute_quantiles([10.0, 20.0, 30.0, 40.0, 50.0], [0, 0.25, 0.9, 1]) == \
+            pytest.approx([10.0, 20.0, 46.0, 50.0])
+
+
+class TestPercentilesEndpoint:
+    """Pruebas de /stats/percentiles"""
+
+    @pytest.mark.parametrize("engine", ["python", "auto"])
+    def test_exact(self, client, engine):
+        """Test: Percentiles exactos"""
+        numbers = list(range(1, 101))
+        response = client.post(f"/stats/percentiles?q=0.5&q=0.9&engine={engine}",
+                               json={"numbers": numbers})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 100
+        assert data["method"] == "exact"
+        assert data["rank_error"] is None
+        assert data["quantiles"] == [
+            {"quantile": 0.5, "value": 50.5},
+            {"quantile": 0.9, "value": pytest.approx(90.1)},
+        ]
+
+    def test_approx(self, client):
+        """Test: Percentiles aproximados informan su cota de error"""
+        numbers = list(range(10_000))
+        response = client.post("/stats/percentiles?q=0.99&method=approx", json={"numbers": numbers})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["rank_error"] == KLL_RANK_ERROR
+        value = data["quantiles"][0]["value"]
+        assert abs(value / len(numbers) - 0.99) <= KLL_RANK_ERROR
+
+    def test_approx_ndjson(self, client):
+        """Test: NDJSON con method=approx se lee por bloques"""
+        body = "\n".join(str(i) for i in range(10_000)).encode()
+        response = client.post("/stats/percentiles?q=0.5&method=approx", content=body,
+                               headers={"Content-Type": "application/x-ndjson"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 10_000
+        assert abs(data["quantiles"][0]["value"] / 10_000 - 0.5) <= KLL_RANK_ERROR
+
+    def test_ndjson_errors(self, client):
+        """Test: NDJSON exacto o con líneas inválidas retorna 422"""
+        headers = {"Content-Type": "application/x-ndjson"}
+        assert client.post("/stats/percentiles", content=b"1\n2\n", headers=headers).status_code == 422
+        response = client.post("/stats/percentiles?method=approx", content=b"1\nx\n", headers=headers)
+        assert response.status_code == 422
+
+    def test_default_quantiles_and_empty_list(self, client):
+        """Test: Cuantiles por defecto con lista vacía"""
+        response = client.post("/stats/percentiles", json={"numbers": []})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["quantile"] for item in data["quantiles"]] == [0.5, 0.9, 0.95, 0.99]
+        assert all(item["value"] is None for item in data["quantiles"])
+
+    def test_invalid_quantile(self, client):
+        """Test: Cuantil fuera de [0, 1] retorna 422"""
+        response = client.post("/stats/percentiles?q=99", json={"numbers": [1, 2, 3]})
+
+        assert response.status_code == 422
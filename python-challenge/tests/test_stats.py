@@ -279,3 +279,39 @@ class TestStatsAPIResponseFormat:
         
         assert response.status_code == 200
         assert response.headers["content-type"] == "application/json"
+
+class TestStatsValidation:
+    """Pruebas de validación rápida (modo estricto y valores no finitos)"""
+    
+    @pytest.mark.parametrize("raw", [
+        '{"numbers": [1, NaN, 3]}',
+        '{"numbers": [Infinity]}',
+        '{"numbers": [1, -Infinity]}',
+        '{"numbers": [1e400]}'
+    ])
+    def test_stats_rejects_non_finite(self, raw):
+        """Test: NaN e infinitos retornan 422"""
+        response = client.post("/stats", content=raw, headers={"content-type": "application/json"})
+        
+        assert response.status_code == 422
+    
+    def test_strict_accepts_ints_and_floats(self):
+        """Test: Modo estricto acepta enteros y decimales"""
+        response = client.post("/stats?strict=true", json={"numbers": [1, 2.5, 3]})
+        
+        assert response.status_code == 200
+        assert response.json()["sum"] == 6.5
+    
+    @pytest.mark.parametrize("numbers", [["1", "2"], [1, True], [None]])
+    def test_strict_rejects_coercion(self, numbers):
+        """Test: Modo estricto rechaza strings, booleanos y None"""
+        response = client.post("/stats?strict=true", json={"numbers": numbers})
+        
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"][:2] == ["body", "numbers"]
+    
+    def test_strict_rejects_missing_field(self):
+        """Test: Modo estricto mantiene el 422 por campo faltante"""
+        response = client.post("/stats/basic?strict=true", json={"wrong_field": [1, 2, 3]})
+        
+        assert response.status_code == 422
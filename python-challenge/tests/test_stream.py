@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from ingest import MAX_LINE_BYTES, iter_ndjson_numbers, parse_ndjson_lines
+
+NDJSON = {"content-type": "application/x-ndjson"}
+
+
+async def chunked(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def collect(data: bytes, size: int):
+    async def run():
+        return [values async for values in iter_ndjson_numbers(chunked(data, size))]
+    return asyncio.run(run())
+
+
+class TestNdjsonParser:
+    """Pruebas del lector NDJSON por bloques"""
+
+    def test_parse_lines(self):
+        """Test: Números sueltos, arreglos y líneas vacías"""
+        assert parse_ndjson_lines([b"1", b"", b"[2, 3.5]", b" 4 "]) == [1.0, 2.0, 3.5, 4.0]
+
+    @pytest.mark.parametrize("line", [b"abc", b"[1, \"2\"]", b"[true]", b"nan", b"[[1]]"])
+    def test_parse_invalid_lines(self, line):
+        """Test: Líneas inválidas o no finitas"""
+        with pytest.raises(ValueError):
+            parse_ndjson_lines([b"1", line])
+
+    @pytest.mark.parametrize("size", [1, 3, 7, 1024])
+    def test_lines_split_across_chunks(self, size):
+        """Test: Las líneas partidas entre bloques se reconstruyen"""
+        data = b"10\n-2.5\n[1, 2]\n300"
+        values = [v for block in collect(data, size) for v in block]
+        assert values == [10.0, -2.5, 1.0, 2.0, 300.0]
+
+    def test_line_too_long(self):
+        """Test: Una línea sin fin no crece sin límite"""
+        with pytest.raises(ValueError):
+            collect(b"1" * (MAX_LINE_BYTES + 2), 64 * 1024)
+
+
+class TestStreamEndpoint:
+    """Pruebas de /stats/stream"""
+
+    def test_stream_moments(self, client):
+        """Test: Momentos sin mediana ni moda por defecto"""
+        body = b"1\n2\n3\n4\n5\n"
+        response = client.post("/stats/stream", content=body, headers=NDJSON)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 5
+        assert data["mean"] == 3.0
+        assert data["variance"] == 2.5
+        assert data["min"] == 1
+        assert data["max"] == 5
+        assert data["sum"] == 15
+        assert data["median"] is None
+        assert data["mode"] is None
+
+    def test_stream_exact_matches_stats(self, client):
+        """Test: Con exact=true coincide con /stats"""
+        numbers = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5]
+        body = "\n".join(map(str, numbers)).encode()
+        streamed = client.post("/stats/stream?exact=true", content=body, headers=NDJSON).json()
+        expected = client.post("/stats?engine=python", json={"numbers": numbers}).json()
+
+        assert streamed == expected
+
+    def test_stream_empty_body(self, client):
+        """Test: Body vacío retorna count 0"""
+        response = client.post("/stats/stream", content=b"", headers=NDJSON)
+
+        assert response.status_code == 200
+        assert response.json()["count"] == 0
+        assert response.json()["mean"] is None
+
+    def test_stream_invalid_line(self, client):
+        """Test: Una línea inválida retorna 422 con su número"""
+        response = client.post("/stats/stream", content=b"1\n2\nhola\n", headers=NDJSON)
+
+        assert response.status_code == 422
+        assert "Línea 3" in response.json()["detail"]
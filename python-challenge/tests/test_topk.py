@@ -0,0 +1,97 @@
+import random
+import struct
+
+import pytest
+
+from engines import ENGINES, compute_stats, compute_top_k, numpy_top_k
+
+ENGINE_PARAMS = [
+    "python",
+    pytest.param("numpy", marks=pytest.mark.skipif("numpy" not in ENGINES, reason="NumPy no instalado")),
+]
+
+
+def ndjson(nums):
+    return "".join(f"{x}\n" for x in nums).encode()
+
+
+class TestExactTopK:
+    """Pruebas de la tabla de frecuencias exacta"""
+
+    @pytest.mark.parametrize("engine", ENGINE_PARAMS)
+    def test_matches_counter_and_mode(self, engine):
+        """Test: Mismo orden que Counter.most_common y k=1 da la moda"""
+        rng = random.Random(8)
+        nums = [float(rng.randrange(30)) for _ in range(2000)]
+        top = ENGINES[engine].top_k(nums, 5)
+        assert top == compute_top_k(nums, 5)
+        assert [ENGINES[engine].top_k(nums, 1)[0][0]] == compute_stats(nums)["mode"]
+
+    @pytest.mark.skipif("numpy" not in ENGINES, reason="NumPy no instalado")
+    def test_ties_by_first_appearance(self):
+        """Test: Los empates se ordenan por primera aparición"""
+        nums = [3.0, 1.0, 2.0, 1.0, 3.0, 2.0]
+        assert numpy_top_k(nums, 3) == [(3.0, 2), (1.0, 2), (2.0, 2)]
+        assert numpy_top_k([], 3) == []
+
+
+class TestTopKEndpoint:
+    """Pruebas de /stats/topk"""
+
+    def test_exact_json(self, client):
+        """Test: Conteos exactos con error 0"""
+        response = client.post("/stats/topk?k=2", json={"numbers": [5, 1, 5, 2, 1, 5]})
+        assert response.status_code == 200
+        assert response.json() == {
+            "count": 6,
+            "method": "exact",
+            "error": 0,
+            "items": [{"value": 5.0, "count": 3}, {"value": 1.0, "count": 2}]
+        }
+
+    def test_approx_binary(self, client):
+        """Test: Sketch con float64 binario; los frecuentes aparecen con su cota"""
+        rng = random.Random(3)
+        nums = [7.0] * 500 + [rng.random() for _ in range(5000)]
+        rng.shuffle(nums)
+        response = client.post(
+            "/stats/topk?k=1&method=approx&capacity=20",
+            content=struct.pack(f"<{len(nums)}d", *nums),
+            headers={"Content-Type": "application/octet-stream"}
+        )
+        data = response.json()
+        assert data["method"] == "approx"
+        assert data["items"][0]["value"] == 7.0
+        assert 500 - data["error"] <= data["items"][0]["count"] <= 500
+
+    @pytest.mark.parametrize("method", ["exact", "approx"])
+    def test_ndjson_stream(self, client, method):
+        """Test: NDJSON leído por bloques"""
+        nums = [1, 2, 2, 3, 3, 3] * 1000
+        response = client.post(
+            f"/stats/topk?k=3&method={method}",
+            content=ndjson(nums),
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+        data = response.json()
+        assert data["count"] == 6000
+        assert [item["value"] for item in data["items"]] == [3.0, 2.0, 1.0]
+
+    def test_errors(self, client):
+        """Test: k fuera de rango, capacity menor que k o NDJSON inválido"""
+        assert client.post("/stats/topk?k=0", json={"numbers": [1]}).status_code == 422
+        assert client.post("/stats/topk?k=5&method=approx&capacity=2", json={"numbers": [1]}).status_code == 422
+        response = client.post("/stats/topk", content=b"1\nx\n", headers={"Content-Type": "application/x-ndjson"})
+        assert response.status_code == 422
+
+
+class TestStreamApproxMode:
+    """Pruebas de /stats/stream?approx_mode=true"""
+
+    def test_mode_without_exact(self, client):
+        """Test: Moda aproximada sin tabla exacta; la mediana sigue en null"""
+        body = ndjson([4, 4, 4, 1, 2, 3, 4.5])
+        data = client.post("/stats/stream?approx_mode=true", content=body).json()
+        assert data["mode"] == [4.0]
+        assert data["median"] is None
+        assert client.post("/stats/stream", content=body).json()["mode"] is None
@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as app_module
+import warmup
+from warmup import Readiness, call, warm_up, warmup_requests
+
+
+@pytest.fixture
+def fresh_readiness(monkeypatch):
+    """Readiness nuevo para la app durante la prueba"""
+    readiness = Readiness()
+    monkeypatch.setattr(app_module, "readiness", readiness)
+    return readiness
+
+
+class TestWarmUp:
+    """Pruebas del warm-up y el estado de readiness"""
+
+    def test_every_request_succeeds(self, monkeypatch):
+        """Test: Todos los requests del warm-up responden 2xx"""
+        monkeypatch.setattr(app_module, "result_cache", None)
+        monkeypatch.setattr(warmup, "warm_process_pool", lambda: None)
+        readiness = Readiness()
+        asyncio.run(warm_up(app_module.app, readiness))
+        assert readiness.ready
+        assert readiness.failures == []
+        assert readiness.seconds >= 0
+
+    def test_failures_recorded(self, monkeypatch):
+        """Test: Un request que falla queda anotado y el worker queda listo igual"""
+        monkeypatch.setattr(warmup, "warm_process_pool", lambda: None)
+        monkeypatch.setattr(warmup, "warmup_requests", lambda: [
+            ("POST", "/stats", b"{}", warmup.JSON),
+            ("GET", "/health", b"", warmup.JSON),
+        ])
+        readiness = Readiness()
+        asyncio.run(warm_up(app_module.app, readiness))
+        assert readiness.info()["state"] == "ready"
+        assert readiness.failures == ["POST /stats: 422"]
+
+    def test_covers_endpoints(self):
+        """Test: Cada motor pasa por /stats y se ejercita el streaming"""
+        paths = [path for _, path, _, _ in warmup_requests()]
+        assert "/stats?engine=python" in paths
+        assert any(path.startswith("/stats/stream") for path in paths)
+
+    def test_call(self):
+        """Test: call devuelve el status del request ASGI"""
+        assert asyncio.run(call(app_module.app, "GET", "/health")) == 200
+        assert asyncio.run(call(app_module.app, "GET", "/no-existe")) == 404
+
+
+class TestReadinessEndpoints:
+    """Pruebas de /health y /health/ready"""
+
+    def test_not_ready_before_warmup(self, client, fresh_readiness):
+        """Test: Antes del warm-up /health/ready responde 503"""
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        data = client.get("/health").json()
+        assert data["status"] == "healthy"
+        assert data["ready"] is False
+        assert data["warmup"]["state"] == "starting"
+
+    def test_ready_after_lifespan_warmup(self, fresh_readiness, monkeypatch):
+        """Test: El lifespan corre el warm-up y el worker queda listo"""
+        monkeypatch.setattr(app_module, "result_cache", None)
+        monkeypatch.setattr(warmup, "warm_process_pool", lambda: None)
+        with TestClient(app_module.app) as client:
+            deadline = time.monotonic() + 10
+            while not fresh_readiness.ready:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            assert client.get("/health/ready").json() == {"status": "ready"}
+            assert client.get("/health").json()["warmup"]["failures"] == []
+
+    def test_warmup_disabled(self, fresh_readiness, monkeypatch):
+        """Test: Con STATS_WARMUP=0 el worker queda listo al arrancar"""
+        monkeypatch.setattr(app_module, "WARMUP_ENABLED", False)
+        with TestClient(app_module.app) as client:
+            assert client.get("/health/ready").status_code == 200
+            assert client.get("/health").json()["warmup"]["seconds"] is None
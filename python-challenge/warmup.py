@@ -0,0 +1,144 @@
+"""
+Warm-up de un worker recién levantado y estado de readiness.
+
+Al arrancar, el lifespan lanza warm_up en segundo plano: recorre cada
+endpoint con payloads chicos a través de la app ASGI completa (routing,
+validación, motores y serialización) y, si el offload o los lotes en paralelo
+están activos, arranca los procesos del pool; así el costo de las primeras
+llamadas no cae en el primer request real. Mientras tanto /health informa ready=false y
+/health/ready responde 503, para que el balanceador no envíe tráfico a un
+worker frío.
+
+Los requests del warm-up son requests normales: quedan en las métricas y,
+como usan siempre los mismos números, ocupan unas pocas entradas de la caché.
+
+STATS_WARMUP=0 lo desactiva: el worker queda listo de inmediato.
+"""
+import json
+import os
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+import anyio.to_thread
+
+from engines import ENGINES
+from executor import warm_process_pool
+
+WARMUP_ENABLED = os.environ.get("STATS_WARMUP", "1") != "0"
+
+WARMUP_NUMBERS = [1.0, 2.0, 2.0, 3.5, 5.0, 8.0, 13.0, 21.0]
+
+JSON = b"application/json"
+
+
+async def call(app, method: str, path: str, body: bytes = b"",
+               content_type: bytes = JSON) -> int:
+    """Ejecuta un request ASGI y retorna el status"""
+    path, _, query = path.partition("?")
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status = 0
+
+    async def receive():
+        return messages.pop() if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"content-type", content_type), (b"host", b"warmup")],
+        "client": ("127.0.0.1", 0),
+        "server": ("127.0.0.1", 80),
+    }
+    await app(scope, receive, send)
+    return status
+
+
+def warmup_requests() -> List[Tuple[str, str, bytes, bytes]]:
+    """(método, ruta, body, content-type) de cada request del warm-up"""
+    numbers = json.dumps({"numbers": WARMUP_NUMBERS}).encode()
+    binary = array("d", WARMUP_NUMBERS).tobytes()
+    ndjson = "\n".join(map(str, WARMUP_NUMBERS)).encode()
+    half = len(WARMUP_NUMBERS) // 2
+
+    requests = [("GET", "/health", b"", JSON), ("GET", "/metrics", b"", JSON)]
+    for engine in ENGINES:
+        requests += [
+            ("POST", f"/stats?engine={engine}", numbers, JSON),
+            ("POST", f"/stats?engine={engine}&fields=mean,median,mode", numbers, JSON),
+            ("POST", f"/stats/basic?engine={engine}", numbers, JSON),
+            ("POST", f"/stats/histogram?engine={engine}", numbers, JSON),
+            ("POST", f"/stats/percentiles?engine={engine}", numbers, JSON),
+            ("POST", f"/stats/topk?engine={engine}", numbers, JSON),
+            ("POST", f"/stats/groupby?engine={engine}", json.dumps({
+                "keys": ["a", "b"] * half, "values": WARMUP_NUMBERS
+            }).encode(), JSON),
+            ("POST", f"/stats/matrix?engine={engine}", json.dumps({
+                "columns": [WARMUP_NUMBERS[:half], WARMUP_NUMBERS[half:]]
+            }).encode(), JSON),
+        ]
+    requests += [
+        ("POST", "/stats?strict=true", numbers, JSON),
+        ("POST", "/stats", binary, b"application/octet-stream"),
+        ("POST", "/stats/batch", json.dumps({"series": {"a": WARMUP_NUMBERS}}).encode(), JSON),
+        ("POST", "/stats/percentiles?method=approx", numbers, JSON),
+        ("POST", "/stats/rolling?window=3", numbers, JSON),
+        ("POST", "/stats/topk?method=approx", numbers, JSON),
+        ("POST", "/stats/stream?exact=true", ndjson, b"application/x-ndjson"),
+        ("POST", "/stats/stream?approx_mode=true", ndjson, b"application/x-ndjson"),
+    ]
+    return requests
+
+
+class Readiness:
+    """Estado del warm-up: starting, warming_up y ready"""
+
+    def __init__(self):
+        self.state = "starting"
+        self.seconds: Optional[float] = None
+        self.failures: List[str] = []
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def mark_ready(self):
+        self.state = "ready"
+
+    def info(self) -> Dict[str, Any]:
+        return {"state": self.state, "seconds": self.seconds, "failures": self.failures}
+
+
+async def warm_up(app, readiness: Readiness):
+    """
+    Recorre los endpoints y, si se va a usar, arranca el pool de procesos.
+
+    Un request que falla queda anotado en failures pero no impide quedar
+    listo: el worker puede atender igual, solo que ese camino sigue frío.
+    """
+    readiness.state = "warming_up"
+    start = time.perf_counter()
+    try:
+        for method, path, body, content_type in warmup_requests():
+            try:
+                status = await call(app, method, path, body, content_type)
+            except Exception as e:
+                readiness.failures.append(f"{method} {path}: {type(e).__name__}")
+                continue
+            if not 200 <= status < 300:
+                readiness.failures.append(f"{method} {path}: {status}")
+        await anyio.to_thread.run_sync(warm_process_pool)
+    finally:
+        readiness.seconds = round(time.perf_counter() - start, 3)
+        readiness.mark_ready()